@@ -0,0 +1,109 @@
+import { providers } from 'ethers';
+import { ConnectionInfo, fetchJson } from 'ethers/lib/utils';
+
+interface PendingCall {
+  request: { jsonrpc: '2.0', id: number, method: string, params: Array<any> };
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+}
+
+export interface BatchingStats {
+  calls: number;
+  batches: number;
+  largestBatch: number;
+}
+
+/**
+ * JSON-RPC provider that coalesces the calls issued within `windowMicroseconds` into one batch
+ * request of at most `maxBatchSize` calls; a full batch is sent at once. Node timers have
+ * millisecond resolution, so windows under 1000us close at the end of the current event-loop turn
+ * (setImmediate), which still merges every call made by concurrently running requests in that turn.
+ *
+ * Responses are matched to calls by id, since nodes may answer a batch in any order. A call the node
+ * answers with an error rejects on its own, with the same `code` and `data` a single request would
+ * carry; only a failed HTTP request rejects every call of its batch.
+ */
+export class BatchingJsonRpcProvider extends providers.StaticJsonRpcProvider {
+  private _queue: PendingCall[] = [];
+  private _flushScheduled: boolean = false;
+  private _requestId: number = 1;
+  private _stats: BatchingStats = { calls: 0, batches: 0, largestBatch: 0 };
+
+  constructor(
+    url: ConnectionInfo | string,
+    network?: providers.Networkish,
+    readonly windowMicroseconds: number = 500,
+    readonly maxBatchSize: number = 50
+  ) {
+    super(url, network);
+  }
+
+  get stats(): BatchingStats {
+    return { ...this._stats };
+  }
+
+  send(method: string, params: Array<any>): Promise<any> {
+    const promise = new Promise<any>((resolve, reject) => {
+      this._queue.push({ request: { jsonrpc: '2.0', id: this._requestId++, method, params }, resolve, reject });
+    });
+    if (this._queue.length >= this.maxBatchSize) {
+      this.flush();
+    } else if (!this._flushScheduled) {
+      this._flushScheduled = true;
+      if (this.windowMicroseconds < 1000) {
+        setImmediate(() => this.flush());
+      } else {
+        setTimeout(() => this.flush(), Math.round(this.windowMicroseconds / 1000));
+      }
+    }
+    return promise;
+  }
+
+  private flush(): void {
+    this._flushScheduled = false;
+    while (this._queue.length > 0) {
+      this.sendBatch(this._queue.splice(0, this.maxBatchSize));
+    }
+  }
+
+  private async sendBatch(batch: PendingCall[]): Promise<void> {
+    this._stats.calls += batch.length;
+    this._stats.batches += 1;
+    this._stats.largestBatch = Math.max(this._stats.largestBatch, batch.length);
+    const payload = batch.map((call) => call.request);
+    this.emit('debug', { action: 'requestBatch', request: payload, provider: this });
+    let responses: any;
+    try {
+      responses = await fetchJson(this.connection, JSON.stringify(payload));
+    } catch (error) {
+      this.emit('debug', { action: 'response', error, request: payload, provider: this });
+      batch.forEach((call) => call.reject(error as Error));
+      return;
+    }
+    this.emit('debug', { action: 'response', request: payload, response: responses, provider: this });
+
+    if (!Array.isArray(responses)) {
+      // Nodes without batch support answer the whole batch with a single error
+      const error = new Error(`JSON-RPC batch rejected: ${responses?.error?.message ?? JSON.stringify(responses)}`);
+      batch.forEach((call) => call.reject(error));
+      return;
+    }
+    const byId = new Map<number, any>();
+    for (const response of responses) {
+      byId.set(response?.id, response);
+    }
+    for (const call of batch) {
+      const response = byId.get(call.request.id);
+      if (response === undefined) {
+        call.reject(new Error(`No response to ${call.request.method} in JSON-RPC batch`));
+      } else if (response.error !== undefined) {
+        const error: any = new Error(response.error.message);
+        error.code = response.error.code;
+        error.data = response.error.data;
+        call.reject(error);
+      } else {
+        call.resolve(response.result);
+      }
+    }
+  }
+}
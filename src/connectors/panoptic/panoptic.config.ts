@@ -11,6 +11,8 @@ export namespace PanopticConfig {
     uniswapV3SubgraphUrl: string; 
     lowestTick: number;
     highestTick: number;
+    metadataDbPath: string;
+    rpcBatching: { enabled: boolean, windowMicroseconds: number, maxBatchSize: number };
     multiCallAddress: (chain: string, network: string) => string;
     UniswapV3Factory: (chain: string, network: string) => string;
     NonFungiblePositionManager: (chain: string, network: string) => string;
@@ -19,6 +21,7 @@ export namespace PanopticConfig {
     PanopticHelper: (chain: string, network: string) => string;
     UniswapMigrator: (chain: string, network: string) => string;
     TokenIdLibrary: (chain: string, network: string) => string;
+    PanopticFactoryDeployBlock: (chain: string, network: string) => number;
     tradingTypes: Array<string>;
     chainType: string;
     availableNetworks: Array<AvailableNetworks>;
@@ -33,6 +36,12 @@ export namespace PanopticConfig {
     uniswapV3SubgraphUrl: ConfigManagerV2.getInstance().get('panoptic.subgraph.uniswapV3'),
     lowestTick: ConfigManagerV2.getInstance().get('panoptic.lowestTick'),
     highestTick: ConfigManagerV2.getInstance().get('panoptic.highestTick'),
+    metadataDbPath: ConfigManagerV2.getInstance().get('panoptic.metadataDbPath') ?? 'panoptic-metadata.level',
+    rpcBatching: {
+      enabled: ConfigManagerV2.getInstance().get('panoptic.rpcBatching.enabled') ?? false,
+      windowMicroseconds: ConfigManagerV2.getInstance().get('panoptic.rpcBatching.windowMicroseconds') ?? 500,
+      maxBatchSize: ConfigManagerV2.getInstance().get('panoptic.rpcBatching.maxBatchSize') ?? 50,
+    },
     multiCallAddress: (chain: string, network: string) =>
       ConfigManagerV2.getInstance().get(
         'panoptic.contractAddresses.' +
@@ -97,6 +106,14 @@ export namespace PanopticConfig {
         network +
         '.TokenIdLibrary'
       ),
+    PanopticFactoryDeployBlock: (chain: string, network: string) =>
+      ConfigManagerV2.getInstance().get(
+        'panoptic.contractAddresses.' +
+        chain +
+        '.' +
+        network +
+        '.PanopticFactoryDeployBlock'
+      ) ?? 0,
     tradingTypes: ['AMM'],
     chainType: 'EVM',
     availableNetworks: [
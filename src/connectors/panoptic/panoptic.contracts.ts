@@ -0,0 +1,85 @@
+import { Contract, Signer, providers } from 'ethers';
+import { Interface } from 'ethers/lib/utils';
+import panopticPoolAbi from './PanopticPool.ABI.json';
+import panopticFactoryAbi from './PanopticFactory.ABI.json';
+import tokenIdLibraryAbi from './TokenIdLibrary.ABI.json';
+import panopticHelperAbi from './PanopticHelper.ABI.json';
+import collateralTrackerAbi from './CollateralTracker.ABI.json';
+import semiFungiblePositionManagerAbi from './SFPM.ABI.json';
+
+// ABIs are parsed once per process; every Contract handle and multicall encoder shares these.
+export const panopticPoolInterface = new Interface(panopticPoolAbi.abi);
+export const panopticFactoryInterface = new Interface(panopticFactoryAbi.abi);
+export const tokenIdLibraryInterface = new Interface(tokenIdLibraryAbi.abi);
+export const panopticHelperInterface = new Interface(panopticHelperAbi.abi);
+export const collateralTrackerInterface = new Interface(collateralTrackerAbi.abi);
+export const semiFungiblePositionManagerInterface = new Interface(semiFungiblePositionManagerAbi.abi);
+
+export const uniswapV3FactoryInterface = new Interface([
+  "function getPool(address tokenA, address tokenB, uint24 fee) external view returns (address pool)"
+]);
+
+export const uniswapV3PoolInterface = new Interface([
+  "function slot0() external view returns (uint160 sqrtPriceX96, int24 tick, uint16 observationIndex, uint16 observationCardinality, uint16 observationCardinalityNext, uint8 feeProtocol, bool unlocked)",
+  "function tickSpacing() external view returns (int24)",
+  "function tickBitmap(int16 wordPosition) external view returns (uint256)",
+  "function ticks(int24 tick) external view returns (uint128 liquidityGross, int128 liquidityNet, uint256 feeGrowthOutside0X128, uint256 feeGrowthOutside1X128, int56 tickCumulativeOutside, uint160 secondsPerLiquidityOutsideX128, uint32 secondsOutside, bool initialized)",
+  "event Swap(address indexed sender, address indexed recipient, int256 amount0, int256 amount1, uint160 sqrtPriceX96, uint128 liquidity, int24 tick)"
+]);
+
+export type SignerOrProvider = Signer | providers.Provider;
+
+/**
+ * Contract handles keyed by (interface, address, signer). Wallets are decrypted afresh for every
+ * request, so signers are identified by their class and address (plus the provider they are
+ * connected to) rather than by object identity; two Wallets for the same key sign identically.
+ * Signers without a synchronous address fall back to identity. Least recently used handles are
+ * evicted past `maxEntries`.
+ */
+export class ContractPool {
+  private _contracts: Map<string, Contract> = new Map();
+  private _objectIds: WeakMap<object, number> = new WeakMap();
+  private _nextObjectId: number = 0;
+
+  constructor(public readonly maxEntries: number = 1024) {}
+
+  private objectId(object: object): number {
+    let id = this._objectIds.get(object);
+    if (id === undefined) {
+      id = this._nextObjectId++;
+      this._objectIds.set(object, id);
+    }
+    return id;
+  }
+
+  private signerKey(signerOrProvider: SignerOrProvider): string {
+    if (Signer.isSigner(signerOrProvider)) {
+      const address: unknown = (signerOrProvider as any).address;
+      const provider = signerOrProvider.provider ? this.objectId(signerOrProvider.provider) : '';
+      if (typeof address === 'string') {
+        return `${signerOrProvider.constructor.name}:${address.toLowerCase()}@${provider}`;
+      }
+    }
+    return `#${this.objectId(signerOrProvider)}`;
+  }
+
+  get(address: string, iface: Interface, signerOrProvider: SignerOrProvider): Contract {
+    const key = `${this.objectId(iface)}:${address.toLowerCase()}:${this.signerKey(signerOrProvider)}`;
+    let contract = this._contracts.get(key);
+    if (contract !== undefined) {
+      // Re-insert so the Map's iteration order stays least-recently-used first
+      this._contracts.delete(key);
+    } else {
+      contract = new Contract(address, iface, signerOrProvider);
+      if (this._contracts.size >= this.maxEntries) {
+        this._contracts.delete(this._contracts.keys().next().value);
+      }
+    }
+    this._contracts.set(key, contract);
+    return contract;
+  }
+
+  get size(): number {
+    return this._contracts.size;
+  }
+}
@@ -96,9 +96,26 @@ import {
   GetSpotPriceResponse,
   GetTickSpacingAndInitializedTicksRequest,
   GetTickSpacingAndInitializedTicksResponse,
-  TransactionBuildingResult
+  TransactionBuildingResult,
+  AccountSnapshotRequest,
+  AccountSnapshotResponse,
+  PortfolioGreeksRequest,
+  PortfolioGreeksResponse,
+  ViewCacheStatsRequest,
+  ViewCacheStatsResponse,
+  StreamSpotPriceRequest,
+  SpotPriceUpdate,
+  PollTransactionsRequest,
+  PollTransactionsResponse,
+  RebalanceRequest,
+  RebalanceResponse,
+  PositionBookRequest,
+  PositionBookResponse,
+  CollateralSurfaceRequest,
+  CollateralSurfaceResponse
 } from '../../options/options.requests';
 import { Panoptic } from '../panoptic/panoptic';
+import { planRebalance } from './panoptic.rebalance';
 import { gasCostInEthString } from '../../services/base';
 
 export interface TradeInfo {
@@ -169,7 +186,7 @@ export async function calculateDelta(
   panopticish: Panoptic,
   req: CalculateDeltaRequest
 ): Promise<CalculateDeltaResponse | Error> {
-  const result = await panopticish.calculateDelta(req.PRICE, req.RANGE, req.STRIKE);
+  const result = await panopticish.calculateDelta(req.STRIKE, req.RANGE, req.PRICE);
 
   if (result instanceof Error) {
     logger.error(`Error executing calculateDelta: ${result.message}`);
@@ -185,7 +202,7 @@ export async function calculateGamma(
   panopticish: Panoptic,
   req: CalculateGammaRequest
 ): Promise<CalculateGammaResponse | Error> {
-  const result = await panopticish.calculateGamma(req.PRICE, req.RANGE, req.STRIKE);
+  const result = await panopticish.calculateGamma(req.STRIKE, req.RANGE, req.PRICE);
 
   if (result instanceof Error) {
     logger.error(`Error executing calculateGamma: ${result.message}`);
@@ -273,6 +290,27 @@ export async function queryPositions(
   };
 }
 
+export async function positionBook(
+  ethereumish: Ethereumish,
+  panopticish: Panoptic,
+  req: PositionBookRequest
+): Promise<PositionBookResponse | Error> {
+  const { wallet } = await txWriteData(ethereumish, req.address, true);
+  const result = await panopticish.getPositionBook(wallet, req.panopticPool, req.reconcileIntervalMs);
+
+  if (result instanceof Error) {
+    logger.error(`Error executing positionBook: ${result.message}`);
+    return result;
+  }
+
+  return {
+    blockNumber: result.blockNumber,
+    positionIdList: result.positions.map((position) => position.tokenId),
+    positions: result.positions,
+    reconciliation: result.reconciliation
+  };
+}
+
 export async function queryPrice(
   ethereumish: Ethereumish,
   panopticish: Panoptic,
@@ -915,7 +953,8 @@ export async function burn(
       req.newPositionIdList,
       req.doNotBroadcast,
       req.tickLimitLow,
-      req.tickLimitHigh
+      req.tickLimitHigh,
+      req.waitForReceipt
     );
 
     if (burnTx instanceof Error) {
@@ -923,25 +962,29 @@ export async function burn(
       return burnTx;
     }
 
-    if (burnTx.receipt) {
+    if (burnTx.txHash) {
       await ethereumish.txStorage.saveTx(
         ethereumish.chain,
         ethereumish.chainId,
-        burnTx.receipt.transactionHash,
+        burnTx.txHash,
         new Date(),
         ethereumish.gasPrice
       );
-
+    }
+    if (burnTx.receipt) {
       logger.info(
         `Burn has been executed, txHash is ${burnTx.receipt.transactionHash}, gasPrice is ${gasPrice}, gas used is ${burnTx.receipt.gasUsed}.`
       );
+    } else if (burnTx.txHash) {
+      logger.info(`Burn has been submitted, txHash is ${burnTx.txHash}, nonce is ${burnTx.nonce}, gasPrice is ${gasPrice}.`);
     }
 
     return {
       tx: burnTx.receipt,
       network: ethereumish.chain,
       timestamp: startTimestamp,
-      txHash: burnTx.receipt?.transactionHash,
+      txHash: burnTx.receipt?.transactionHash ?? burnTx.txHash,
+      nonce: burnTx.nonce,
       unsignedTransaction: burnTx.unsignedTransaction
     };
   } catch (error) {
@@ -971,7 +1014,8 @@ export async function burnAndMint(
       req.burnTickLimitLow,
       req.burnTickLimitHigh,
       req.mintTickLimitLow,
-      req.mintTickLimitHigh
+      req.mintTickLimitHigh,
+      req.waitForReceipt
     );
 
     if (burnAndMintTx instanceof Error) {
@@ -979,17 +1023,21 @@ export async function burnAndMint(
       return burnAndMintTx;
     }
 
-    if (burnAndMintTx.receipt) {
+    if (burnAndMintTx.txHash) {
       await ethereumish.txStorage.saveTx(
         ethereumish.chain,
         ethereumish.chainId,
-        burnAndMintTx.receipt.transactionHash,
+        burnAndMintTx.txHash,
         new Date(),
         ethereumish.gasPrice
       );
+    }
+    if (burnAndMintTx.receipt) {
       logger.info(
-        `Burn-and-mint has been executed, txHash is ${burnAndMintTx.receipt.transactionHash}, nonce is ${burnAndMintTx.receipt.transactionIndex}, gasPrice is ${gasPrice}, gas used is ${burnAndMintTx.receipt.gasUsed}.`
+        `Burn-and-mint has been executed, txHash is ${burnAndMintTx.receipt.transactionHash}, nonce is ${burnAndMintTx.nonce}, gasPrice is ${gasPrice}, gas used is ${burnAndMintTx.receipt.gasUsed}.`
       );
+    } else if (burnAndMintTx.txHash) {
+      logger.info(`Burn-and-mint has been submitted, txHash is ${burnAndMintTx.txHash}, nonce is ${burnAndMintTx.nonce}, gasPrice is ${gasPrice}.`);
     }
 
 
@@ -998,7 +1046,8 @@ export async function burnAndMint(
       tx: burnAndMintTx.receipt,
       network: ethereumish.chain,
       timestamp: startTimestamp,
-      txHash: burnAndMintTx.receipt?.transactionHash,
+      txHash: burnAndMintTx.receipt?.transactionHash ?? burnAndMintTx.txHash,
+      nonce: burnAndMintTx.nonce,
       unsignedTransaction: burnAndMintTx.unsignedTransaction
     };
   } catch (error) {
@@ -1007,6 +1056,66 @@ export async function burnAndMint(
   }
 }
 
+export async function rebalance(
+  ethereumish: Ethereumish,
+  panopticish: Panoptic,
+  req: RebalanceRequest
+): Promise<RebalanceResponse | Error> {
+  const startTimestamp: number = Date.now();
+  try {
+    const plan = planRebalance(req.positionIdList, req.burnTokenIds, req.mints);
+    if (plan instanceof Error) {
+      return plan;
+    }
+    const { wallet } = await txWriteData(ethereumish, req.address, req.doNotBroadcast);
+    const gasPrice: number = ethereumish.gasPrice;
+    const rebalanceTx: TransactionBuildingResult = await panopticish.executeRebalance(
+      wallet,
+      req.panopticPool,
+      plan,
+      req.doNotBroadcast,
+      req.tickLimitLow,
+      req.tickLimitHigh,
+      req.waitForReceipt
+    );
+
+    if (rebalanceTx instanceof Error) {
+      logger.error(`Error executing rebalance multicall: ${rebalanceTx.message}`);
+      return rebalanceTx;
+    }
+
+    if (rebalanceTx.txHash) {
+      await ethereumish.txStorage.saveTx(
+        ethereumish.chain,
+        ethereumish.chainId,
+        rebalanceTx.txHash,
+        new Date(),
+        ethereumish.gasPrice
+      );
+    }
+    if (rebalanceTx.receipt) {
+      logger.info(
+        `Rebalance (${plan.burnTokenIds.length} burns, ${plan.mints.length} mints) has been executed, txHash is ${rebalanceTx.receipt.transactionHash}, nonce is ${rebalanceTx.nonce}, gasPrice is ${gasPrice}, gas used is ${rebalanceTx.receipt.gasUsed}.`
+      );
+    } else if (rebalanceTx.txHash) {
+      logger.info(`Rebalance has been submitted, txHash is ${rebalanceTx.txHash}, nonce is ${rebalanceTx.nonce}, gasPrice is ${gasPrice}.`);
+    }
+
+    return {
+      tx: rebalanceTx.receipt,
+      network: ethereumish.chain,
+      timestamp: startTimestamp,
+      txHash: rebalanceTx.receipt?.transactionHash ?? rebalanceTx.txHash,
+      nonce: rebalanceTx.nonce,
+      unsignedTransaction: rebalanceTx.unsignedTransaction,
+      positionIdList: plan.finalPositionIdList.map((id) => id.toString())
+    };
+  } catch (error) {
+    logger.error(`Unexpected error in rebalance multicall: ${error instanceof Error ? error.message : error}`);
+    return new Error(`Unexpected error in rebalance multicall: ${error instanceof Error ? error.message : 'Unknown error'}`);
+  }
+}
+
 
 export async function forceExercise(
   ethereumish: Ethereumish,
@@ -1124,7 +1233,10 @@ export async function mint(
       req.positionIdList,
       BigNumber.from(req.positionSize),
       req.effectiveLiquidityLimit,
-      req.doNotBroadcast
+      req.doNotBroadcast,
+      undefined,
+      undefined,
+      req.waitForReceipt
     );
 
     if (mintTx instanceof Error) {
@@ -1132,24 +1244,29 @@ export async function mint(
       return mintTx;
     }
 
-    if (mintTx.receipt) {
+    if (mintTx.txHash) {
       await ethereumish.txStorage.saveTx(
         ethereumish.chain,
         ethereumish.chainId,
-        mintTx.receipt.transactionHash,
+        mintTx.txHash,
         new Date(),
         ethereumish.gasPrice
       );
+    }
+    if (mintTx.receipt) {
       logger.info(
         `Mint has been executed, txHash is ${mintTx.receipt.transactionHash}, gasPrice is ${gasPrice}, gas used is ${mintTx.receipt.gasUsed}.`
       );
+    } else if (mintTx.txHash) {
+      logger.info(`Mint has been submitted, txHash is ${mintTx.txHash}, nonce is ${mintTx.nonce}, gasPrice is ${gasPrice}.`);
     }
 
     return {
       tx: mintTx.receipt,
       network: ethereumish.chain,
       timestamp: startTimestamp,
-      txHash: mintTx.receipt?.transactionHash,
+      txHash: mintTx.receipt?.transactionHash ?? mintTx.txHash,
+      nonce: mintTx.nonce,
       unsignedTransaction: mintTx.unsignedTransaction,
     };
   } catch (error) {
@@ -1648,7 +1765,8 @@ export async function getTickSpacingAndInitializedTicks(
   const { wallet } = await txWriteData(ethereumish, req.address, false);
   const result = await panopticish.getTickSpacingAndInitializedTicks(
     wallet,
-    req.uniswapV3PoolAddress
+    req.uniswapV3PoolAddress,
+    req.includeInitializedTicks
   );
   if (result instanceof Error) {
     logger.error(`Error executing getTickSpacingAndInitializedTicks: ${result.message}`);
@@ -1656,3 +1774,103 @@ export async function getTickSpacingAndInitializedTicks(
   }
   return result
 }
+
+export async function accountSnapshot(
+  ethereumish: Ethereumish,
+  panopticish: Panoptic,
+  req: AccountSnapshotRequest
+): Promise<AccountSnapshotResponse | Error> {
+  const { wallet } = await txWriteData(ethereumish, req.address, true);
+  const result = await panopticish.getAccountSnapshot(
+    wallet,
+    req.panopticPool,
+    req.positionIdList
+  );
+  if (result instanceof Error) {
+    logger.error(`Error executing accountSnapshot: ${result.message}`);
+    return result;
+  }
+  return result
+}
+
+export async function portfolioGreeks(
+  ethereumish: Ethereumish,
+  panopticish: Panoptic,
+  req: PortfolioGreeksRequest
+): Promise<PortfolioGreeksResponse | Error> {
+  const { wallet } = await txWriteData(ethereumish, req.address, true);
+  const result = await panopticish.getPortfolioGreeks(
+    wallet,
+    req.panopticPool,
+    req.positionIdList,
+    req.gridLowerTick,
+    req.gridUpperTick,
+    req.gridPoints
+  );
+  if (result instanceof Error) {
+    logger.error(`Error executing portfolioGreeks: ${result.message}`);
+    return result;
+  }
+  return result
+}
+
+export async function collateralSurface(
+  ethereumish: Ethereumish,
+  panopticish: Panoptic,
+  req: CollateralSurfaceRequest
+): Promise<CollateralSurfaceResponse | Error> {
+  const { wallet } = await txWriteData(ethereumish, req.address, true);
+  const result = await panopticish.getCollateralSurface(
+    wallet,
+    req.panopticPool,
+    req.positionIdList,
+    req.ticks,
+    req.gridLowerTick,
+    req.gridUpperTick,
+    req.gridPoints,
+    req.batchSize
+  );
+  if (result instanceof Error) {
+    logger.error(`Error executing collateralSurface: ${result.message}`);
+    return result;
+  }
+  return result
+}
+
+export async function viewCacheStats(
+  panopticish: Panoptic,
+  _req: ViewCacheStatsRequest
+): Promise<ViewCacheStatsResponse | Error> {
+  return await panopticish.getViewCacheStats();
+}
+
+export async function streamSpotPrice(
+  ethereumish: Ethereumish,
+  panopticish: Panoptic,
+  req: StreamSpotPriceRequest,
+  onUpdate: (update: SpotPriceUpdate) => void
+): Promise<(() => void) | Error> {
+  // Only checks that the wallet is loaded; slot0 is read through the connector's provider
+  await txWriteData(ethereumish, req.address, false);
+  const result = await panopticish.subscribeSpotPrice(
+    req.uniswapV3PoolAddress,
+    req.token0Decimals,
+    req.token1Decimals,
+    onUpdate
+  );
+  if (result instanceof Error) {
+    logger.error(`Error executing streamSpotPrice: ${result.message}`);
+  }
+  return result;
+}
+
+export async function pollTransactions(
+  panopticish: Panoptic,
+  req: PollTransactionsRequest
+): Promise<PollTransactionsResponse | Error> {
+  const result = await panopticish.pollTransactions(req.txHashes, req.afterBlock, req.timeoutMs);
+  if (result instanceof Error) {
+    logger.error(`Error executing pollTransactions: ${result.message}`);
+  }
+  return result;
+}
@@ -0,0 +1,138 @@
+import { TokenIdLeg } from './panoptic.tokenid';
+
+// Closed-form value and greeks of the Panoptic streamia payoff V(x, K, r): a leg struck at K
+// with range factor r is fully in token0 below K/r, fully in token1 above K*r, and follows the
+// concentrated liquidity curve in between.
+
+export interface PayoffGreeks {
+  value: number;
+  delta: number;
+  gamma: number;
+}
+
+export interface PayoffLeg {
+  strike: number;
+  range: number;
+  // Signed number of payoffs held; negative for legs bought
+  weight: number;
+  // Token deposited against the leg: the payoff is measured against holding it (x for token0,
+  // K for token1). Omitted for the bare payoff V.
+  tokenType?: number;
+}
+
+function checkRange(r: number): void {
+  if (!(r > 1)) {
+    throw new Error(`Range factor must be greater than 1 (got ${r})`);
+  }
+}
+
+export function payoffValue(x: number, K: number, r: number): number {
+  checkRange(r);
+  if (x <= K / r) {
+    return x;
+  } else if (x <= K * r) {
+    return (2 * Math.sqrt(x * K * r) - x - K) / (r - 1);
+  }
+  return K;
+}
+
+export function payoffDelta(x: number, K: number, r: number): number {
+  checkRange(r);
+  if (x <= K / r) {
+    return 1;
+  } else if (x <= K * r) {
+    return (Math.sqrt((K * r) / x) - 1) / (r - 1);
+  }
+  return 0;
+}
+
+export function payoffGamma(x: number, K: number, r: number): number {
+  checkRange(r);
+  if (x <= K / r || x > K * r) {
+    return 0;
+  }
+  return (-0.5 * Math.sqrt(K * r)) / (x * Math.sqrt(x) * (r - 1));
+}
+
+/**
+ * Value, delta and gamma for arrays of (strike, range, price) in a single pass. Arrays of length
+ * one are broadcast against the others.
+ */
+export function payoffGreeks(
+  strikes: ArrayLike<number>,
+  ranges: ArrayLike<number>,
+  prices: ArrayLike<number>
+): { value: Float64Array, delta: Float64Array, gamma: Float64Array } {
+  const n = Math.max(strikes.length, ranges.length, prices.length);
+  for (const arr of [strikes, ranges, prices]) {
+    if (arr.length !== n && arr.length !== 1) {
+      throw new Error(`Cannot broadcast arrays of length ${arr.length} and ${n}`);
+    }
+  }
+  const value = new Float64Array(n);
+  const delta = new Float64Array(n);
+  const gamma = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    const K = strikes[strikes.length === 1 ? 0 : i];
+    const r = ranges[ranges.length === 1 ? 0 : i];
+    const x = prices[prices.length === 1 ? 0 : i];
+    checkRange(r);
+    const lower = K / r;
+    const upper = K * r;
+    if (x <= lower) {
+      value[i] = x;
+      delta[i] = 1;
+    } else if (x <= upper) {
+      const sqrtUpper = Math.sqrt(upper);
+      const sqrtX = Math.sqrt(x);
+      value[i] = (2 * sqrtX * sqrtUpper - x - K) / (r - 1);
+      delta[i] = (sqrtUpper / sqrtX - 1) / (r - 1);
+      gamma[i] = (-0.5 * sqrtUpper) / (x * sqrtX * (r - 1));
+    } else {
+      value[i] = K;
+    }
+  }
+  return { value, delta, gamma };
+}
+
+/**
+ * Aggregate value and greeks of a multi-leg position at each price.
+ */
+export function positionGreeks(
+  legs: PayoffLeg[],
+  prices: ArrayLike<number>
+): { value: Float64Array, delta: Float64Array, gamma: Float64Array } {
+  const value = new Float64Array(prices.length);
+  const delta = new Float64Array(prices.length);
+  const gamma = new Float64Array(prices.length);
+  for (const leg of legs) {
+    const greeks = payoffGreeks([leg.strike], [leg.range], prices);
+    for (let i = 0; i < prices.length; i++) {
+      const held = leg.tokenType === 0 ? prices[i] : leg.tokenType === 1 ? leg.strike : 0;
+      value[i] += leg.weight * (greeks.value[i] - held);
+      delta[i] += leg.weight * (greeks.delta[i] - (leg.tokenType === 0 ? 1 : 0));
+      gamma[i] += leg.weight * greeks.gamma[i];
+    }
+  }
+  return { value, delta, gamma };
+}
+
+/**
+ * Payoff legs of a Panoptic position in raw token1/token0 prices. Sellers hold the liquidity they
+ * deposited (positive weight), buyers owe it; the notional is positionSize * optionRatio of the
+ * asset token, as in PanopticMath.getLiquidityChunk.
+ */
+export function tokenIdPayoffLegs(legs: TokenIdLeg[], tickSpacing: number, positionSize: number): PayoffLeg[] {
+  return legs.map((leg) => {
+    const tickLower = leg.strike - Math.floor((leg.width * tickSpacing) / 2);
+    const tickUpper = leg.strike + Math.ceil((leg.width * tickSpacing) / 2);
+    const strike = 1.0001 ** ((tickLower + tickUpper) / 2);
+    const notional = positionSize * leg.optionRatio;
+    return {
+      strike,
+      range: 1.0001 ** ((tickUpper - tickLower) / 2),
+      weight: (leg.isLong ? -1 : 1) * (leg.asset === 0 ? notional : notional / strike),
+      tokenType: leg.tokenType,
+    };
+  });
+}
@@ -0,0 +1,50 @@
+import { BigNumberish } from 'ethers';
+
+/**
+ * Integer ticks for a collateral surface: `gridPoints` evenly spaced ticks from lowerTick to
+ * upperTick, rounded to int24 values and deduplicated, in ascending order.
+ */
+export function surfaceTicks(lowerTick: number, upperTick: number, gridPoints: number): number[] {
+  const step = (upperTick - lowerTick) / (gridPoints - 1);
+  const ticks = Array.from({ length: gridPoints }, (_, i) => Math.round(lowerTick + i * step));
+  return ticks.filter((tick, i) => i === 0 || tick !== ticks[i - 1]);
+}
+
+/**
+ * Collateral balance minus requirement, both valued in token1 at the tick's raw price
+ * (1.0001 ** tick token1 per token0). The account is solvent where this is non-negative.
+ */
+export function crossMarginSurplus(
+  tick: number,
+  collateralBalance0: BigNumberish,
+  requiredCollateral0: BigNumberish,
+  collateralBalance1: BigNumberish,
+  requiredCollateral1: BigNumberish
+): number {
+  const excess0 = parseFloat(collateralBalance0.toString()) - parseFloat(requiredCollateral0.toString());
+  const excess1 = parseFloat(collateralBalance1.toString()) - parseFloat(requiredCollateral1.toString());
+  return excess0 * 1.0001 ** tick + excess1;
+}
+
+/**
+ * Ticks at which the surplus changes sign between neighbouring grid points, linearly interpolated,
+ * in ascending order. Ticks whose surplus is undefined (the helper call reverted) are skipped.
+ */
+export function liquidationBoundaries(ticks: number[], surplus: Array<number | null>): number[] {
+  const boundaries: number[] = [];
+  let previous = -1;
+  for (let i = 0; i < ticks.length; i++) {
+    const current = surplus[i];
+    if (current === null) {
+      continue;
+    }
+    if (previous >= 0) {
+      const before = surplus[previous] as number;
+      if ((before >= 0) !== (current >= 0)) {
+        boundaries.push(ticks[previous] + ((ticks[i] - ticks[previous]) * before) / (before - current));
+      }
+    }
+    previous = i;
+  }
+  return boundaries;
+}
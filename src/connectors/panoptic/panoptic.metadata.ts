@@ -0,0 +1,77 @@
+import { LocalStorage } from '../../services/local-storage';
+import { ReferenceCountingCloseable } from '../../services/refcounting-closeable';
+import { logger } from '../../services/logger';
+
+// Write-once store for on-chain values that never change once they exist (pool addresses,
+// tickSpacings, poolIds, collateral trackers). Entries are loaded into memory on init and
+// persisted to LevelDB, so a restarted gateway answers them without any RPC.
+export class PanopticMetadataStore extends ReferenceCountingCloseable {
+  readonly localStorage: LocalStorage;
+  private _entries: Map<string, any> = new Map();
+  private _pending: Map<string, Promise<any>> = new Map();
+  private _loaded: Promise<void> | undefined;
+
+  protected constructor(dbPath: string) {
+    super(dbPath);
+    this.localStorage = LocalStorage.getInstance(dbPath, this.handle);
+  }
+
+  public async init(): Promise<void> {
+    if (this._loaded === undefined) {
+      this._loaded = (async () => {
+        await this.localStorage.init();
+        const entries = await this.localStorage.get((key: string, value: any) => [key, value]);
+        for (const [key, value] of Object.entries(entries)) {
+          this._entries.set(key, value);
+        }
+      })();
+    }
+    await this._loaded;
+  }
+
+  public get<T>(key: string): T | undefined {
+    return this._entries.get(key);
+  }
+
+  /**
+   * Returns the stored value for `key`, or loads, stores and returns it. Concurrent callers share
+   * one load. Values rejected by `isFinal` (e.g. a pool that is not deployed yet) are returned but
+   * not stored.
+   */
+  public async getOrLoad<T>(
+    key: string,
+    load: () => Promise<T>,
+    isFinal: (value: T) => boolean = () => true
+  ): Promise<T> {
+    if (this._entries.has(key)) {
+      return this._entries.get(key);
+    }
+    const pending = this._pending.get(key);
+    if (pending !== undefined) {
+      return pending;
+    }
+    const result = (async () => {
+      try {
+        const value = await load();
+        if (isFinal(value)) {
+          this._entries.set(key, value);
+          await this.localStorage.save(key, value).catch((error) =>
+            logger.warn(`Could not persist Panoptic metadata ${key}: ${(error as Error).message}`)
+          );
+        }
+        return value;
+      } finally {
+        this._pending.delete(key);
+      }
+    })();
+    this._pending.set(key, result);
+    return result;
+  }
+
+  public async close(handle: string): Promise<void> {
+    await super.close(handle);
+    if (this.refCount < 1) {
+      await this.localStorage.close(this.handle);
+    }
+  }
+}
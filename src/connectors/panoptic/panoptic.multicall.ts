@@ -0,0 +1,94 @@
+import { Contract, Signer } from 'ethers';
+import { Provider } from '@ethersproject/abstract-provider';
+import { Interface, Result } from 'ethers/lib/utils';
+
+// Multicall3 is deployed at the same address on every supported chain and is a superset of
+// Multicall2, so anything written against the older aggregate/tryAggregate calls keeps working.
+export const MULTICALL3_ABI = [
+  'function aggregate3(tuple(address target, bool allowFailure, bytes callData)[] calls) payable returns (tuple(bool success, bytes returnData)[] returnData)',
+  'function getBlockNumber() view returns (uint256 blockNumber)',
+];
+const multicall3Interface = new Interface(MULTICALL3_ABI);
+
+export const DEFAULT_MULTICALL_BATCH_SIZE = 500;
+
+export interface MulticallRequest {
+  target: string;
+  iface: Interface;
+  method: string;
+  args?: ReadonlyArray<any>;
+  allowFailure?: boolean;
+}
+
+export interface MulticallResult {
+  success: boolean;
+  result: Result | null;
+}
+
+/**
+ * Run a list of view calls through Multicall3.aggregate3, chunked into batches of at most
+ * `batchSize` calls. All chunks are pinned to the same `blockTag` so the results form one
+ * consistent snapshot. Results are returned in request order; calls that revert with
+ * `allowFailure` set come back as `{ success: false, result: null }`.
+ */
+export async function aggregate3(
+  signerOrProvider: Signer | Provider,
+  multicallAddress: string,
+  calls: MulticallRequest[],
+  blockTag?: number | string,
+  batchSize: number = DEFAULT_MULTICALL_BATCH_SIZE
+): Promise<MulticallResult[]> {
+  if (!Number.isInteger(batchSize) || batchSize < 1) {
+    throw new Error(`aggregate3 batchSize must be a positive integer (got ${batchSize})`);
+  }
+  const multicall = new Contract(multicallAddress, multicall3Interface, signerOrProvider);
+  const overrides = blockTag === undefined ? {} : { blockTag };
+
+  const chunks: MulticallRequest[][] = [];
+  for (let i = 0; i < calls.length; i += batchSize) {
+    chunks.push(calls.slice(i, i + batchSize));
+  }
+
+  const responses = await Promise.all(
+    chunks.map((chunk) =>
+      multicall.callStatic.aggregate3(
+        chunk.map((call) => ({
+          target: call.target,
+          allowFailure: call.allowFailure ?? false,
+          callData: call.iface.encodeFunctionData(call.method, call.args ?? []),
+        })),
+        overrides
+      )
+    )
+  );
+
+  const results: MulticallResult[] = [];
+  responses.forEach((returnData: Array<{ success: boolean; returnData: string }>, chunkIndex) => {
+    returnData.forEach((item, i) => {
+      const call = chunks[chunkIndex][i];
+      results.push({
+        success: item.success,
+        result: item.success ? call.iface.decodeFunctionResult(call.method, item.returnData) : null,
+      });
+    });
+  });
+  return results;
+}
+
+/**
+ * Positions (0-255) of the set bits in a uint256 bitmap word, lowest first.
+ */
+export function setBitPositions(word: { toHexString(): string }): number[] {
+  const hex = word.toHexString().slice(2);
+  const positions: number[] = [];
+  for (let nibbleIndex = 0; nibbleIndex < hex.length; nibbleIndex++) {
+    const nibble = parseInt(hex[hex.length - 1 - nibbleIndex], 16);
+    if (nibble === 0) continue;
+    for (let bit = 0; bit < 4; bit++) {
+      if (nibble & (1 << bit)) {
+        positions.push(nibbleIndex * 4 + bit);
+      }
+    }
+  }
+  return positions;
+}
@@ -0,0 +1,212 @@
+import { BigNumber, providers } from 'ethers';
+import { hexZeroPad } from 'ethers/lib/utils';
+import { panopticPoolInterface } from './panoptic.contracts';
+import { logger } from '../../services/logger';
+
+export interface BookPosition {
+  tokenId: string;
+  positionSize: string;
+  blockNumber: number; // block the position was minted in
+}
+
+export interface PositionBookSnapshot {
+  blockNumber: number; // every event up to this block has been applied
+  positions: BookPosition[];
+}
+
+export interface Reconciliation {
+  blockNumber: number;
+  checkedAt: number;
+  missingFromBook: string[]; // open in the subgraph, not in the book
+  missingFromSubgraph: string[]; // open in the book, not in the subgraph (only when the subgraph list is complete)
+}
+
+// Open tokenIds according to the subgraph; `complete` is false when its result was truncated
+export type SubgraphPositions = () => Promise<{ open: string[], complete: boolean }>;
+
+type EventPosition = [number, number]; // (blockNumber, logIndex)
+
+const before = (a: EventPosition, b: EventPosition) => a[0] < b[0] || (a[0] === b[0] && a[1] < b[1]);
+
+const [MINTED, BURNT, LIQUIDATED, EXERCISED] = ['OptionMinted', 'OptionBurnt', 'AccountLiquidated', 'ForcedExercised']
+  .map((name) => panopticPoolInterface.getEventTopic(name));
+
+// getLogs over [fromBlock, toBlock] in chunks of chunkSize blocks, halving the chunk whenever the
+// node refuses a range as too large. With `firstMatch`, stops after the first chunk returning logs.
+export async function getLogsInChunks(
+  provider: providers.Provider,
+  filter: providers.Filter,
+  fromBlock: number,
+  toBlock: number,
+  chunkSize: number = 10000,
+  firstMatch: boolean = false
+): Promise<providers.Log[]> {
+  const logs: providers.Log[] = [];
+  let chunk = chunkSize;
+  for (let start = fromBlock; start <= toBlock && !(firstMatch && logs.length > 0);) {
+    const end = Math.min(start + chunk - 1, toBlock);
+    try {
+      logs.push(...await provider.getLogs({ ...filter, fromBlock: start, toBlock: end }));
+      start = end + 1;
+    } catch (error) {
+      if (chunk === 1) {
+        throw error;
+      }
+      chunk = Math.ceil(chunk / 2);
+    }
+  }
+  return logs;
+}
+
+/**
+ * One account's open positions in one PanopticPool, kept from the pool's own events instead of the
+ * subgraph. On first use it replays the account's OptionMinted / OptionBurnt / ForcedExercised /
+ * AccountLiquidated logs from the pool's deployment block (in getLogs chunks), then stays current from
+ * a log subscription and from the receipts of our own transactions (`applyLogs`), whichever arrives
+ * first. Events are applied idempotently and in (block, logIndex) order per tokenId, so replays and
+ * late deliveries are harmless; a reorged (removed) log triggers a full replay.
+ *
+ * The subgraph is only consulted by `reconcile`, as a periodic consistency check.
+ */
+export class PositionBook {
+  private _open: Map<string, BookPosition> = new Map();
+  // Latest event applied per tokenId, closed ones included, so stale replays are ignored
+  private _lastEvent: Map<string, EventPosition> = new Map();
+  private _liquidatedAt: EventPosition = [-1, -1];
+  private _blockNumber: number = -1;
+  private _started: Promise<void> | undefined;
+  private _filters: providers.Filter[];
+  private _onLog = (log: providers.Log) => this.onLog(log);
+  private _reconciliation: Reconciliation | undefined;
+
+  constructor(
+    private provider: providers.Provider,
+    readonly pool: string,
+    readonly account: string,
+    private deployBlock: () => Promise<number>,
+    private chunkSize: number = 10000
+  ) {
+    const accountTopic = hexZeroPad(account, 32).toLowerCase();
+    // The account is the first indexed argument of mint/burn events and the second of the others
+    this._filters = [
+      { address: pool, topics: [[MINTED, BURNT], accountTopic] },
+      { address: pool, topics: [[EXERCISED, LIQUIDATED], null, accountTopic] },
+    ];
+  }
+
+  get reconciliation(): Reconciliation | undefined {
+    return this._reconciliation;
+  }
+
+  async snapshot(): Promise<PositionBookSnapshot> {
+    if (this._started === undefined) {
+      this._started = this.start();
+      this._started.catch(() => {
+        this._started = undefined;
+      });
+    }
+    await this._started;
+    const positions = [...this._open.values()].sort((a, b) => a.blockNumber - b.blockNumber);
+    return { blockNumber: this._blockNumber, positions };
+  }
+
+  // Apply events from one of our own receipts; logs of other pools or accounts are ignored
+  applyLogs(logs: providers.Log[]): void {
+    for (const log of logs) {
+      if (log.address.toLowerCase() === this.pool.toLowerCase() && this.matches(log)) {
+        this.apply(log);
+      }
+    }
+  }
+
+  async reconcile(subgraphPositions: SubgraphPositions): Promise<Reconciliation> {
+    const { blockNumber, positions } = await this.snapshot();
+    const { open, complete } = await subgraphPositions();
+    const subgraph = new Set(open.map((id) => BigNumber.from(id).toString()));
+    const book = new Set(positions.map((position) => position.tokenId));
+    this._reconciliation = {
+      blockNumber,
+      checkedAt: Date.now(),
+      missingFromBook: [...subgraph].filter((id) => !book.has(id)),
+      missingFromSubgraph: complete ? [...book].filter((id) => !subgraph.has(id)) : [],
+    };
+    if (this._reconciliation.missingFromBook.length > 0 || this._reconciliation.missingFromSubgraph.length > 0) {
+      logger.warn(`Position book of ${this.account} in ${this.pool} differs from the subgraph: ${JSON.stringify(this._reconciliation)}`);
+    }
+    return this._reconciliation;
+  }
+
+  close(): void {
+    if (this._started !== undefined) {
+      this._filters.forEach((filter) => this.provider.off(filter, this._onLog));
+      this._started = undefined;
+    }
+  }
+
+  private async start(): Promise<void> {
+    // Subscribe before replaying so nothing between the replay's head and the first poll is missed
+    this._filters.forEach((filter) => this.provider.on(filter, this._onLog));
+    try {
+      const fromBlock = await this.deployBlock();
+      const head = await this.provider.getBlockNumber();
+      for (const filter of this._filters) {
+        for (const log of await getLogsInChunks(this.provider, filter, fromBlock, head, this.chunkSize)) {
+          this.apply(log);
+        }
+      }
+      this._blockNumber = Math.max(this._blockNumber, head);
+    } catch (error) {
+      this._filters.forEach((filter) => this.provider.off(filter, this._onLog));
+      throw error;
+    }
+  }
+
+  private onLog(log: providers.Log): void {
+    if (log.removed) {
+      logger.info(`Reorg touched the positions of ${this.account} in ${this.pool}; replaying its events.`);
+      this.close();
+      this._open.clear();
+      this._lastEvent.clear();
+      this._liquidatedAt = [-1, -1];
+      this._blockNumber = -1;
+      return;
+    }
+    this.apply(log);
+  }
+
+  private matches(log: providers.Log): boolean {
+    const accountTopic = hexZeroPad(this.account, 32).toLowerCase();
+    const [topic0, topic1, topic2] = log.topics.map((topic) => topic.toLowerCase());
+    return ((topic0 === MINTED || topic0 === BURNT) && topic1 === accountTopic)
+      || ((topic0 === EXERCISED || topic0 === LIQUIDATED) && topic2 === accountTopic);
+  }
+
+  private apply(log: providers.Log): void {
+    const at: EventPosition = [log.blockNumber, log.logIndex];
+    this._blockNumber = Math.max(this._blockNumber, log.blockNumber);
+    const event = panopticPoolInterface.parseLog(log);
+    if (event.name === 'AccountLiquidated') {
+      if (before(this._liquidatedAt, at)) {
+        this._liquidatedAt = at;
+      }
+      for (const [tokenId, position] of this._lastEvent) {
+        if (before(position, at)) {
+          this._open.delete(tokenId);
+          this._lastEvent.set(tokenId, at);
+        }
+      }
+      return;
+    }
+    const tokenId = event.args.tokenId.toString();
+    const last = this._lastEvent.get(tokenId);
+    if ((last !== undefined && !before(last, at)) || before(at, this._liquidatedAt)) {
+      return;
+    }
+    this._lastEvent.set(tokenId, at);
+    if (event.name === 'OptionMinted') {
+      this._open.set(tokenId, { tokenId, positionSize: event.args.positionSize.toString(), blockNumber: log.blockNumber });
+    } else {
+      this._open.delete(tokenId);
+    }
+  }
+}
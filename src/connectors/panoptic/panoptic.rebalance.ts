@@ -0,0 +1,94 @@
+import { BigNumber, BigNumberish } from 'ethers';
+import { Interface } from 'ethers/lib/utils';
+
+export interface RebalanceMint {
+  tokenId: BigNumberish;
+  positionSize: BigNumberish;
+  effectiveLiquidityLimit?: BigNumberish;
+}
+
+export interface RebalancePlan {
+  burnTokenIds: BigNumber[];
+  // Open positions after the burns, before any mint
+  remainingPositionIdList: BigNumber[];
+  mints: { tokenId: BigNumber, positionSize: BigNumber, effectiveLiquidityLimit: BigNumber, positionIdList: BigNumber[] }[];
+  finalPositionIdList: BigNumber[];
+}
+
+/**
+ * Order the burns and mints of a rebalance against the account's current position list. Burns go
+ * first in one batch burnOptions call; each mint then appends its tokenId to the running list, as
+ * mintOptions expects the full list ending with the new position.
+ */
+export function planRebalance(
+  currentPositionIdList: BigNumberish[],
+  burnTokenIds: BigNumberish[],
+  mints: RebalanceMint[]
+): RebalancePlan | Error {
+  const current = currentPositionIdList.map((id) => BigNumber.from(id));
+  const held = new Set(current.map((id) => id.toString()));
+  const burns = burnTokenIds.map((id) => BigNumber.from(id));
+  const burnSet = new Set(burns.map((id) => id.toString()));
+  if (burnSet.size !== burns.length) {
+    return new Error('Error on planRebalance: duplicate tokenId in burnTokenIds');
+  }
+  for (const id of burnSet) {
+    if (!held.has(id)) {
+      return new Error(`Error on planRebalance: ${id} is not in currentPositionIdList`);
+    }
+  }
+  if (burns.length === 0 && mints.length === 0) {
+    return new Error('Error on planRebalance: nothing to burn or mint');
+  }
+
+  const positionIdList = current.filter((id) => !burnSet.has(id.toString()));
+  const remainingPositionIdList = [...positionIdList];
+  const plannedMints: RebalancePlan['mints'] = [];
+  for (const mint of mints) {
+    const tokenId = BigNumber.from(mint.tokenId);
+    if (positionIdList.some((id) => id.eq(tokenId))) {
+      return new Error(`Error on planRebalance: ${tokenId.toString()} is already open`);
+    }
+    positionIdList.push(tokenId);
+    plannedMints.push({
+      tokenId,
+      positionSize: BigNumber.from(mint.positionSize),
+      effectiveLiquidityLimit: BigNumber.from(mint.effectiveLiquidityLimit ?? 0),
+      positionIdList: [...positionIdList],
+    });
+  }
+  return {
+    burnTokenIds: burns,
+    remainingPositionIdList,
+    mints: plannedMints,
+    finalPositionIdList: positionIdList,
+  };
+}
+
+// PanopticPool calldata for a plan, in execution order
+export function encodeRebalance(
+  panopticPoolInterface: Interface,
+  plan: RebalancePlan,
+  tickLimitLow: number,
+  tickLimitHigh: number
+): string[] {
+  const calls: string[] = [];
+  if (plan.burnTokenIds.length === 1) {
+    calls.push(panopticPoolInterface.encodeFunctionData(
+      'burnOptions(uint256,uint256[],int24,int24)',
+      [plan.burnTokenIds[0], plan.remainingPositionIdList, tickLimitLow, tickLimitHigh]
+    ));
+  } else if (plan.burnTokenIds.length > 1) {
+    calls.push(panopticPoolInterface.encodeFunctionData(
+      'burnOptions(uint256[],uint256[],int24,int24)',
+      [plan.burnTokenIds, plan.remainingPositionIdList, tickLimitLow, tickLimitHigh]
+    ));
+  }
+  for (const mint of plan.mints) {
+    calls.push(panopticPoolInterface.encodeFunctionData(
+      'mintOptions',
+      [mint.positionIdList, mint.positionSize, mint.effectiveLiquidityLimit, tickLimitLow, tickLimitHigh]
+    ));
+  }
+  return calls;
+}
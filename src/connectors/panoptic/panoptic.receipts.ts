@@ -0,0 +1,176 @@
+import { BigNumber, providers } from 'ethers';
+import { fetchJson } from 'ethers/lib/utils';
+import { PolledTransaction, PollTransactionsResponse } from '../../options/options.requests';
+
+export const DEFAULT_RPC_BATCH_SIZE = 100;
+
+/**
+ * Send JSON-RPC calls as batch requests of at most `batchSize` calls each. Results are returned
+ * in call order; a call the node answers with an error (or leaves unanswered) comes back as an
+ * Error carrying the node's `code` and `data`. A node that rejects batching altogether, answering
+ * with anything but an array, makes the whole call throw.
+ */
+export async function jsonRpcBatch(
+  provider: providers.JsonRpcProvider,
+  calls: Array<[string, ReadonlyArray<any>]>,
+  batchSize: number = DEFAULT_RPC_BATCH_SIZE
+): Promise<any[]> {
+  const results: any[] = calls.map(([method]) => new Error(`No response to ${method} in JSON-RPC batch`));
+  const chunks: Promise<void>[] = [];
+  for (let start = 0; start < calls.length; start += batchSize) {
+    const payload = calls.slice(start, start + batchSize).map(([method, params], i) => ({
+      jsonrpc: '2.0',
+      id: start + i,
+      method,
+      params,
+    }));
+    chunks.push(
+      fetchJson(provider.connection, JSON.stringify(payload)).then((responses: any) => {
+        if (!Array.isArray(responses)) {
+          throw new Error(`JSON-RPC batch rejected: ${responses?.error?.message ?? JSON.stringify(responses)}`);
+        }
+        // Batch responses may come back in any order
+        for (const response of responses) {
+          if (typeof response?.id !== 'number' || response.id < start || response.id >= start + payload.length) {
+            continue;
+          }
+          if (response.error !== undefined) {
+            const error: any = new Error(response.error.message);
+            error.code = response.error.code;
+            error.data = response.error.data;
+            results[response.id] = error;
+          } else {
+            results[response.id] = response.result;
+          }
+        }
+      })
+    );
+  }
+  await Promise.all(chunks);
+  return results;
+}
+
+// Resolves with the first block number above `afterBlock`, or undefined after `timeoutMs`
+export function nextBlock(
+  provider: providers.Provider,
+  afterBlock: number,
+  timeoutMs: number
+): Promise<number | undefined> {
+  return new Promise((resolve) => {
+    const finish = (blockNumber: number | undefined) => {
+      clearTimeout(timer);
+      provider.off('block', onBlock);
+      resolve(blockNumber);
+    };
+    const onBlock = (blockNumber: number) => {
+      if (blockNumber > afterBlock) {
+        finish(blockNumber);
+      }
+    };
+    const timer = setTimeout(() => finish(undefined), timeoutMs);
+    provider.on('block', onBlock);
+  });
+}
+
+/**
+ * Reports the state of many transactions with one batched JSON-RPC round trip: the head block plus
+ * eth_getTransactionReceipt and eth_getTransactionByHash for every hash. A second batch of
+ * eth_getTransactionCount is sent only for senders of transactions that have no receipt yet, to tell
+ * a transaction still waiting in the mempool from one whose nonce was used by a replacement.
+ * Senders and nonces are remembered per hash, so a replaced transaction that has already left the
+ * mempool is still recognized.
+ */
+export class ReceiptPoller {
+  private _senders: Map<string, { from: string, nonce: number }> = new Map();
+
+  constructor(private provider: providers.JsonRpcProvider) {}
+
+  async poll(txHashes: string[]): Promise<PollTransactionsResponse> {
+    const hashes = txHashes.map((txHash) => txHash.toLowerCase());
+    const results = await jsonRpcBatch(this.provider, [
+      ['eth_blockNumber', []],
+      ...hashes.map((txHash): [string, any[]] => ['eth_getTransactionReceipt', [txHash]]),
+      ...hashes.map((txHash): [string, any[]] => ['eth_getTransactionByHash', [txHash]]),
+    ]);
+    if (results[0] instanceof Error || results[0] === null) {
+      throw new Error(`eth_blockNumber failed: ${results[0]?.message ?? 'null result'}`);
+    }
+    const blockNumber = BigNumber.from(results[0]).toNumber();
+    const receipts = results.slice(1, 1 + hashes.length);
+    const transactions = results.slice(1 + hashes.length);
+
+    hashes.forEach((txHash, i) => {
+      if (transactions[i] !== null && !(transactions[i] instanceof Error) && !this._senders.has(txHash)) {
+        this._senders.set(txHash, {
+          from: transactions[i].from.toLowerCase(),
+          nonce: BigNumber.from(transactions[i].nonce).toNumber(),
+        });
+      }
+    });
+
+    const unresolved = new Set<string>();
+    hashes.forEach((txHash, i) => {
+      const sender = this._senders.get(txHash);
+      if (receipts[i] === null && sender !== undefined) {
+        unresolved.add(sender.from);
+      }
+    });
+    const senders = Array.from(unresolved);
+    // Pinned to the head read above, so a transaction mined after its receipt lookup is not taken for replaced
+    const counts = senders.length > 0
+      ? await jsonRpcBatch(this.provider, senders.map((from): [string, any[]] => ['eth_getTransactionCount', [from, results[0]]]))
+      : [];
+    const minedNonces = new Map<string, number | Error>(senders.map((from, i) => [
+      from,
+      counts[i] instanceof Error || counts[i] === null
+        ? new Error(`eth_getTransactionCount failed: ${counts[i]?.message ?? 'null result'}`)
+        : BigNumber.from(counts[i]).toNumber(),
+    ]));
+
+    return {
+      blockNumber,
+      transactions: hashes.map((txHash, i): PolledTransaction => {
+        const receipt = receipts[i];
+        const sender = this._senders.get(txHash);
+        // A failed lookup is reported as such rather than as pending; the caller asks again next block
+        if (receipt instanceof Error) {
+          return { txHash: txHashes[i], status: 'error', error: receipt.message, from: sender?.from, nonce: sender?.nonce };
+        }
+        if (receipt !== null) {
+          // Final: the caller stops asking about this hash
+          this._senders.delete(txHash);
+          const receiptBlock = BigNumber.from(receipt.blockNumber).toNumber();
+          return {
+            txHash: txHashes[i],
+            status: BigNumber.from(receipt.status).eq(1) ? 'confirmed' : 'reverted',
+            blockNumber: receiptBlock,
+            confirmations: Math.max(blockNumber - receiptBlock + 1, 1),
+            gasUsed: BigNumber.from(receipt.gasUsed).toString(),
+            effectiveGasPrice: receipt.effectiveGasPrice ? BigNumber.from(receipt.effectiveGasPrice).toString() : undefined,
+            from: receipt.from,
+            nonce: sender?.nonce,
+          };
+        }
+        if (sender === undefined) {
+          return transactions[i] instanceof Error
+            ? { txHash: txHashes[i], status: 'error', error: transactions[i].message }
+            : { txHash: txHashes[i], status: 'unknown' };
+        }
+        const minedNonce = minedNonces.get(sender.from);
+        if (minedNonce instanceof Error) {
+          return { txHash: txHashes[i], status: 'error', error: minedNonce.message, from: sender.from, nonce: sender.nonce };
+        }
+        const replaced = minedNonce !== undefined && minedNonce > sender.nonce;
+        if (replaced) {
+          this._senders.delete(txHash);
+        }
+        return {
+          txHash: txHashes[i],
+          status: replaced ? 'replaced' : 'pending',
+          from: sender.from,
+          nonce: sender.nonce,
+        };
+      }),
+    };
+  }
+}
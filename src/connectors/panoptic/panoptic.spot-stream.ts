@@ -0,0 +1,143 @@
+import { BigNumberish, providers } from 'ethers';
+import { uniswapV3PoolInterface } from './panoptic.contracts';
+
+export interface Slot0Update {
+  blockNumber: number;
+  sqrtPriceX96: string;
+  tick: number;
+}
+
+export type Slot0Listener = (update: Slot0Update) => void;
+
+// Same conversion as getSpotPrice: token1 per token0, adjusted for the tokens' decimals
+export function sqrtPriceX96ToAdjustedPrice(
+  sqrtPriceX96: BigNumberish,
+  token0Decimals: number,
+  token1Decimals: number
+): number {
+  const price = (Number(sqrtPriceX96.toString()) ** 2) / (2 ** 192);
+  return price * (10 ** (token0Decimals - token1Decimals));
+}
+
+/**
+ * Pushes a Uniswap V3 pool's slot0 to its subscribers whenever the price moves. slot0 is read once
+ * when the first subscriber arrives; after that every update comes from the pool's Swap logs, so an
+ * idle pool costs nothing beyond the provider's own log polling. Swaps delivered together are
+ * folded into the last one per block, and updates that leave sqrtPriceX96 unchanged are dropped.
+ * A reorged (removed) log triggers a fresh slot0 read.
+ */
+export class Slot0Stream {
+  private _listeners: Set<Slot0Listener> = new Set();
+  private _latest: Slot0Update | undefined;
+  // (blockNumber, logIndex) of the latest update; a slot0 read counts as the end of its block
+  private _latestPosition: [number, number] = [-1, -1];
+  private _emitted: string | undefined;
+  private _flushScheduled: boolean = false;
+  private _started: Promise<void> | undefined;
+  private _filter: providers.Filter;
+  private _onLog = (log: providers.Log) => this.onLog(log);
+
+  constructor(
+    private provider: providers.Provider,
+    pool: string,
+    private readSlot0: () => Promise<Slot0Update>
+  ) {
+    this._filter = { address: pool, topics: [uniswapV3PoolInterface.getEventTopic('Swap')] };
+  }
+
+  get latest(): Slot0Update | undefined {
+    return this._latest;
+  }
+
+  get subscribers(): number {
+    return this._listeners.size;
+  }
+
+  /**
+   * Adds a listener, which immediately receives the current slot0, and returns its unsubscribe
+   * function. Rejects (without keeping the listener) if the initial slot0 read fails.
+   */
+  async subscribe(listener: Slot0Listener): Promise<() => void> {
+    this._listeners.add(listener);
+    try {
+      if (this._started === undefined) {
+        this._started = this.start();
+      }
+      await this._started;
+    } catch (error) {
+      this._listeners.delete(listener);
+      if (this._listeners.size === 0) {
+        this._started = undefined;
+      }
+      throw error;
+    }
+    listener(this._latest!);
+    return () => this.unsubscribe(listener);
+  }
+
+  private unsubscribe(listener: Slot0Listener): void {
+    this._listeners.delete(listener);
+    if (this._listeners.size === 0 && this._started !== undefined) {
+      this.provider.off(this._filter, this._onLog);
+      this._started = undefined;
+      this._latest = undefined;
+      this._latestPosition = [-1, -1];
+      this._emitted = undefined;
+    }
+  }
+
+  private async start(): Promise<void> {
+    // Subscribe before reading so a swap landing in between is not missed
+    this.provider.on(this._filter, this._onLog);
+    try {
+      const update = await this.readSlot0();
+      this._latest = update;
+      this._latestPosition = [update.blockNumber, Number.MAX_SAFE_INTEGER];
+      this._emitted = update.sqrtPriceX96;
+    } catch (error) {
+      this.provider.off(this._filter, this._onLog);
+      throw error;
+    }
+  }
+
+  private onLog(log: providers.Log): void {
+    if (log.removed) {
+      this.readSlot0().then(
+        (update) => this.accept(update, [update.blockNumber, Number.MAX_SAFE_INTEGER], true),
+        () => undefined
+      );
+      return;
+    }
+    const { sqrtPriceX96, tick } = uniswapV3PoolInterface.parseLog(log).args;
+    this.accept(
+      { blockNumber: log.blockNumber, sqrtPriceX96: sqrtPriceX96.toString(), tick: Number(tick) },
+      [log.blockNumber, log.logIndex]
+    );
+  }
+
+  private accept(update: Slot0Update, position: [number, number], force: boolean = false): void {
+    const [block, index] = this._latestPosition;
+    if (!force && (position[0] < block || (position[0] === block && position[1] <= index))) {
+      return;
+    }
+    this._latest = update;
+    this._latestPosition = position;
+    // Logs from one poll are delivered synchronously; emit once, after all of them
+    if (!this._flushScheduled) {
+      this._flushScheduled = true;
+      setImmediate(() => this.flush());
+    }
+  }
+
+  private flush(): void {
+    this._flushScheduled = false;
+    const update = this._latest;
+    if (update === undefined || update.sqrtPriceX96 === this._emitted) {
+      return;
+    }
+    this._emitted = update.sqrtPriceX96;
+    for (const listener of this._listeners) {
+      listener(update);
+    }
+  }
+}
@@ -0,0 +1,98 @@
+import { ContractReceipt, PopulatedTransaction, Wallet, providers } from 'ethers';
+import { EVMNonceManager } from '../../chains/ethereum/evm.nonce';
+import { logger } from '../../services/logger';
+
+export interface Submission {
+  txHash: string;
+  nonce: number;
+  receipt: Promise<ContractReceipt>;
+}
+
+const NONCE_ERRORS = ['nonce too low', 'nonce too high', 'nonce_expired', 'already known', 'replacement transaction underpriced'];
+
+function isNonceError(error: unknown): boolean {
+  const message = `${(error as any)?.code ?? ''} ${(error as Error)?.message ?? error}`.toLowerCase();
+  return NONCE_ERRORS.some((pattern) => message.includes(pattern));
+}
+
+/**
+ * Per-wallet submission pipeline. Nonces come from the chain's EVMNonceManager, and each wallet's
+ * sends are serialized so nonce n reaches the node before n + 1 is assigned; a failed send therefore
+ * never leaves a gap behind later transactions. Nothing waits for a receipt before the next send, so
+ * one wallet can have many transactions in flight.
+ *
+ * If the node rejects a nonce (too low, too high, already known), the wallet is resynchronized to
+ * the node's pending transaction count and the send is retried once. Receipts are delivered
+ * through `Submission.receipt`; a transaction that was repriced by a replacement resolves with the
+ * replacement's receipt, while cancelled or reverted ones reject.
+ */
+export class TransactionSubmitter {
+  private _queues: Map<string, Promise<unknown>> = new Map();
+
+  constructor(private nonceManager: EVMNonceManager) {}
+
+  async submit(wallet: Wallet, transaction: PopulatedTransaction): Promise<Submission> {
+    const address = wallet.address;
+    const previous = this._queues.get(address) ?? Promise.resolve();
+    const sent = previous.then(
+      () => this.send(wallet, transaction),
+      () => this.send(wallet, transaction)
+    );
+    this._queues.set(address, sent);
+    const release = () => {
+      if (this._queues.get(address) === sent) {
+        this._queues.delete(address);
+      }
+    };
+    sent.then(release, release);
+
+    const response = await sent;
+    const receipt = this.watch(response);
+    // Callers that do not wait for the receipt must not cause an unhandled rejection
+    receipt.catch(() => undefined);
+    return { txHash: response.hash, nonce: response.nonce, receipt };
+  }
+
+  private async send(
+    wallet: Wallet,
+    transaction: PopulatedTransaction,
+    retry: boolean = true,
+    nonce?: number
+  ): Promise<providers.TransactionResponse> {
+    try {
+      return await this.nonceManager.provideNonce(nonce, wallet.address, (nextNonce: number) =>
+        wallet.sendTransaction({ ...transaction, nonce: nextNonce })
+      );
+    } catch (error) {
+      if (!retry || !isNonceError(error)) {
+        throw error;
+      }
+      const pendingCount = await wallet.getTransactionCount('pending');
+      logger.warn(`Resynchronizing nonce of ${wallet.address} to ${pendingCount} after: ${(error as Error).message}`);
+      if (pendingCount === 0) {
+        // Nothing sent from this wallet yet: there is no pending nonce to override, so reset the
+        // leading nonce from the node and send with nonce 0 explicitly
+        await this.nonceManager.getNonceFromNode(wallet.address);
+        return this.send(wallet, transaction, false, 0);
+      }
+      // The next nonce handed out is one above the overridden pending nonce
+      await this.nonceManager.overridePendingNonce(wallet.address, pendingCount - 1);
+      return this.send(wallet, transaction, false);
+    }
+  }
+
+  private async watch(response: providers.TransactionResponse): Promise<ContractReceipt> {
+    try {
+      const receipt = await response.wait();
+      logger.info(`Transaction ${response.hash} (nonce ${response.nonce}) mined in block ${receipt.blockNumber}.`);
+      return receipt;
+    } catch (error: any) {
+      if (error?.code === 'TRANSACTION_REPLACED' && !error.cancelled) {
+        logger.info(`Transaction ${response.hash} was repriced by ${error.replacement.hash}.`);
+        return error.receipt;
+      }
+      logger.error(`Transaction ${response.hash} (nonce ${response.nonce}) failed: ${error?.reason ?? error?.message}`);
+      throw error;
+    }
+  }
+}
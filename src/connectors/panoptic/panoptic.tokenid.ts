@@ -0,0 +1,230 @@
+import { BigNumber, BigNumberish } from 'ethers';
+
+// TokenId layout (TokenIdLibrary): bits 0-63 hold the poolId, followed by four 48-bit legs.
+const POOL_ID_BITS = 64;
+const LEG_BITS = 48;
+export const MAX_LEGS = 4;
+
+export interface TokenIdLeg {
+  legIndex: number;
+  asset: number;
+  optionRatio: number;
+  isLong: number;
+  tokenType: number;
+  riskPartner: number;
+  strike: number;
+  width: number;
+}
+
+type LegField = Exclude<keyof TokenIdLeg, 'legIndex'>;
+
+// [field, offset within the leg, width in bits]
+const LEG_FIELDS: Array<[LegField, number, number]> = [
+  ['asset', 0, 1],
+  ['optionRatio', 1, 7],
+  ['isLong', 8, 1],
+  ['tokenType', 9, 1],
+  ['riskPartner', 10, 2],
+  ['strike', 12, 24],
+  ['width', 36, 12],
+];
+
+function mask(bits: number): BigNumber {
+  return BigNumber.from(1).shl(bits).sub(1);
+}
+
+/**
+ * Same packing as TokenIdLibrary.addPoolId followed by addLeg for each leg.
+ */
+export function encodeTokenId(poolId: BigNumberish, legs: TokenIdLeg[]): BigNumber {
+  let tokenId = BigNumber.from(poolId).and(mask(POOL_ID_BITS));
+  for (const leg of legs) {
+    if (leg.legIndex < 0 || leg.legIndex >= MAX_LEGS) {
+      throw new Error(`Leg index ${leg.legIndex} out of range`);
+    }
+    const base = POOL_ID_BITS + LEG_BITS * leg.legIndex;
+    for (const [field, offset, bits] of LEG_FIELDS) {
+      const value = leg[field];
+      if (field === 'strike' ? value < -(2 ** 23) || value >= 2 ** 23 : value < 0 || value >= 2 ** bits) {
+        throw new Error(`Leg ${field} (${value}) does not fit in ${bits} bits`);
+      }
+      // Two's complement for negative strikes, restricted to the field width
+      const encoded = BigNumber.from(value < 0 ? value + 2 ** bits : value);
+      tokenId = tokenId.or(encoded.shl(base + offset));
+    }
+  }
+  return tokenId;
+}
+
+export function decodeTokenId(tokenId: BigNumberish): { poolId: BigNumber, legs: TokenIdLeg[] } {
+  const id = BigNumber.from(tokenId);
+  const legs: TokenIdLeg[] = [];
+  for (let legIndex = 0; legIndex < MAX_LEGS; legIndex++) {
+    const base = POOL_ID_BITS + LEG_BITS * legIndex;
+    const leg: TokenIdLeg = {
+      legIndex, asset: 0, optionRatio: 0, isLong: 0, tokenType: 0, riskPartner: 0, strike: 0, width: 0
+    };
+    for (const [field, offset, bits] of LEG_FIELDS) {
+      let value = id.shr(base + offset).and(mask(bits)).toNumber();
+      if (field === 'strike' && value >= 2 ** 23) {
+        value -= 2 ** 24;
+      }
+      leg[field] = value;
+    }
+    if (leg.optionRatio > 0) {
+      legs.push(leg);
+    }
+  }
+  return { poolId: id.and(mask(POOL_ID_BITS)), legs };
+}
+
+export type StrategyParams = Record<string, number>;
+
+function leg(
+  legIndex: number,
+  optionRatio: number,
+  asset: number,
+  isLong: number,
+  tokenType: number,
+  riskPartner: number,
+  strike: number,
+  width: number
+): TokenIdLeg {
+  return { legIndex, optionRatio, asset, isLong, tokenType, riskPartner, strike, width };
+}
+
+// Calls move the asset token, puts the other one.
+const CALL = (asset: number) => asset;
+const PUT = (asset: number) => 1 - asset;
+
+/**
+ * Leg layout of every PanopticHelper create* builder, keyed by the helper's function name and
+ * taking the same named parameters. Panoptic.create* checks each shape against the helper once
+ * before trusting it.
+ */
+export const STRATEGY_SHAPES: Record<string, (p: StrategyParams) => TokenIdLeg[]> = {
+  createCallSpread: (p) => [
+    leg(p.start, p.optionRatio, p.asset, 1, CALL(p.asset), p.start + 1, p.strikeLong, p.width),
+    leg(p.start + 1, p.optionRatio, p.asset, 0, CALL(p.asset), p.start, p.strikeShort, p.width),
+  ],
+  createPutSpread: (p) => [
+    leg(p.start, p.optionRatio, p.asset, 1, PUT(p.asset), p.start + 1, p.strikeLong, p.width),
+    leg(p.start + 1, p.optionRatio, p.asset, 0, PUT(p.asset), p.start, p.strikeShort, p.width),
+  ],
+  createCallDiagonalSpread: (p) => [
+    leg(p.start, p.optionRatio, p.asset, 1, CALL(p.asset), p.start + 1, p.strikeLong, p.widthLong),
+    leg(p.start + 1, p.optionRatio, p.asset, 0, CALL(p.asset), p.start, p.strikeShort, p.widthShort),
+  ],
+  createPutDiagonalSpread: (p) => [
+    leg(p.start, p.optionRatio, p.asset, 1, PUT(p.asset), p.start + 1, p.strikeLong, p.widthLong),
+    leg(p.start + 1, p.optionRatio, p.asset, 0, PUT(p.asset), p.start, p.strikeShort, p.widthShort),
+  ],
+  createCallCalendarSpread: (p) => [
+    leg(p.start, p.optionRatio, p.asset, 1, CALL(p.asset), p.start + 1, p.strike, p.widthLong),
+    leg(p.start + 1, p.optionRatio, p.asset, 0, CALL(p.asset), p.start, p.strike, p.widthShort),
+  ],
+  createPutCalendarSpread: (p) => [
+    leg(p.start, p.optionRatio, p.asset, 1, PUT(p.asset), p.start + 1, p.strike, p.widthLong),
+    leg(p.start + 1, p.optionRatio, p.asset, 0, PUT(p.asset), p.start, p.strike, p.widthShort),
+  ],
+  // Ratio legs cannot be risk partners (partners must share optionRatio), so each leg partners itself.
+  createCallRatioSpread: (p) => [
+    leg(p.start, 1, p.asset, 1, CALL(p.asset), p.start, p.longStrike, p.width),
+    leg(p.start + 1, p.ratio, p.asset, 0, CALL(p.asset), p.start + 1, p.shortStrike, p.width),
+  ],
+  createPutRatioSpread: (p) => [
+    leg(p.start, 1, p.asset, 1, PUT(p.asset), p.start, p.longStrike, p.width),
+    leg(p.start + 1, p.ratio, p.asset, 0, PUT(p.asset), p.start + 1, p.shortStrike, p.width),
+  ],
+  createCallZEBRASpread: (p) => [
+    leg(p.start, p.ratio, p.asset, 1, CALL(p.asset), p.start, p.longStrike, p.width),
+    leg(p.start + 1, 1, p.asset, 0, CALL(p.asset), p.start + 1, p.shortStrike, p.width),
+  ],
+  createPutZEBRASpread: (p) => [
+    leg(p.start, p.ratio, p.asset, 1, PUT(p.asset), p.start, p.longStrike, p.width),
+    leg(p.start + 1, 1, p.asset, 0, PUT(p.asset), p.start + 1, p.shortStrike, p.width),
+  ],
+  createZEEHBS: (p) => [
+    leg(0, p.ratio, p.asset, 1, CALL(p.asset), 0, p.longStrike, p.width),
+    leg(1, 1, p.asset, 0, CALL(p.asset), 1, p.shortStrike, p.width),
+    leg(2, p.ratio, p.asset, 1, PUT(p.asset), 2, p.longStrike, p.width),
+    leg(3, 1, p.asset, 0, PUT(p.asset), 3, p.shortStrike, p.width),
+  ],
+  createStraddle: (p) => [
+    leg(p.start, p.optionRatio, p.asset, p.isLong, CALL(p.asset), p.start + 1, p.strike, p.width),
+    leg(p.start + 1, p.optionRatio, p.asset, p.isLong, PUT(p.asset), p.start, p.strike, p.width),
+  ],
+  createStrangle: (p) => [
+    leg(p.start, p.optionRatio, p.asset, p.isLong, CALL(p.asset), p.start + 1, p.callStrike, p.width),
+    leg(p.start + 1, p.optionRatio, p.asset, p.isLong, PUT(p.asset), p.start, p.putStrike, p.width),
+  ],
+  createIronCondor: (p) => [
+    leg(0, 1, p.asset, 0, CALL(p.asset), 2, p.callStrike, p.width),
+    leg(1, 1, p.asset, 0, PUT(p.asset), 3, p.putStrike, p.width),
+    leg(2, 1, p.asset, 1, CALL(p.asset), 0, p.callStrike + p.wingWidth, p.width),
+    leg(3, 1, p.asset, 1, PUT(p.asset), 1, p.putStrike - p.wingWidth, p.width),
+  ],
+  createIronButterfly: (p) => [
+    leg(0, 1, p.asset, 0, CALL(p.asset), 2, p.strike, p.width),
+    leg(1, 1, p.asset, 0, PUT(p.asset), 3, p.strike, p.width),
+    leg(2, 1, p.asset, 1, CALL(p.asset), 0, p.strike + p.wingWidth, p.width),
+    leg(3, 1, p.asset, 1, PUT(p.asset), 1, p.strike - p.wingWidth, p.width),
+  ],
+  createJadeLizard: (p) => [
+    leg(0, 1, p.asset, 1, CALL(p.asset), 1, p.longCallStrike, p.width),
+    leg(1, 1, p.asset, 0, CALL(p.asset), 0, p.shortCallStrike, p.width),
+    leg(2, 1, p.asset, 0, PUT(p.asset), 2, p.shortPutStrike, p.width),
+  ],
+  createBigLizard: (p) => [
+    leg(0, 1, p.asset, 1, CALL(p.asset), 0, p.longCallStrike, p.width),
+    leg(1, 1, p.asset, 0, CALL(p.asset), 2, p.straddleStrike, p.width),
+    leg(2, 1, p.asset, 0, PUT(p.asset), 1, p.straddleStrike, p.width),
+  ],
+  createSuperBull: (p) => [
+    leg(0, 1, p.asset, 1, CALL(p.asset), 1, p.longCallStrike, p.width),
+    leg(1, 1, p.asset, 0, CALL(p.asset), 0, p.shortCallStrike, p.width),
+    leg(2, 1, p.asset, 0, PUT(p.asset), 2, p.shortPutStrike, p.width),
+  ],
+  createSuperBear: (p) => [
+    leg(0, 1, p.asset, 1, PUT(p.asset), 1, p.longPutStrike, p.width),
+    leg(1, 1, p.asset, 0, PUT(p.asset), 0, p.shortPutStrike, p.width),
+    leg(2, 1, p.asset, 0, CALL(p.asset), 2, p.shortCallStrike, p.width),
+  ],
+};
+
+export type StrategyShape = keyof typeof STRATEGY_SHAPES;
+
+/**
+ * Builds strategy tokenIds without touching the chain. Results are memoized per
+ * (poolId, shape, parameters), so rebuilding the same candidate is a map lookup.
+ */
+export class TokenIdBuilder {
+  private _cache: Map<string, string> = new Map();
+
+  constructor(private maxCacheSize: number = 10000) {}
+
+  build(poolId: BigNumberish, shape: string, params: StrategyParams): string {
+    const makeLegs = STRATEGY_SHAPES[shape];
+    if (makeLegs === undefined) {
+      throw new Error(`Unknown strategy shape: ${shape}`);
+    }
+    const key = `${BigNumber.from(poolId).toString()}:${shape}:${Object.keys(params).sort().map((k) => `${k}=${params[k]}`).join(',')}`;
+    const cached = this._cache.get(key);
+    if (cached !== undefined) {
+      return cached;
+    }
+    const tokenId = encodeTokenId(poolId, makeLegs(params)).toString();
+    if (this._cache.size >= this.maxCacheSize) {
+      this._cache.delete(this._cache.keys().next().value as string);
+    }
+    this._cache.set(key, tokenId);
+    return tokenId;
+  }
+
+  /**
+   * One tokenId per value of `strikeParam` (e.g. a ladder of straddles across strikes).
+   */
+  ladder(poolId: BigNumberish, shape: string, params: StrategyParams, strikeParam: string, strikes: number[]): string[] {
+    return strikes.map((strike) => this.build(poolId, shape, { ...params, [strikeParam]: strike }));
+  }
+}
@@ -1,6 +1,8 @@
 import {
   BigNumber,
   Contract,
+  PopulatedTransaction,
+  providers,
   VoidSigner,
   Wallet
 } from 'ethers';
@@ -9,21 +11,51 @@ import {
   Token
 } from '@uniswap/sdk';
 import { Ethereum } from '../../chains/ethereum/ethereum';
-import { getAddress } from 'ethers/lib/utils';
-import panopticPoolAbi from './PanopticPool.ABI.json';
-import panopticFactoryAbi from './PanopticFactory.ABI.json';
-import tokenIdLibraryAbi from './TokenIdLibrary.ABI.json';
-import panopticHelperAbi from './PanopticHelper.ABI.json';
-import collateralTrackerAbi from './CollateralTracker.ABI.json';
-import semiFungiblePositionManagerAbi from './SFPM.ABI.json';
+import { getAddress, hexZeroPad, Interface } from 'ethers/lib/utils';
+import {
+  collateralTrackerInterface,
+  ContractPool,
+  panopticFactoryInterface,
+  panopticHelperInterface,
+  panopticPoolInterface,
+  semiFungiblePositionManagerInterface,
+  SignerOrProvider,
+  tokenIdLibraryInterface,
+  uniswapV3FactoryInterface,
+  uniswapV3PoolInterface
+} from './panoptic.contracts';
 import axios, { AxiosResponse } from 'axios';
+import { aggregate3, setBitPositions } from './panoptic.multicall';
+import { payoffDelta, payoffGamma, positionGreeks, PayoffLeg, tokenIdPayoffLegs } from './panoptic.greeks';
+import { decodeTokenId, StrategyParams, TokenIdBuilder } from './panoptic.tokenid';
+import { logger } from '../../services/logger';
+import { ReferenceCountingCloseable } from '../../services/refcounting-closeable';
+import { PanopticMetadataStore } from './panoptic.metadata';
+import { BlockScopedCache, ViewCacheStats } from './panoptic.view-cache';
+import { Slot0Stream, sqrtPriceX96ToAdjustedPrice } from './panoptic.spot-stream';
+import { nextBlock, ReceiptPoller } from './panoptic.receipts';
+import { TransactionSubmitter } from './panoptic.submitter';
+import { encodeRebalance, RebalancePlan } from './panoptic.rebalance';
+import { getLogsInChunks, PositionBook, PositionBookSnapshot, Reconciliation } from './panoptic.position-book';
+import { BatchingJsonRpcProvider } from './panoptic.batch-provider';
+import { crossMarginSurplus, liquidationBoundaries, surfaceTicks } from './panoptic.margin';
 import {
   PositionLegInformation,
   CreatePositionResponse,
   CheckCollateralResponse,
+  InitializedTicksInformation,
+  AccountSnapshotResponse,
+  CollateralTrackerSnapshot,
+  PortfolioGreeksResponse,
+  CollateralSurfaceResponse,
+  PollTransactionsResponse,
+  SpotPriceUpdate,
   TransactionBuildingResult
 } from '../../options/options.requests';
 
+// Factories return the zero address for pools that are not deployed yet; those are not cached.
+const isDeployed = (address: string): boolean => BigNumber.from(address).gt(0);
+
 export class Panoptic {
   private static _instances: { [name: string]: Panoptic };
   private chainInstance;
@@ -37,6 +69,7 @@ export class Panoptic {
   private _PanopticHelper: string;
   private _UniswapMigrator: string;
   private _TokenIdLibrary: string;
+  private _PanopticFactoryDeployBlock: number;
   private _absoluteGasLimit: number;
   private _gasLimitCushionFactor: number;
   private _ttl: number;
@@ -46,6 +79,22 @@ export class Panoptic {
   private _highestTick: number;
   private chainId;
   private tokenList: Record<string, Token> = {};
+  private _metadata: PanopticMetadataStore;
+  private _refCountingHandle: string;
+  private _viewCache: BlockScopedCache | undefined;
+  private _tokensBySymbol: Map<string, { tokenAddress: string, tokenDecimals: number }> = new Map();
+  private _tokenIdBuilder: TokenIdBuilder = new TokenIdBuilder();
+  private _contracts: ContractPool = new ContractPool();
+  private _slot0Streams: Map<string, Slot0Stream> = new Map();
+  private _receiptPoller: ReceiptPoller | undefined;
+  private _submitter: TransactionSubmitter | undefined;
+  private _positionBooks: Map<string, PositionBook> = new Map();
+  private _provider: providers.StaticJsonRpcProvider | undefined;
+  // Shapes whose local build disagreed with PanopticHelper for some layout; always built on-chain
+  private _mismatchedShapes: Set<string> = new Set();
+  // Layouts (shape, pool and the parameters that change the leg layout) already checked on-chain
+  private _verifiedLayouts: Set<string> = new Set();
+  private _initializedTicks: Record<string, { blockNumber: number, result: Promise<InitializedTicksInformation> }> = {};
   private _ready: boolean = false;
 
   private constructor(chain: string, network: string) {
@@ -62,6 +111,7 @@ export class Panoptic {
     this._PanopticHelper = config.PanopticHelper(chain, network);
     this._UniswapMigrator = config.UniswapMigrator(chain, network);
     this._TokenIdLibrary = config.TokenIdLibrary(chain, network);
+    this._PanopticFactoryDeployBlock = config.PanopticFactoryDeployBlock(chain, network);
     this._ttl = config.ttl;
     this._subgraphUrl = config.subgraphUrl;
     this._uniswapV3SubgraphUrl = config.uniswapV3SubgraphUrl;
@@ -69,6 +119,11 @@ export class Panoptic {
     this._highestTick = config.highestTick;
     this._absoluteGasLimit = config.absoluteGasLimit;
     this._gasLimitCushionFactor = config.gasLimitCushionFactor;
+    this._refCountingHandle = ReferenceCountingCloseable.createHandle();
+    this._metadata = PanopticMetadataStore.getInstance(
+      this.chainInstance.resolveDBPath(config.metadataDbPath),
+      this._refCountingHandle
+    );
   }
 
   public static getInstance(chain: string, network: string): Panoptic {
@@ -82,6 +137,70 @@ export class Panoptic {
     return Panoptic._instances[chain + network];
   }
 
+  // Contract handles are reused across requests instead of being rebuilt (and their ABI re-parsed) per call
+  private contract(address: string, iface: Interface, signerOrProvider: SignerOrProvider): Contract {
+    return this._contracts.get(address, iface, this.connected(signerOrProvider));
+  }
+
+  /**
+   * The connector's JSON-RPC provider: the chain's own, or with `rpcBatching.enabled` a provider
+   * for the same node that merges concurrent calls into batch requests.
+   */
+  public get provider(): providers.StaticJsonRpcProvider {
+    if (this._provider === undefined) {
+      const { enabled, windowMicroseconds, maxBatchSize } = PanopticConfig.config.rpcBatching;
+      const chainProvider = this.chainInstance.provider;
+      this._provider = enabled
+        ? new BatchingJsonRpcProvider(chainProvider.connection, this.chainId, windowMicroseconds, maxBatchSize)
+        : chainProvider;
+    }
+    return this._provider!;
+  }
+
+  // Signers and providers of the chain, rebound to the connector's provider so their reads are batched too
+  private connected<T extends SignerOrProvider>(signerOrProvider: T): T {
+    const provider = this.provider;
+    if (provider === this.chainInstance.provider) {
+      return signerOrProvider;
+    }
+    if (signerOrProvider instanceof Wallet || signerOrProvider instanceof VoidSigner) {
+      return (signerOrProvider.provider === provider ? signerOrProvider : signerOrProvider.connect(provider)) as T;
+    }
+    return (signerOrProvider === this.chainInstance.provider ? provider : signerOrProvider) as T;
+  }
+
+  /**
+   * Sign and send through the wallet's submission queue (locally assigned nonces, no waiting on
+   * earlier receipts). Without `waitForReceipt` the result carries only the hash and nonce; the
+   * receipt can be followed with pollTransactions.
+   */
+  private async broadcast(
+    wallet: Wallet | VoidSigner,
+    populatedTx: PopulatedTransaction,
+    waitForReceipt: boolean = true
+  ): Promise<TransactionBuildingResult> {
+    if (this._submitter === undefined) {
+      this._submitter = new TransactionSubmitter(this.chainInstance.nonceManager);
+    }
+    const submission = await this._submitter.submit(<Wallet>wallet, populatedTx);
+    // Our own receipts update the position books without waiting for the log subscription
+    submission.receipt.then((receipt) => this.recordPositionEvents(receipt.logs), () => undefined);
+    return {
+      receipt: waitForReceipt ? await submission.receipt : null,
+      unsignedTransaction: populatedTx,
+      txHash: submission.txHash,
+      nonce: submission.nonce
+    };
+  }
+
+  // Read-only calls issued within one block are shared by every caller on this chain and network
+  public get viewCache(): BlockScopedCache {
+    if (this._viewCache === undefined) {
+      this._viewCache = new BlockScopedCache(this.provider);
+    }
+    return this._viewCache;
+  }
+
   public getChainInstance(network: string) {
     if (this._chain === 'ethereum') {
       return Ethereum.getInstance(network);
@@ -112,7 +231,12 @@ export class Panoptic {
         token.symbol,
         token.name
       );
+      // The first listing of a symbol wins, as with the previous linear scan
+      if (!this._tokensBySymbol.has(token.symbol)) {
+        this._tokensBySymbol.set(token.symbol, { tokenAddress: token.address, tokenDecimals: token.decimals });
+      }
     }
+    await this._metadata.init();
     this._ready = true;
   }
 
@@ -172,53 +296,6 @@ export class Panoptic {
     return this._chain;
   }
 
-  async _gradient(arr: number[]): Promise<number[]> {
-    return arr.map((_, index, array) => {
-      if (index === 0) {
-        return array[1] - array[0];
-      } else if (index === array.length - 1) {
-        return array[array.length - 1] - array[array.length - 2];
-      } else {
-        return (array[index + 1] - array[index - 1]) / 2;
-      }
-    });
-  }
-
-  // TODO: Should check that this works
-  async _getPayoffGradients(
-    STRIKE: number,
-    RANGE: number,
-    PRICE: number
-  ): Promise<{ payoffGradient: number[], pGradient: number[], index: number }> {
-    const N = 1000;
-
-    // Generate linspace array
-    const linspace = (start: number, end: number, num: number): number[] => {
-      const step = (end - start) / (num - 1);
-      return Array.from({ length: num }, (_, i) => start + (i * step));
-    };
-
-    const p = linspace(STRIKE / 3, 1.75 * STRIKE, N);
-
-    // Define the V function
-    const V = (x: number, K: number, r: number): number => {
-      if (x <= K / r) {
-        return x;
-      } else if (x > K / r && x <= K * r) {
-        return (2 * Math.sqrt(x * K * r) - x - K) / (r - 1);
-      } else {
-        return K;
-      }
-    };
-
-    // Calculate payoff
-    const payoff = p.map(x => V(x, STRIKE, RANGE) - V(PRICE, STRIKE, RANGE));
-
-    const payoffGradient = await this._gradient(payoff);
-    const pGradient = await this._gradient(p);
-    return { payoffGradient, pGradient, index: p.findIndex(x => x >= PRICE) };
-  }
-
   // TODO: In the future, we could deliver a calculateObservedDelta and denote this as merely the
   //       Black-Scholles delta. Same for gamma.
   // TODO: Write a opinionated gateway method that wraps this one but passes in the Uniswap.currentTick for PRICE
@@ -228,8 +305,7 @@ export class Panoptic {
     PRICE: number
   ): Promise<number | Error> {
     try {
-      const { payoffGradient, pGradient, index } = await this._getPayoffGradients(STRIKE, RANGE, PRICE);
-      return Math.floor(100 * (payoffGradient[index] / pGradient[index]));
+      return Math.floor(100 * payoffDelta(PRICE, STRIKE, RANGE));
     } catch (error) {
       return new Error("Error calculating delta: " + (error as Error).message);
     }
@@ -242,10 +318,7 @@ export class Panoptic {
     PRICE: number
   ): Promise<number | Error> {
     try {
-      const { payoffGradient, pGradient, index } = await this._getPayoffGradients(STRIKE, RANGE, PRICE);
-      const payoffGradient2 = await this._gradient(payoffGradient);
-      const pGradient2 = await this._gradient(pGradient);
-      return Math.floor(100 * (payoffGradient2[index] / pGradient2[index]));
+      return Math.floor(100 * payoffGamma(PRICE, STRIKE, RANGE));
     } catch (error) {
       return new Error("Error calculating gamma: " + (error as Error).message);
     }
@@ -262,7 +335,7 @@ export class Panoptic {
   ): Promise<number | Error> {
     try {
       const panopticHelper = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelper, panopticHelperAbi.abi, wallet);
+      const panopticHelperContract = this.contract(panopticHelper, panopticHelperInterface, wallet);
       let response;
       if (greek === "delta") {
         response = await panopticHelperContract.delta(panopticPool, wallet.address, tick, positionIdList);
@@ -277,16 +350,24 @@ export class Panoptic {
     }
   }
 
+  // Values that never change once they exist on-chain are resolved once per chain and network and
+  // kept in the metadata store, which survives restarts.
+  async cachedMetadata<T>(
+    kind: string,
+    key: string,
+    load: () => Promise<T>,
+    isFinal?: (value: T) => boolean
+  ): Promise<T> {
+    await this._metadata.init();
+    return this._metadata.getOrLoad(`${this._chain}/${this._network}/${kind}/${key.toLowerCase()}`, load, isFinal);
+  }
+
   async getTokenAddress(
     tokenSymbol: string
   ): Promise<{"tokenAddress": string, "tokenDecimals": number} | Error> {
-    for (const token of this.chainInstance.storedTokenList) {
-      if (token.symbol === tokenSymbol) {
-        return {
-          "tokenAddress": token.address,
-          "tokenDecimals": token.decimals
-        }
-      }
+    const token = this._tokensBySymbol.get(tokenSymbol);
+    if (token !== undefined) {
+      return { ...token };
     }
     return new Error("Token not present on token list for this network, see: 'src/templates/lists')...")
   }
@@ -416,14 +497,18 @@ export class Panoptic {
     positionIdList: string[]
   ): Promise<CheckCollateralResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract['checkCollateral(address,address,int24,uint256[])'](
-        panopticPool,
-        wallet.address,
-        atTick,
-        positionIdList
-      );
+      const key = ['checkCollateral', panopticPool, wallet.address, atTick, positionIdList];
+      const response = await this.viewCache.get(key, (blockTag) => {
+        const panopticHelperAddress = this.PanopticHelper;
+        const panopticHelperContract = this.contract(panopticHelperAddress, panopticHelperInterface, wallet);
+        return panopticHelperContract['checkCollateral(address,address,int24,uint256[])'](
+          panopticPool,
+          wallet.address,
+          atTick,
+          positionIdList,
+          { blockTag }
+        );
+      });
       return {
         collateralBalance0: response.collateralBalance0,
         requiredCollateral0: response.requiredCollateral0,
@@ -435,6 +520,54 @@ export class Panoptic {
     }
   }
 
+  // poolIds are assigned once by the SFPM when a pool is initialized, so they are cached per pool.
+  async getPoolId(
+    wallet: Wallet | VoidSigner,
+    univ3pool: string
+  ): Promise<BigNumber> {
+    const poolId: string = await this.cachedMetadata('poolId', univ3pool, async () => {
+      const semiFungiblePositionManagerContract = this.contract(this.SemiFungiblePositionManager, semiFungiblePositionManagerInterface, wallet);
+      return BigNumber.from(await semiFungiblePositionManagerContract.getPoolId(univ3pool)).toString();
+    }, (value) => value !== '0');
+    return BigNumber.from(poolId);
+  }
+
+  // Builds a strategy tokenId locally. The first build of each layout (shape, pool, start, asset,
+  // isLong and the sign of every strike) is compared with the PanopticHelper result; a mismatch
+  // sends every later build of that shape to the on-chain builder.
+  async buildStrategyTokenId(
+    wallet: Wallet | VoidSigner,
+    shape: string,
+    univ3pool: string,
+    params: Record<string, BigNumber | number>,
+    onChainBuilder: () => Promise<BigNumber>
+  ): Promise<string> {
+    if (this._mismatchedShapes.has(shape)) {
+      return (await onChainBuilder()).toString();
+    }
+    const numericParams: StrategyParams = {};
+    for (const [name, value] of Object.entries(params)) {
+      numericParams[name] = BigNumber.from(value).toNumber();
+    }
+    const tokenId = this._tokenIdBuilder.build(await this.getPoolId(wallet, univ3pool), shape, numericParams);
+    const layout = JSON.stringify([
+      shape,
+      univ3pool.toLowerCase(),
+      ...['start', 'asset', 'isLong'].map((name) => numericParams[name] ?? null),
+      ...Object.keys(numericParams).filter((name) => /strike/i.test(name)).sort().map((name) => Math.sign(numericParams[name])),
+    ]);
+    if (!this._verifiedLayouts.has(layout)) {
+      const onChainTokenId = (await onChainBuilder()).toString();
+      if (onChainTokenId !== tokenId) {
+        this._mismatchedShapes.add(shape);
+        logger.warn(`Local ${shape} tokenId ${tokenId} differs from PanopticHelper (${onChainTokenId}); using the on-chain builder for ${shape}.`);
+        return onChainTokenId;
+      }
+      this._verifiedLayouts.add(layout);
+    }
+    return tokenId;
+  }
+
   async createBigLizard(
     wallet: Wallet | VoidSigner,
     univ3pool: string,
@@ -444,16 +577,21 @@ export class Panoptic {
     asset: BigNumber,
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createBigLizard(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createBigLizard',
         univ3pool,
-        width,
-        longCallStrike,
-        straddleStrike,
-        asset
+        { width, longCallStrike, straddleStrike, asset },
+        () => panopticHelperContract.createBigLizard(
+          univ3pool,
+          width,
+          longCallStrike,
+          straddleStrike,
+          asset
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createBigLizard: " + (error as Error).message);
     }
@@ -470,18 +608,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createCallCalendarSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createCallCalendarSpread',
         univ3pool,
-        widthLong,
-        widthShort,
-        strike,
-        asset,
-        optionRatio,
-        start
+        { widthLong, widthShort, strike, asset, optionRatio, start },
+        () => panopticHelperContract.createCallCalendarSpread(
+          univ3pool,
+          widthLong,
+          widthShort,
+          strike,
+          asset,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createCallCalendarSpread: " + (error as Error).message);
     }
@@ -499,19 +642,24 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createCallDiagonalSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createCallDiagonalSpread',
         univ3pool,
-        widthLong,
-        widthShort,
-        strikeLong,
-        strikeShort,
-        asset,
-        optionRatio,
-        start
+        { widthLong, widthShort, strikeLong, strikeShort, asset, optionRatio, start },
+        () => panopticHelperContract.createCallDiagonalSpread(
+          univ3pool,
+          widthLong,
+          widthShort,
+          strikeLong,
+          strikeShort,
+          asset,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createCallDiagonalSpread: " + (error as Error).message);
     }
@@ -528,18 +676,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createCallRatioSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createCallRatioSpread',
         univ3pool,
-        width,
-        longStrike,
-        shortStrike,
-        asset,
-        ratio,
-        start
+        { width, longStrike, shortStrike, asset, ratio, start },
+        () => panopticHelperContract.createCallRatioSpread(
+          univ3pool,
+          width,
+          longStrike,
+          shortStrike,
+          asset,
+          ratio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createCallRatioSpread: " + (error as Error).message);
     }
@@ -556,18 +709,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createCallSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createCallSpread',
         univ3pool,
-        width,
-        strikeLong,
-        strikeShort,
-        asset,
-        optionRatio,
-        start
+        { width, strikeLong, strikeShort, asset, optionRatio, start },
+        () => panopticHelperContract.createCallSpread(
+          univ3pool,
+          width,
+          strikeLong,
+          strikeShort,
+          asset,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createCallSpread: " + (error as Error).message);
     }
@@ -584,18 +742,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createCallZEBRASpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createCallZEBRASpread',
         univ3pool,
-        width,
-        longStrike,
-        shortStrike,
-        asset,
-        ratio,
-        start
+        { width, longStrike, shortStrike, asset, ratio, start },
+        () => panopticHelperContract.createCallZEBRASpread(
+          univ3pool,
+          width,
+          longStrike,
+          shortStrike,
+          asset,
+          ratio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createCallZEBRASpread: " + (error as Error).message);
     }
@@ -610,16 +773,21 @@ export class Panoptic {
     asset: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createIronButterfly(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createIronButterfly',
         univ3pool,
-        width,
-        strike,
-        wingWidth,
-        asset
+        { width, strike, wingWidth, asset },
+        () => panopticHelperContract.createIronButterfly(
+          univ3pool,
+          width,
+          strike,
+          wingWidth,
+          asset
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createIronButterfly: " + (error as Error).message);
     }
@@ -635,17 +803,22 @@ export class Panoptic {
     asset: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createIronCondor(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createIronCondor',
         univ3pool,
-        width,
-        callStrike,
-        putStrike,
-        wingWidth,
-        asset
+        { width, callStrike, putStrike, wingWidth, asset },
+        () => panopticHelperContract.createIronCondor(
+          univ3pool,
+          width,
+          callStrike,
+          putStrike,
+          wingWidth,
+          asset
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createIronCondor: " + (error as Error).message);
     }
@@ -661,17 +834,22 @@ export class Panoptic {
     asset: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createJadeLizard(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createJadeLizard',
         univ3pool,
-        width,
-        longCallStrike,
-        shortCallStrike,
-        shortPutStrike,
-        asset
+        { width, longCallStrike, shortCallStrike, shortPutStrike, asset },
+        () => panopticHelperContract.createJadeLizard(
+          univ3pool,
+          width,
+          longCallStrike,
+          shortCallStrike,
+          shortPutStrike,
+          asset
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createJadeLizard: " + (error as Error).message);
     }
@@ -688,18 +866,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createPutCalendarSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createPutCalendarSpread',
         univ3pool,
-        widthLong,
-        widthShort,
-        strike,
-        asset,
-        optionRatio,
-        start
+        { widthLong, widthShort, strike, asset, optionRatio, start },
+        () => panopticHelperContract.createPutCalendarSpread(
+          univ3pool,
+          widthLong,
+          widthShort,
+          strike,
+          asset,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createPutCalendarSpread: " + (error as Error).message);
     }
@@ -717,19 +900,24 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createPutDiagonalSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createPutDiagonalSpread',
         univ3pool,
-        widthLong,
-        widthShort,
-        strikeLong,
-        strikeShort,
-        asset,
-        optionRatio,
-        start
+        { widthLong, widthShort, strikeLong, strikeShort, asset, optionRatio, start },
+        () => panopticHelperContract.createPutDiagonalSpread(
+          univ3pool,
+          widthLong,
+          widthShort,
+          strikeLong,
+          strikeShort,
+          asset,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createPutDiagonalSpread: " + (error as Error).message);
     }
@@ -746,18 +934,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createPutRatioSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createPutRatioSpread',
         univ3pool,
-        width,
-        longStrike,
-        shortStrike,
-        asset,
-        ratio,
-        start
+        { width, longStrike, shortStrike, asset, ratio, start },
+        () => panopticHelperContract.createPutRatioSpread(
+          univ3pool,
+          width,
+          longStrike,
+          shortStrike,
+          asset,
+          ratio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createPutRatioSpread: " + (error as Error).message);
     }
@@ -774,18 +967,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createPutSpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createPutSpread',
         univ3pool,
-        width,
-        strikeLong,
-        strikeShort,
-        asset,
-        optionRatio,
-        start
+        { width, strikeLong, strikeShort, asset, optionRatio, start },
+        () => panopticHelperContract.createPutSpread(
+          univ3pool,
+          width,
+          strikeLong,
+          strikeShort,
+          asset,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createPutSpread: " + (error as Error).message);
     }
@@ -802,18 +1000,23 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createPutZEBRASpread(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createPutZEBRASpread',
         univ3pool,
-        width,
-        longStrike,
-        shortStrike,
-        asset,
-        ratio,
-        start
+        { width, longStrike, shortStrike, asset, ratio, start },
+        () => panopticHelperContract.createPutZEBRASpread(
+          univ3pool,
+          width,
+          longStrike,
+          shortStrike,
+          asset,
+          ratio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createPutZEBRASpread: " + (error as Error).message);
     }
@@ -830,18 +1033,23 @@ export class Panoptic {
     start: number
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createStraddle(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createStraddle',
         univ3pool,
-        width,
-        strike,
-        asset,
-        isLong,
-        optionRatio,
-        start
+        { width, strike, asset, isLong, optionRatio, start },
+        () => panopticHelperContract.createStraddle(
+          univ3pool,
+          width,
+          strike,
+          asset,
+          isLong,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createStraddle: " + (error as Error).message);
     }
@@ -859,19 +1067,24 @@ export class Panoptic {
     start: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createStrangle(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createStrangle',
         univ3pool,
-        width,
-        callStrike,
-        putStrike,
-        asset,
-        isLong,
-        optionRatio,
-        start
+        { width, callStrike, putStrike, asset, isLong, optionRatio, start },
+        () => panopticHelperContract.createStrangle(
+          univ3pool,
+          width,
+          callStrike,
+          putStrike,
+          asset,
+          isLong,
+          optionRatio,
+          start
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createStrangle: " + (error as Error).message);
     }
@@ -887,17 +1100,22 @@ export class Panoptic {
     asset: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createSuperBear(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createSuperBear',
         univ3pool,
-        width,
-        longPutStrike,
-        shortPutStrike,
-        shortCallStrike,
-        asset
+        { width, longPutStrike, shortPutStrike, shortCallStrike, asset },
+        () => panopticHelperContract.createSuperBear(
+          univ3pool,
+          width,
+          longPutStrike,
+          shortPutStrike,
+          shortCallStrike,
+          asset
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createSuperBear: " + (error as Error).message);
     }
@@ -913,17 +1131,22 @@ export class Panoptic {
     asset: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createSuperBull(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createSuperBull',
         univ3pool,
-        width,
-        longCallStrike,
-        shortCallStrike,
-        shortPutStrike,
-        asset
+        { width, longCallStrike, shortCallStrike, shortPutStrike, asset },
+        () => panopticHelperContract.createSuperBull(
+          univ3pool,
+          width,
+          longCallStrike,
+          shortCallStrike,
+          shortPutStrike,
+          asset
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createSuperBull: " + (error as Error).message);
     }
@@ -939,17 +1162,22 @@ export class Panoptic {
     ratio: BigNumber
   ): Promise<CreatePositionResponse | Error> {
     try {
-      const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
-      const response = await panopticHelperContract.createZEEHBS(
+      const panopticHelperContract = this.contract(this.PanopticHelper, panopticHelperInterface, wallet);
+      const tokenId = await this.buildStrategyTokenId(
+        wallet,
+        'createZEEHBS',
         univ3pool,
-        width,
-        longStrike,
-        shortStrike,
-        asset,
-        ratio
+        { width, longStrike, shortStrike, asset, ratio },
+        () => panopticHelperContract.createZEEHBS(
+          univ3pool,
+          width,
+          longStrike,
+          shortStrike,
+          asset,
+          ratio
+        )
       );
-      return {tokenId: response.toString()}
+      return {tokenId: tokenId}
     } catch (error) {
       return new Error("Error calculating createZEEHBS: " + (error as Error).message);
     }
@@ -961,7 +1189,7 @@ export class Panoptic {
   ): Promise< PositionLegInformation[] | Error> {
     try {
       const panopticHelperAddress = this.PanopticHelper;
-      const panopticHelperContract = new Contract(panopticHelperAddress, panopticHelperAbi.abi, wallet);
+      const panopticHelperContract = this.contract(panopticHelperAddress, panopticHelperInterface, wallet);
       const result = await panopticHelperContract.unwrapTokenId(
         tokenId
       );
@@ -992,12 +1220,16 @@ export class Panoptic {
     positionIdList: BigNumber[]
   ): Promise<{ "premium0": BigNumber, "premium1": BigNumber, [key: number]: BigNumber } | Error> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
-      const result = await panopticPoolContract.calculateAccumulatedFeesBatch(
-        wallet.address,
-        includePendingPremium,
-        positionIdList
-      );
+      const key = ['calculateAccumulatedFeesBatch', panopticPool, wallet.address, includePendingPremium, positionIdList];
+      const result = await this.viewCache.get(key, (blockTag) => {
+        const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
+        return panopticPoolContract.calculateAccumulatedFeesBatch(
+          wallet.address,
+          includePendingPremium,
+          positionIdList,
+          { blockTag }
+        );
+      });
       const { premium0, premium1, ...rest } = result;
       return { premium0, premium1, ...rest };
     } catch (error) {
@@ -1010,7 +1242,7 @@ export class Panoptic {
     panopticPool: string
   ): Promise<{"collateralToken": BigNumber} | Error> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       return await panopticPoolContract.collateralToken0();
     } catch (error) {
       return new Error("Error on collateralToken0: " + (error as Error).message);
@@ -1022,7 +1254,7 @@ export class Panoptic {
     panopticPool: string
   ): Promise<{"collateralToken": BigNumber} | Error> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       return await panopticPoolContract.collateralToken1();
     } catch (error) {
       return new Error("Error on collateralToken1: " + (error as Error).message);
@@ -1036,10 +1268,11 @@ export class Panoptic {
     newPositionIdList: BigNumber[],
     doNotBroadcast: boolean = false,
     tickLimitLow: number = this.LOWEST_POSSIBLE_TICK,
-    tickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK
+    tickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK,
+    waitForReceipt: boolean = true
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       let gasEstimate: number;
       try {
         gasEstimate = (await panopticPoolContract.estimateGas["burnOptions(uint256,uint256[],int24,int24)"](
@@ -1072,12 +1305,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx, waitForReceipt);
     } catch (error) {
       return new Error("Error on executeBurn: " + (error as Error).message);
     }
@@ -1095,10 +1323,11 @@ export class Panoptic {
     burnTickLimitLow: number = this.LOWEST_POSSIBLE_TICK,
     burnTickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK,
     mintTickLimitLow: number = this.LOWEST_POSSIBLE_TICK,
-    mintTickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK
+    mintTickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK,
+    waitForReceipt: boolean = true
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
 
       // Create mint position ID list by appending mintTokenId to postburnPositionIdList
       const mintPositionIdList = [...postburnPositionIdList, mintTokenId];
@@ -1147,18 +1376,61 @@ export class Panoptic {
         }
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx, waitForReceipt);
     } catch (error) {
       return new Error("Error on executeBurnAndMint: " + (error as Error).message);
     }
   }
 
+  // Burns and mints of a planRebalance plan, executed atomically through one PanopticPool multicall
+  async executeRebalance(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string,
+    plan: RebalancePlan,
+    doNotBroadcast: boolean = false,
+    tickLimitLow: number = this.LOWEST_POSSIBLE_TICK,
+    tickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK,
+    waitForReceipt: boolean = true
+  ): Promise<TransactionBuildingResult> {
+    try {
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
+      const calls = encodeRebalance(panopticPoolInterface, plan, tickLimitLow, tickLimitHigh);
+
+      let gasEstimate: number;
+      try {
+        gasEstimate = (await panopticPoolContract.estimateGas.multicall(
+          calls,
+          { gasLimit: BigNumber.from(this.absoluteGasLimit) }
+        )).toNumber();
+      } catch (error) {
+        console.log("Unable to estimate gas. Using max allocation.");
+        gasEstimate = this.absoluteGasLimit/(this.gasLimitCushionFactor * this.gasLimitCushionFactor);
+      }
+
+      const gasLimit: number = Math.ceil(this.gasLimitCushionFactor * gasEstimate);
+      if (gasLimit > this.absoluteGasLimit) {
+        return new Error(
+          `Error on executeRebalance: Gas limit exceeded, gas estimate limit (${gasLimit}) greater than tx cap (${this.absoluteGasLimit})...`
+        );
+      }
+
+      const populatedTx = await panopticPoolContract.populateTransaction.multicall(
+        calls,
+        { gasLimit: BigNumber.from(gasLimit) }
+      );
+      if (doNotBroadcast) {
+        return {
+          receipt: null,
+          unsignedTransaction: populatedTx
+        }
+      }
+
+      return await this.broadcast(wallet, populatedTx, waitForReceipt);
+    } catch (error) {
+      return new Error("Error on executeRebalance: " + (error as Error).message);
+    }
+  }
+
   async forceExercise(
     wallet: Wallet | VoidSigner,
     panopticPool: string,
@@ -1168,7 +1440,7 @@ export class Panoptic {
     doNotBroadcast: boolean = false
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       let gasEstimate: number;
       try{
         gasEstimate = (await panopticPoolContract.estimateGas.forceExercise(
@@ -1201,13 +1473,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx);
     } catch (error) {
       return new Error("Error on forceExercise: " + (error as Error).message);
     }
@@ -1223,7 +1489,7 @@ export class Panoptic {
     doNotBroadcast: boolean = false
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       let gasEstimate: number;
       try{
         gasEstimate = (await panopticPoolContract.estimateGas.liquidate(
@@ -1255,13 +1521,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx);
     } catch (error) {
       return new Error("Error on liquidate: " + (error as Error).message);
     }
@@ -1276,9 +1536,10 @@ export class Panoptic {
     doNotBroadcast: boolean = false,
     tickLimitLow: number = this.LOWEST_POSSIBLE_TICK,
     tickLimitHigh: number = this.HIGHEST_POSSIBLE_TICK,
+    waitForReceipt: boolean = true
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
 
       let gasEstimate: number;
       try {
@@ -1315,13 +1576,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx, waitForReceipt);
     } catch (error) {
       return new Error("Error on mintOptions: " + (error as Error).message);
     }
@@ -1332,7 +1587,7 @@ export class Panoptic {
     panopticPool: string
   ): Promise<{"_numberOfPositions": BigNumber} | Error> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       return await panopticPoolContract.numberOfPositions(wallet.address);
     } catch (error) {
       return new Error("Error on numberOfPositions: " + (error as Error).message);
@@ -1345,7 +1600,7 @@ export class Panoptic {
     tokenId: BigNumber
   ): Promise<{"balance": BigNumber, "poolUtilization0": BigNumber, "poolUtilization1": BigNumber} | Error> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       return await panopticPoolContract.optionPositionBalance(
         wallet.address,
         tokenId
@@ -1361,7 +1616,7 @@ export class Panoptic {
     doNotBroadcast: boolean = false
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       let gasEstimate: number;
       try{
         gasEstimate = (await panopticPoolContract.estimateGas.pokeMedian()).toNumber();
@@ -1384,13 +1639,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx);
     } catch (error) {
       return new Error("Error on pokeMedian: " + (error as Error).message);
     }
@@ -1405,7 +1654,7 @@ export class Panoptic {
     doNotBroadcast: boolean = false
   ): Promise<TransactionBuildingResult> {
     try {
-      const panopticPoolContract = new Contract(panopticPool, panopticPoolAbi.abi, wallet);
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
       let gasEstimate: number;
       try{
         gasEstimate = (await panopticPoolContract.estimateGas.settleLongPremium(
@@ -1435,13 +1684,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx);
     } catch (error) {
       return new Error("Error on settleLongPremium: " + (error as Error).message);
     }
@@ -1455,7 +1698,7 @@ export class Panoptic {
     doNotBroadcast: boolean = false
   ): Promise<TransactionBuildingResult> {
     try {
-      const tokenContract = new Contract(collateralTrackerContract.toString(), collateralTrackerAbi.abi, wallet);
+      const tokenContract = this.contract(collateralTrackerContract.toString(), collateralTrackerInterface, wallet);
       let gasEstimate: number;
       try{
         gasEstimate = (await tokenContract.estimateGas.deposit(
@@ -1483,13 +1726,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx);
     } catch (error) {
       return new Error("Error on deposit: " + (error as Error).message);
     }
@@ -1500,7 +1737,7 @@ export class Panoptic {
     collateralTrackerContract: BigNumber
   ): Promise<{"asset" : string} | Error> {
     try {
-      const CollateralTracker = new Contract(collateralTrackerContract.toString(), collateralTrackerAbi.abi, wallet);
+      const CollateralTracker = this.contract(collateralTrackerContract.toString(), collateralTrackerInterface, wallet);
       return await CollateralTracker.asset();
     } catch (error) {
       return new Error("Error on getAsset: " + (error as Error).message);
@@ -1512,8 +1749,10 @@ export class Panoptic {
     collateralTrackerContract: BigNumber
   ): Promise<{"poolAssets": BigNumber, "insideAMM": BigNumber, "currentPoolUtilization": BigNumber} | Error> {
     try {
-      const CollateralTracker = new Contract(collateralTrackerContract.toString(), collateralTrackerAbi.abi, wallet);
-      return await CollateralTracker.getPoolData();
+      return await this.viewCache.get(['getPoolData', collateralTrackerContract.toString()], (blockTag) => {
+        const CollateralTracker = this.contract(collateralTrackerContract.toString(), collateralTrackerInterface, wallet);
+        return CollateralTracker.getPoolData({ blockTag });
+      });
     } catch (error) {
       return new Error("Error on getPoolData: " + (error as Error).message);
     }
@@ -1524,7 +1763,7 @@ export class Panoptic {
     collateralTrackerContract: BigNumber
   ): Promise<{"maxAssets": BigNumber} | Error> {
     try {
-      const tokenContract = new Contract(collateralTrackerContract.toString(), collateralTrackerAbi.abi, wallet);
+      const tokenContract = this.contract(collateralTrackerContract.toString(), collateralTrackerInterface, wallet);
       return await tokenContract.maxWithdraw(wallet.address);
     } catch (error) {
       return new Error("Error on maxWithdraw: " + (error as Error).message);
@@ -1538,7 +1777,7 @@ export class Panoptic {
     doNotBroadcast: boolean = false
   ): Promise<TransactionBuildingResult> {
     try {
-      const tokenContract = new Contract(collateralTrackerContract.toString(), collateralTrackerAbi.abi, wallet);
+      const tokenContract = this.contract(collateralTrackerContract.toString(), collateralTrackerInterface, wallet);
       let gasEstimate: number;
       try{
         gasEstimate = (await tokenContract.estimateGas.withdraw(
@@ -1568,13 +1807,7 @@ export class Panoptic {
         };
       }
 
-      const tx = await wallet.sendTransaction(populatedTx);
-      const receipt = await tx.wait();
-
-      return {
-        receipt,
-        unsignedTransaction: populatedTx
-      };
+      return await this.broadcast(wallet, populatedTx);
     } catch (error) {
       return new Error("Error on withdraw: " + (error as Error).message);
     }
@@ -1591,7 +1824,7 @@ export class Panoptic {
   ): Promise<{"accountLiquidities": BigNumber} | Error> {
     try {
       const semiFungiblePositionManager = this.SemiFungiblePositionManager;
-      const semiFungiblePositionManagerContract = new Contract(semiFungiblePositionManager, semiFungiblePositionManagerAbi.abi, wallet);
+      const semiFungiblePositionManagerContract = this.contract(semiFungiblePositionManager, semiFungiblePositionManagerInterface, wallet);
       return await semiFungiblePositionManagerContract.getAccountLiquidity(
         univ3pool,
         owner,
@@ -1616,7 +1849,7 @@ export class Panoptic {
   ): Promise<[BigNumber, BigNumber] | Error> {
     try {
       const semiFungiblePositionManager = this.SemiFungiblePositionManager;
-      const semiFungiblePositionManagerContract = new Contract(semiFungiblePositionManager, semiFungiblePositionManagerAbi.abi, wallet);
+      const semiFungiblePositionManagerContract = this.contract(semiFungiblePositionManager, semiFungiblePositionManagerInterface, wallet);
       const result = await semiFungiblePositionManagerContract.getAccountPremium(
         univ3pool,
         owner,
@@ -1642,7 +1875,7 @@ export class Panoptic {
   ): Promise<{"feesBase0": BigNumber, "feesBase1": BigNumber} | Error> {
     try {
       const semiFungiblePositionManager = this.SemiFungiblePositionManager;
-      const semiFungiblePositionManagerContract = new Contract(semiFungiblePositionManager, semiFungiblePositionManagerAbi.abi, wallet);
+      const semiFungiblePositionManagerContract = this.contract(semiFungiblePositionManager, semiFungiblePositionManagerInterface, wallet);
       return await semiFungiblePositionManagerContract.getAccountFeesBase(
         univ3pool,
         owner,
@@ -1670,7 +1903,7 @@ export class Panoptic {
   ): Promise<CreatePositionResponse | Error> {
     try {
       const tokenIdLibrary = this.TokenIdLibrary;
-      const tokenIdLibraryContract = new Contract(tokenIdLibrary, tokenIdLibraryAbi.abi, wallet);
+      const tokenIdLibraryContract = this.contract(tokenIdLibrary, tokenIdLibraryInterface, wallet);
       const response =  await tokenIdLibraryContract.addLeg(
         self,
         legIndex,
@@ -1694,11 +1927,13 @@ export class Panoptic {
     uniswapV3PoolAddress: string
   ): Promise<string | Error> {
     try{
-      const panopticFactoryContract = new Contract(this.PanopticFactory, panopticFactoryAbi.abi, wallet);
-      const poolAddress: string = await panopticFactoryContract.getPanopticPool(
-        uniswapV3PoolAddress
-      );
-      return poolAddress;
+      return await this.cachedMetadata('panopticPool', uniswapV3PoolAddress, async () => {
+        const panopticFactoryContract = this.contract(this.PanopticFactory, panopticFactoryInterface, wallet);
+        const poolAddress: string = await panopticFactoryContract.getPanopticPool(
+          uniswapV3PoolAddress
+        );
+        return poolAddress;
+      }, isDeployed);
     } catch (error) {
       return new Error("Error on getPanopticPool: " + (error as Error).message)
     }
@@ -1712,21 +1947,133 @@ export class Panoptic {
     fee: number //500 for 0.05%, 3000 for 0.3%, 10000 for 1%
   ): Promise<string | Error> {
     try{
-      const uniswapV3FactoryAbi = [
-        "function getPool(address tokenA, address tokenB, uint24 fee) external view returns (address pool)"
-      ];
-      const uniswapV3FactoryContract = new Contract(this.UniswapV3Factory, uniswapV3FactoryAbi, wallet);
-      const poolAddress: string = await uniswapV3FactoryContract.getPool(
-        t0_address,
-        t1_address,
-        fee
-      );
-      return poolAddress;
+      // getPool is symmetric in the two tokens
+      const key = [t0_address.toLowerCase(), t1_address.toLowerCase()].sort().join('/') + '/' + fee;
+      return await this.cachedMetadata('uniswapPool', key, async () => {
+        const uniswapV3FactoryContract = this.contract(this.UniswapV3Factory, uniswapV3FactoryInterface, wallet);
+        const poolAddress: string = await uniswapV3FactoryContract.getPool(
+          t0_address,
+          t1_address,
+          fee
+        );
+        return poolAddress;
+      }, isDeployed);
     } catch (error) {
       return new Error("Error on checkUniswapPool: " + (error as Error).message)
     }
   }
 
+  async getViewCacheStats(): Promise<ViewCacheStats> {
+    return this.viewCache.stats();
+  }
+
+  /**
+   * Status of many transactions from one batched receipt lookup. With `afterBlock`, the call first
+   * waits (up to `timeoutMs`) for a newer block, so a client tracking pending transactions issues
+   * at most one request per block.
+   */
+  async pollTransactions(
+    txHashes: string[],
+    afterBlock?: number,
+    timeoutMs: number = 15000
+  ): Promise<PollTransactionsResponse | Error> {
+    try{
+      const provider = this.provider;
+      if (afterBlock !== undefined && provider.blockNumber <= afterBlock) {
+        await nextBlock(provider, afterBlock, timeoutMs);
+      }
+      if (this._receiptPoller === undefined) {
+        this._receiptPoller = new ReceiptPoller(provider);
+      }
+      return await this._receiptPoller.poll(txHashes);
+    } catch (error) {
+      return new Error("Error on pollTransactions: " + (error as Error).message)
+    }
+  }
+
+  private recordPositionEvents(logs: providers.Log[]): void {
+    for (const book of this._positionBooks.values()) {
+      book.applyLogs(logs);
+    }
+  }
+
+  private positionBook(panopticPool: string, account: string): PositionBook {
+    const key = `${panopticPool.toLowerCase()}/${account.toLowerCase()}`;
+    let book = this._positionBooks.get(key);
+    if (book === undefined) {
+      book = new PositionBook(this.provider, panopticPool, account, () =>
+        this.cachedMetadata('poolDeployBlock', panopticPool, async () => {
+          // Scanned in chunks from the factory's deployment, like the book's own event replay
+          const logs = await getLogsInChunks(
+            this.provider,
+            {
+              address: this.PanopticFactory,
+              topics: [panopticFactoryInterface.getEventTopic('PoolDeployed'), hexZeroPad(panopticPool, 32)],
+            },
+            this._PanopticFactoryDeployBlock,
+            await this.provider.getBlockNumber(),
+            undefined,
+            true
+          );
+          if (logs.length === 0) {
+            throw new Error(`No PoolDeployed event for ${panopticPool}`);
+          }
+          return logs[0].blockNumber;
+        })
+      );
+      this._positionBooks.set(key, book);
+    }
+    return book;
+  }
+
+  /**
+   * Open positions of the wallet in a PanopticPool from the pool's events (see PositionBook). The
+   * subgraph is compared against the book in the background at most every `reconcileIntervalMs`;
+   * the latest comparison is returned alongside the positions.
+   */
+  async getPositionBook(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string,
+    reconcileIntervalMs: number = 300000
+  ): Promise<PositionBookSnapshot & { reconciliation?: Reconciliation } | Error> {
+    try{
+      const book = this.positionBook(panopticPool, wallet.address);
+      const snapshot = await book.snapshot();
+      const reconciliation = book.reconciliation;
+      if (reconcileIntervalMs >= 0 && (reconciliation === undefined || Date.now() - reconciliation.checkedAt >= reconcileIntervalMs)) {
+        book.reconcile(async () => {
+          const result = await this.queryPositions(wallet, panopticPool);
+          if (result instanceof Error) {
+            throw result;
+          }
+          const account = result.data['data']['panopticPoolAccounts'][0];
+          if (account === undefined) {
+            return { open: [], complete: true };
+          }
+          const closed = new Set(account['closedAccountBalances'].map((item: any) => item['tokenId']['id']));
+          const open = account['accountBalances'].map((item: any) => item['tokenId']['id']).filter((id: string) => !closed.has(id));
+          // queryPositions reads at most 32 balances
+          return { open, complete: account['accountBalances'].length < 32 };
+        }).catch((error) => logger.warn(`Position book reconciliation failed: ${(error as Error).message}`));
+      }
+      return { ...snapshot, reconciliation };
+    } catch (error) {
+      return new Error("Error on getPositionBook: " + (error as Error).message)
+    }
+  }
+
+  // Open positions from the event-driven position book, so hot paths do not hit the 32-capped subgraph query.
+  async getBookPositionIds(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string
+  ): Promise<string[]> {
+    const book = await this.getPositionBook(wallet, panopticPool);
+    if (book instanceof Error) {
+      throw book;
+    }
+    return book.positions.map((position) => position.tokenId);
+  }
+
   //UniswapV3Pool interactions
 
   async getSpotPrice(
@@ -1736,50 +2083,495 @@ export class Panoptic {
     token1Decimals: number
   ): Promise<number | Error> {
     try{
-      const Abi = [
-        "function slot0() external view returns (uint160 sqrtPriceX96, int24 tick, uint16 observationIndex, uint16 observationCardinality, uint16 observationCardinalityNext, uint8 feeProtocol, bool unlocked)"
-      ];
-      const uniswapV3PoolContract = new Contract(uniswapV3PoolAddress, Abi, wallet);
-      const [sqrtPriceX96] = await uniswapV3PoolContract.slot0()
-      const price = (sqrtPriceX96 ** 2) / (2 ** 192);
-      const adjustedPrice = price * (10 ** (token0Decimals - token1Decimals));
-      return adjustedPrice;
+      const [sqrtPriceX96] = await this.viewCache.get(['slot0', uniswapV3PoolAddress.toLowerCase()], (blockTag) => {
+        const uniswapV3PoolContract = this.contract(uniswapV3PoolAddress, uniswapV3PoolInterface, wallet);
+        return uniswapV3PoolContract.slot0({ blockTag });
+      });
+      return sqrtPriceX96ToAdjustedPrice(sqrtPriceX96, token0Decimals, token1Decimals);
     } catch (error) {
       return new Error("Error on getSpotPrice: " + (error as Error).message)
     }
   }
 
+  // One Swap-log subscription per pool, shared by every streaming client on this chain and network.
+  // slot0 is read through the connector's provider, so the stream does not depend on whichever
+  // wallet subscribed first; the stream is dropped once its last subscriber leaves.
+  async subscribeSpotPrice(
+    uniswapV3PoolAddress: string,
+    token0Decimals: number,
+    token1Decimals: number,
+    listener: (update: SpotPriceUpdate) => void
+  ): Promise<(() => void) | Error> {
+    const pool = uniswapV3PoolAddress.toLowerCase();
+    let stream = this._slot0Streams.get(pool);
+    if (stream === undefined) {
+      stream = new Slot0Stream(this.provider, uniswapV3PoolAddress, () =>
+        this.viewCache.get(['slot0Update', pool], async (blockTag) => {
+          const uniswapV3PoolContract = this.contract(uniswapV3PoolAddress, uniswapV3PoolInterface, this.provider);
+          const [sqrtPriceX96, tick] = await uniswapV3PoolContract.slot0({ blockTag });
+          return { blockNumber: blockTag, sqrtPriceX96: sqrtPriceX96.toString(), tick: Number(tick) };
+        })
+      );
+      this._slot0Streams.set(pool, stream);
+    }
+    const current = stream;
+    const release = () => {
+      if (current.subscribers === 0 && this._slot0Streams.get(pool) === current) {
+        this._slot0Streams.delete(pool);
+      }
+    };
+    try{
+      const unsubscribe = await current.subscribe((update) => listener({
+        ...update,
+        spotPrice: sqrtPriceX96ToAdjustedPrice(update.sqrtPriceX96, token0Decimals, token1Decimals)
+      }));
+      return () => {
+        unsubscribe();
+        release();
+      };
+    } catch (error) {
+      release();
+      return new Error("Error on subscribeSpotPrice: " + (error as Error).message)
+    }
+  }
+
+  // Collateral trackers are fixed at pool deployment, so they are read once per pool and kept.
+  async getCollateralTrackers(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string
+  ): Promise<[string, string]> {
+    return this.cachedMetadata('collateralTrackers', panopticPool, async (): Promise<[string, string]> => {
+      const [token0, token1] = await aggregate3(
+        this.connected(wallet),
+        this.multiCallAddress,
+        ['collateralToken0', 'collateralToken1'].map((method) => ({
+          target: panopticPool,
+          iface: panopticPoolInterface,
+          method: method,
+        }))
+      );
+      return [token0.result![0], token1.result![0]];
+    });
+  }
+
+  async getOpenPositionIds(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string
+  ): Promise<string[]> {
+    const response = await this.queryPositions(wallet, panopticPool);
+    if (response instanceof Error) {
+      throw response;
+    }
+    const accounts = response.data['data']['panopticPoolAccounts'];
+    if (!accounts || accounts.length === 0) {
+      return [];
+    }
+    const closedPositions = new Set(accounts[0]['closedAccountBalances'].map((item: any) => item['tokenId']['id']));
+    return accounts[0]['accountBalances']
+      .map((item: any) => item['tokenId']['id'])
+      .filter((id: string) => !closedPositions.has(id));
+  }
+
+  // Reads collateral tracker state, position count and every position balance in a single
+  // Multicall3 round trip pinned to one block, instead of one eth_call per value.
+  async getAccountSnapshot(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string,
+    positionIdList?: string[]
+  ): Promise<AccountSnapshotResponse | Error> {
+    try {
+      const [blockNumber, collateralTrackers, tokenIds] = await Promise.all([
+        this.provider.getBlockNumber(),
+        this.getCollateralTrackers(wallet, panopticPool),
+        positionIdList ?? this.getOpenPositionIds(wallet, panopticPool)
+      ]);
+
+      const trackerCalls = collateralTrackers.flatMap((tracker) => [
+        { target: tracker, iface: collateralTrackerInterface, method: 'asset' },
+        { target: tracker, iface: collateralTrackerInterface, method: 'maxWithdraw', args: [wallet.address] },
+        { target: tracker, iface: collateralTrackerInterface, method: 'getPoolData' },
+        { target: tracker, iface: collateralTrackerInterface, method: 'balanceOf', args: [wallet.address] },
+      ]);
+      const poolCalls = [
+        { target: panopticPool, iface: panopticPoolInterface, method: 'numberOfPositions', args: [wallet.address] },
+        ...tokenIds.map((tokenId) => ({
+          target: panopticPool,
+          iface: panopticPoolInterface,
+          method: 'optionPositionBalance',
+          args: [wallet.address, tokenId],
+        })),
+      ];
+      const results = await aggregate3(this.connected(wallet), this.multiCallAddress, [...trackerCalls, ...poolCalls], blockNumber);
+      // maxWithdraw is zero while the account holds positions, so the collateral balance is the
+      // account's shares converted to assets, at the same block
+      const assets = await aggregate3(
+        this.connected(wallet),
+        this.multiCallAddress,
+        collateralTrackers.map((tracker, i) => ({
+          target: tracker,
+          iface: collateralTrackerInterface,
+          method: 'convertToAssets',
+          args: [results[4 * i + 3].result![0]],
+        })),
+        blockNumber
+      );
+
+      const trackerSnapshot = (i: number): CollateralTrackerSnapshot => {
+        const [asset, maxWithdraw, poolData] = results.slice(4 * i, 4 * i + 3).map((r) => r.result!);
+        return {
+          collateralTracker: collateralTrackers[i],
+          asset: asset.assetTokenAddress,
+          collateralBalance: assets[i].result![0].toString(),
+          maxWithdraw: maxWithdraw.maxAssets.toString(),
+          poolAssets: poolData.poolAssets.toString(),
+          insideAMM: poolData.insideAMM.toString(),
+          currentPoolUtilization: poolData.currentPoolUtilization.toString()
+        };
+      };
+      const balances = results.slice(trackerCalls.length + 1).map((r) => r.result!);
+
+      return {
+        blockNumber: blockNumber,
+        panopticPool: panopticPool,
+        account: wallet.address,
+        numberOfPositions: results[trackerCalls.length].result!._numberOfPositions.toString(),
+        collateral0: trackerSnapshot(0),
+        collateral1: trackerSnapshot(1),
+        positions: tokenIds.map((tokenId, i) => ({
+          tokenId: tokenId.toString(),
+          balance: balances[i].balance.toString(),
+          poolUtilization0: balances[i].poolUtilization0.toString(),
+          poolUtilization1: balances[i].poolUtilization1.toString()
+        }))
+      };
+    } catch (error) {
+      return new Error("Error on getAccountSnapshot: " + (error as Error).message);
+    }
+  }
+
+  async getUniswapV3Pool(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string
+  ): Promise<string> {
+    return this.cachedMetadata('univ3pool', panopticPool, async (): Promise<string> => {
+      const panopticPoolContract = this.contract(panopticPool, panopticPoolInterface, wallet);
+      return await panopticPoolContract.univ3pool();
+    });
+  }
+
+  // Decodes every open position locally and prices all legs with the closed-form payoff greeks,
+  // so portfolio delta and gamma need one snapshot instead of a calculateDelta call per leg.
+  async getPortfolioGreeks(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string,
+    positionIdList?: string[],
+    gridLowerTick?: number,
+    gridUpperTick?: number,
+    gridPoints: number = 101
+  ): Promise<PortfolioGreeksResponse | Error> {
+    try {
+      if (!Number.isInteger(gridPoints) || gridPoints < 2 || gridPoints > 10000) {
+        throw new Error(`gridPoints must be an integer between 2 and 10000 (got ${gridPoints})`);
+      }
+      const [snapshot, univ3pool] = await Promise.all([
+        this.getAccountSnapshot(wallet, panopticPool, positionIdList),
+        this.getUniswapV3Pool(wallet, panopticPool)
+      ]);
+      if (snapshot instanceof Error) {
+        throw snapshot;
+      }
+      const poolContract = this.contract(univ3pool, uniswapV3PoolInterface, wallet);
+      const { tick: currentTick } = await poolContract.slot0({ blockTag: snapshot.blockNumber });
+
+      const allLegs: PayoffLeg[] = [];
+      const positionLegs = snapshot.positions.map((position) => {
+        const { poolId, legs } = decodeTokenId(position.tokenId);
+        // The upper 16 bits of the poolId hold the pool's tickSpacing
+        const payoffLegs = tokenIdPayoffLegs(legs, poolId.shr(48).toNumber(), parseFloat(position.balance));
+        allLegs.push(...payoffLegs);
+        return payoffLegs;
+      });
+
+      const currentPrice = 1.0001 ** currentTick;
+      const positions = snapshot.positions.map((position, i) => {
+        const greeks = positionGreeks(positionLegs[i], [currentPrice]);
+        return {
+          tokenId: position.tokenId,
+          positionSize: position.balance,
+          value: greeks.value[0],
+          delta: greeks.delta[0],
+          gamma: greeks.gamma[0]
+        };
+      });
+
+      // Default grid: the current tick and every leg's range, padded by a tenth of the span
+      const legTicks = allLegs.flatMap((leg) => [
+        Math.log(leg.strike / leg.range) / Math.log(1.0001),
+        Math.log(leg.strike * leg.range) / Math.log(1.0001)
+      ]);
+      const low = Math.min(currentTick, ...legTicks);
+      const high = Math.max(currentTick, ...legTicks);
+      const pad = Math.max(10, Math.ceil((high - low) / 10));
+      const lowerTick = gridLowerTick ?? Math.floor(low - pad);
+      const upperTick = gridUpperTick ?? Math.ceil(high + pad);
+      if (!(upperTick > lowerTick)) {
+        throw new Error(`gridUpperTick (${upperTick}) must be above gridLowerTick (${lowerTick})`);
+      }
+      const step = (upperTick - lowerTick) / (gridPoints - 1);
+      const ticks = Array.from({ length: gridPoints }, (_, i) => lowerTick + i * step);
+      const prices = ticks.map((tick) => 1.0001 ** tick);
+      const curve = positionGreeks(allLegs, prices);
+      const current = positionGreeks(allLegs, [currentPrice]);
+
+      return {
+        blockNumber: snapshot.blockNumber,
+        panopticPool: panopticPool,
+        account: snapshot.account,
+        currentTick: currentTick,
+        price: currentPrice,
+        value: current.value[0],
+        delta: current.delta[0],
+        gamma: current.gamma[0],
+        positions: positions,
+        grid: {
+          ticks: ticks,
+          prices: prices,
+          payoff: Array.from(curve.value, (value) => value - current.value[0]),
+          delta: Array.from(curve.delta),
+          gamma: Array.from(curve.gamma)
+        }
+      };
+    } catch (error) {
+      return new Error("Error on getPortfolioGreeks: " + (error as Error).message);
+    }
+  }
+
+  // Evaluates PanopticHelper.checkCollateral at every tick of a grid through Multicall3, pinned to one
+  // block with the pool's slot0, and locates the ticks where the account's cross-margined surplus
+  // changes sign. Each checkCollateral walks every position, so calls go in small parallel batches
+  // to stay under the node's eth_call gas cap.
+  async getCollateralSurface(
+    wallet: Wallet | VoidSigner,
+    panopticPool: string,
+    positionIdList?: string[],
+    ticks?: number[],
+    gridLowerTick?: number,
+    gridUpperTick?: number,
+    gridPoints: number = 101,
+    batchSize: number = 25
+  ): Promise<CollateralSurfaceResponse | Error> {
+    try {
+      if (ticks === undefined && (!Number.isInteger(gridPoints) || gridPoints < 2 || gridPoints > 1000)) {
+        throw new Error(`gridPoints must be an integer between 2 and 1000 (got ${gridPoints})`);
+      }
+      const isInt24 = (tick: number) => Number.isInteger(tick) && tick >= -(2 ** 23) && tick < 2 ** 23;
+      if (ticks !== undefined && (ticks.length === 0 || ticks.length > 1000 || !ticks.every(isInt24))) {
+        throw new Error('ticks must hold between 1 and 1000 int24 ticks');
+      }
+      for (const [name, tick] of [['gridLowerTick', gridLowerTick], ['gridUpperTick', gridUpperTick]] as const) {
+        if (tick !== undefined && !isInt24(tick)) {
+          throw new Error(`${name} must be an int24 tick (got ${tick})`);
+        }
+      }
+      if (!Number.isInteger(batchSize) || batchSize < 1 || batchSize > 100) {
+        throw new Error(`batchSize must be an integer between 1 and 100 (got ${batchSize})`);
+      }
+      const [blockNumber, univ3pool, tokenIds] = await Promise.all([
+        this.provider.getBlockNumber(),
+        this.getUniswapV3Pool(wallet, panopticPool),
+        positionIdList ?? this.getBookPositionIds(wallet, panopticPool)
+      ]);
+      const [slot0] = await aggregate3(
+        this.connected(wallet),
+        this.multiCallAddress,
+        [{ target: univ3pool, iface: uniswapV3PoolInterface, method: 'slot0' }],
+        blockNumber
+      );
+      const currentTick: number = slot0.result!.tick;
+
+      let grid = ticks;
+      if (grid === undefined) {
+        // Default grid: the current tick and every leg's range, padded by the whole span on each side
+        const legTicks = tokenIds.flatMap((tokenId) => {
+          const { poolId, legs } = decodeTokenId(tokenId);
+          return tokenIdPayoffLegs(legs, poolId.shr(48).toNumber(), 1).flatMap((leg) => [
+            Math.log(leg.strike / leg.range) / Math.log(1.0001),
+            Math.log(leg.strike * leg.range) / Math.log(1.0001)
+          ]);
+        });
+        const low = Math.min(currentTick, ...legTicks);
+        const high = Math.max(currentTick, ...legTicks);
+        const pad = Math.max(100, Math.ceil(high - low));
+        const lowerTick = gridLowerTick ?? Math.floor(low - pad);
+        const upperTick = gridUpperTick ?? Math.ceil(high + pad);
+        if (!(upperTick > lowerTick)) {
+          throw new Error(`gridUpperTick (${upperTick}) must be above gridLowerTick (${lowerTick})`);
+        }
+        grid = surfaceTicks(lowerTick, upperTick, gridPoints);
+      }
+
+      const results = await aggregate3(
+        this.connected(wallet),
+        this.multiCallAddress,
+        grid.map((tick) => ({
+          target: this.PanopticHelper,
+          iface: panopticHelperInterface,
+          method: 'checkCollateral(address,address,int24,uint256[])',
+          args: [panopticPool, wallet.address, tick, tokenIds],
+          allowFailure: true,
+        })),
+        blockNumber,
+        batchSize
+      );
+
+      const column = (field: string) => results.map((r) => (r.success ? r.result![field].toString() : null));
+      const surplus = results.map((r, i) => r.success
+        ? crossMarginSurplus(grid![i], r.result!.collateralBalance0, r.result!.requiredCollateral0, r.result!.collateralBalance1, r.result!.requiredCollateral1)
+        : null
+      );
+      const boundaries = liquidationBoundaries(grid, surplus);
+
+      return {
+        blockNumber: blockNumber,
+        panopticPool: panopticPool,
+        account: wallet.address,
+        currentTick: currentTick,
+        positionIdList: tokenIds.map((tokenId) => tokenId.toString()),
+        ticks: grid,
+        collateralBalance0: column('collateralBalance0'),
+        requiredCollateral0: column('requiredCollateral0'),
+        collateralBalance1: column('collateralBalance1'),
+        requiredCollateral1: column('requiredCollateral1'),
+        surplus: surplus,
+        liquidationTicks: boundaries,
+        liquidationTickDown: boundaries.filter((tick) => tick <= currentTick).pop() ?? null,
+        liquidationTickUp: boundaries.find((tick) => tick > currentTick) ?? null
+      };
+    } catch (error) {
+      return new Error("Error on getCollateralSurface: " + (error as Error).message);
+    }
+  }
+
+  async getTickSpacing(
+    wallet: Wallet | VoidSigner,
+    uniswapV3PoolAddress: string
+  ): Promise<number> {
+    return this.cachedMetadata('tickSpacing', uniswapV3PoolAddress, async (): Promise<number> => {
+      const poolContract = this.contract(uniswapV3PoolAddress, uniswapV3PoolInterface, wallet);
+      return await poolContract.tickSpacing();
+    });
+  }
+
+  // Reads every tickBitmap word covering the usable tick range through Multicall3, then fetches
+  // ticks() only for the initialized ones. Results are cached per pool for the block they were read at.
+  async getInitializedTicks(
+    wallet: Wallet | VoidSigner,
+    uniswapV3PoolAddress: string,
+    blockNumber?: number
+  ): Promise<InitializedTicksInformation | Error> {
+    try {
+      const key = uniswapV3PoolAddress.toLowerCase();
+      const atBlock: number = blockNumber ?? await this.provider.getBlockNumber();
+      const cached = this._initializedTicks[key];
+      if (cached && cached.blockNumber === atBlock) {
+        return await cached.result;
+      }
+      const result = this._scanInitializedTicks(wallet, uniswapV3PoolAddress, atBlock);
+      this._initializedTicks[key] = { blockNumber: atBlock, result };
+      try {
+        return await result;
+      } catch (error) {
+        if (this._initializedTicks[key]?.result === result) {
+          delete this._initializedTicks[key];
+        }
+        throw error;
+      }
+    } catch (error) {
+      return new Error("Error on getInitializedTicks: " + (error as Error).message);
+    }
+  }
+
+  async _scanInitializedTicks(
+    wallet: Wallet | VoidSigner,
+    uniswapV3PoolAddress: string,
+    blockNumber: number
+  ): Promise<InitializedTicksInformation> {
+    const tickSpacing = await this.getTickSpacing(wallet, uniswapV3PoolAddress);
+    // Word positions follow TickBitmap.position: compressed = floor(tick / tickSpacing), word = compressed >> 8
+    const minWord = Math.floor(this.LOWEST_POSSIBLE_TICK / tickSpacing) >> 8;
+    const maxWord = Math.floor(this.HIGHEST_POSSIBLE_TICK / tickSpacing) >> 8;
+    const wordPositions: number[] = [];
+    for (let word = minWord; word <= maxWord; word++) {
+      wordPositions.push(word);
+    }
+
+    const words = await aggregate3(
+      this.connected(wallet),
+      this.multiCallAddress,
+      wordPositions.map((word) => ({
+        target: uniswapV3PoolAddress,
+        iface: uniswapV3PoolInterface,
+        method: 'tickBitmap',
+        args: [word],
+      })),
+      blockNumber
+    );
+
+    const initializedTicks: number[] = [];
+    words.forEach((word, i) => {
+      for (const bit of setBitPositions(word.result![0])) {
+        initializedTicks.push((wordPositions[i] * 256 + bit) * tickSpacing);
+      }
+    });
+
+    const tickData = await aggregate3(
+      this.connected(wallet),
+      this.multiCallAddress,
+      initializedTicks.map((tick) => ({
+        target: uniswapV3PoolAddress,
+        iface: uniswapV3PoolInterface,
+        method: 'ticks',
+        args: [tick],
+      })),
+      blockNumber
+    );
+
+    return {
+      blockNumber: blockNumber,
+      tickSpacing: tickSpacing,
+      initializedTicks: initializedTicks,
+      liquidityGross: tickData.map((data) => data.result!.liquidityGross.toString()),
+      liquidityNet: tickData.map((data) => data.result!.liquidityNet.toString())
+    };
+  }
+
   async getTickSpacingAndInitializedTicks(
     wallet: Wallet | VoidSigner,
     uniswapV3PoolAddress: string,
+    includeInitializedTicks: boolean = false
   ): Promise<{
     tickSpacing: number,
-    ticks: number[]
-    // initializedTicks: number[]
+    minTick: number,
+    maxTick: number,
+    initializedTicks?: InitializedTicksInformation
   } | Error> {
     try{
-      const Abi = [
-        "function tickSpacing() external view returns (int24)",
-        "function ticks(int24) external view returns (tuple(int128 liquidityGross, int128 liquidityNet, uint256 feeGrowthOutside0X128, uint256 feeGrowthOutside1X128, int56 tickCumulativeOutside, uint160 secondsPerLiquidityOutsideX128, uint32 secondsOutside, bool initialized))"
-      ];
-      const poolContract = new Contract(uniswapV3PoolAddress, Abi, wallet);
-      const tickSpacing: number = await poolContract.tickSpacing();
-      const ticks: number[] = [];
-      for (let tick = this.LOWEST_POSSIBLE_TICK; tick <= this.HIGHEST_POSSIBLE_TICK; tick += tickSpacing) {
-        ticks.push(tick);
-      }
-      // const initializedTicks: number[] = [];
-      // for (let tick = this.LOWEST_POSSIBLE_TICK; tick <= this.HIGHEST_POSSIBLE_TICK; tick += tickSpacing) {
-      //   const tickData = await poolContract.ticks(tick);
-      //   if (tickData.initialized) {
-      //     initializedTicks.push(tick);
-      //   }
-      // }
-      return {
+      const tickSpacing: number = await this.getTickSpacing(wallet, uniswapV3PoolAddress);
+      // Describe the usable ticks as an arithmetic grid rather than materializing every tick;
+      // callers can index it directly (tick = minTick + i * tickSpacing).
+      const grid = {
         tickSpacing: tickSpacing,
-        ticks: ticks
-        // initializedTicks: initializedTicks
+        minTick: Math.ceil(this.LOWEST_POSSIBLE_TICK / tickSpacing) * tickSpacing,
+        maxTick: Math.floor(this.HIGHEST_POSSIBLE_TICK / tickSpacing) * tickSpacing
       };
+      if (!includeInitializedTicks) {
+        return grid;
+      }
+      const initializedTicks = await this.getInitializedTicks(wallet, uniswapV3PoolAddress);
+      if (initializedTicks instanceof Error) {
+        return initializedTicks;
+      }
+      return { ...grid, initializedTicks };
     } catch (error) {
       return new Error("Error on getTickSpacingAndInitializedTicks: " + (error as Error).message)
     }
@@ -0,0 +1,82 @@
+import { providers } from 'ethers';
+
+export interface ViewCacheStats {
+  blockNumber: number | undefined;
+  entries: number;
+  hits: number;
+  misses: number;
+  coalesced: number;
+  invalidations: number;
+}
+
+/**
+ * Cache for read-only contract calls, scoped to the current block. Every load is pinned to that
+ * block (via its blockTag argument), identical calls share one in-flight promise, and the whole
+ * cache is dropped when the provider reports a new head. Rejected loads are never kept.
+ */
+export class BlockScopedCache {
+  private _blockNumber: number | undefined;
+  private _pendingBlockNumber: Promise<number> | undefined;
+  private _entries: Map<string, { settled: boolean, result: Promise<any> }> = new Map();
+  private _stats = { hits: 0, misses: 0, coalesced: 0, invalidations: 0 };
+
+  constructor(private provider: providers.Provider) {
+    this.provider.on('block', (blockNumber: number) => this.onBlock(blockNumber));
+  }
+
+  onBlock(blockNumber: number): void {
+    if (this._blockNumber === undefined || blockNumber > this._blockNumber) {
+      this._blockNumber = blockNumber;
+      if (this._entries.size > 0) {
+        this._entries.clear();
+        this._stats.invalidations++;
+      }
+    }
+  }
+
+  private async currentBlock(): Promise<number> {
+    if (this._blockNumber !== undefined) {
+      return this._blockNumber;
+    }
+    if (this._pendingBlockNumber === undefined) {
+      this._pendingBlockNumber = this.provider.getBlockNumber().finally(() => {
+        this._pendingBlockNumber = undefined;
+      });
+    }
+    const blockNumber = await this._pendingBlockNumber;
+    this.onBlock(blockNumber);
+    return this._blockNumber!;
+  }
+
+  async get<T>(key: unknown[], load: (blockTag: number) => Promise<T>): Promise<T> {
+    const blockNumber = await this.currentBlock();
+    const fullKey = `${blockNumber}:${JSON.stringify(key)}`;
+    const cached = this._entries.get(fullKey);
+    if (cached !== undefined) {
+      if (cached.settled) {
+        this._stats.hits++;
+      } else {
+        this._stats.coalesced++;
+      }
+      return cached.result;
+    }
+    this._stats.misses++;
+    const entry = { settled: false, result: load(blockNumber) };
+    this._entries.set(fullKey, entry);
+    entry.result.then(
+      () => {
+        entry.settled = true;
+      },
+      () => {
+        if (this._entries.get(fullKey) === entry) {
+          this._entries.delete(fullKey);
+        }
+      }
+    );
+    return entry.result;
+  }
+
+  stats(): ViewCacheStats {
+    return { blockNumber: this._blockNumber, entries: this._entries.size, ...this._stats };
+  }
+}
@@ -84,6 +84,22 @@ import {
   UnwrapTokenIdResponse,
   GetTickSpacingAndInitializedTicksRequest,
   GetTickSpacingAndInitializedTicksResponse,
+  AccountSnapshotRequest,
+  AccountSnapshotResponse,
+  PortfolioGreeksRequest,
+  PortfolioGreeksResponse,
+  ViewCacheStatsRequest,
+  ViewCacheStatsResponse,
+  StreamSpotPriceRequest,
+  SpotPriceUpdate,
+  PollTransactionsRequest,
+  PollTransactionsResponse,
+  RebalanceRequest,
+  RebalanceResponse,
+  PositionBookRequest,
+  PositionBookResponse,
+  CollateralSurfaceRequest,
+  CollateralSurfaceResponse,
 } from './options.requests';
 import {
   addLeg as panopticAddLeg,
@@ -138,7 +154,15 @@ import {
   getPanopticPool as panopticGetPanopticPool,
   checkUniswapPool as panopticCheckUniswapPool,
   getSpotPrice as panopticGetSpotPrice,
-  getTickSpacingAndInitializedTicks as panopticGetTickSpacingAndInitializedTicks
+  getTickSpacingAndInitializedTicks as panopticGetTickSpacingAndInitializedTicks,
+  accountSnapshot as panopticAccountSnapshot,
+  portfolioGreeks as panopticPortfolioGreeks,
+  viewCacheStats as panopticViewCacheStats,
+  streamSpotPrice as panopticStreamSpotPrice,
+  pollTransactions as panopticPollTransactions,
+  rebalance as panopticRebalance,
+  positionBook as panopticPositionBook,
+  collateralSurface as panopticCollateralSurface
 } from '../connectors/panoptic/panoptic.controllers';
 import {
   getInitializedChain,
@@ -895,3 +919,130 @@ export async function getTickSpacingAndInitializedTicks(req: GetTickSpacingAndIn
     return new Error(`Method undefined on this connector, or no valid connector.`);
   }
 }
+
+export async function accountSnapshot(req: AccountSnapshotRequest): Promise<AccountSnapshotResponse | Error> {
+  const chain = await getInitializedChain<Ethereumish>(req.chain, req.network);
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticAccountSnapshot(<Ethereumish>chain, connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+export async function portfolioGreeks(req: PortfolioGreeksRequest): Promise<PortfolioGreeksResponse | Error> {
+  const chain = await getInitializedChain<Ethereumish>(req.chain, req.network);
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticPortfolioGreeks(<Ethereumish>chain, connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+export async function viewCacheStats(req: ViewCacheStatsRequest): Promise<ViewCacheStatsResponse | Error> {
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticViewCacheStats(connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+// Resolves to an unsubscribe function once the stream is live; updates are pushed to onUpdate
+export async function streamSpotPrice(
+  req: StreamSpotPriceRequest,
+  onUpdate: (update: SpotPriceUpdate) => void
+): Promise<(() => void) | Error> {
+  const chain = await getInitializedChain<Ethereumish>(req.chain, req.network);
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticStreamSpotPrice(
+      <Ethereumish>chain,
+      connector,
+      req,
+      onUpdate
+    );
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+export async function pollTransactions(req: PollTransactionsRequest): Promise<PollTransactionsResponse | Error> {
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticPollTransactions(connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+export async function rebalance(req: RebalanceRequest): Promise<RebalanceResponse | Error> {
+  const chain = await getInitializedChain<Ethereumish>(req.chain, req.network);
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticRebalance(<Ethereumish>chain, connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+export async function positionBook(req: PositionBookRequest): Promise<PositionBookResponse | Error> {
+  const chain = await getInitializedChain<Ethereumish>(req.chain, req.network);
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticPositionBook(<Ethereumish>chain, connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
+
+export async function collateralSurface(req: CollateralSurfaceRequest): Promise<CollateralSurfaceResponse | Error> {
+  const chain = await getInitializedChain<Ethereumish>(req.chain, req.network);
+  const connector: Panoptic =
+    await getConnector<Panoptic>(
+      req.chain,
+      req.network,
+      req.connector
+    );
+  if (connector instanceof Panoptic) {
+    return panopticCollateralSurface(<Ethereumish>chain, connector, req);
+  } else {
+    return new Error(`Method undefined on this connector, or no valid connector.`);
+  }
+}
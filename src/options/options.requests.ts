@@ -4,6 +4,8 @@ import { ContractReceipt, PopulatedTransaction } from 'ethers';
 export type TransactionBuildingResult = {
   receipt: ContractReceipt | null;
   unsignedTransaction: PopulatedTransaction;
+  txHash?: string; // set once broadcast, also when the receipt is not awaited
+  nonce?: number;
 } | Error;
 
 export interface PanopticRequest {
@@ -360,6 +362,7 @@ export interface ExecuteBurnRequest extends PanopticPoolRequest {
   newPositionIdList: BigNumber[];
   tickLimitLow: number;
   tickLimitHigh: number;
+  waitForReceipt?: boolean; // default true; false returns txHash and nonce as soon as the tx is sent
 }
 
 export interface ExecuteBurnAndMintRequest extends PanopticPoolRequest {
@@ -375,6 +378,7 @@ export interface ExecuteBurnAndMintRequest extends PanopticPoolRequest {
   burnTickLimitHigh: number;
   mintTickLimitLow: number;
   mintTickLimitHigh: number;
+  waitForReceipt?: boolean; // default true; false returns txHash and nonce as soon as the tx is sent
 }
 
 export interface CollateralTokenRequest extends PanopticPoolRequest {
@@ -417,6 +421,7 @@ export interface ExecuteMintRequest extends PanopticRequest {
   positionSize: BigNumber;
   effectiveLiquidityLimit: BigNumber;
   panopticPool: string;
+  waitForReceipt?: boolean; // default true; false returns txHash and nonce as soon as the tx is sent
 }
 
 export interface NumberOfPositionsRequest extends PanopticPoolRequest {
@@ -642,10 +647,210 @@ export interface GetSpotPriceResponse{
 export interface GetTickSpacingAndInitializedTicksRequest extends PanopticRequest{
   address: string;
   uniswapV3PoolAddress: string;
+  includeInitializedTicks?: boolean;
+}
+
+export interface InitializedTicksInformation{
+  blockNumber: number;
+  tickSpacing: number;
+  initializedTicks: number[]; // sorted ascending
+  liquidityGross: string[];
+  liquidityNet: string[];
 }
 
 export interface GetTickSpacingAndInitializedTicksResponse{
   tickSpacing: number;
+  minTick: number;
+  maxTick: number;
+  initializedTicks?: InitializedTicksInformation;
+}
+
+export interface AccountSnapshotRequest extends PanopticPoolRequest {
+  wallet: Wallet;
+  address: string;
+  positionIdList?: string[]; // defaults to the open positions reported by the subgraph
+}
+
+export interface CollateralTrackerSnapshot {
+  collateralTracker: string;
+  asset: string;
+  collateralBalance: string; // convertToAssets(balanceOf(account))
+  maxWithdraw: string; // zero while the account holds positions
+  poolAssets: string;
+  insideAMM: string;
+  currentPoolUtilization: string;
+}
+
+export interface PositionBalanceSnapshot {
+  tokenId: string;
+  balance: string;
+  poolUtilization0: string;
+  poolUtilization1: string;
+}
+
+export interface AccountSnapshotResponse {
+  blockNumber: number;
+  panopticPool: string;
+  account: string;
+  numberOfPositions: string;
+  collateral0: CollateralTrackerSnapshot;
+  collateral1: CollateralTrackerSnapshot;
+  positions: PositionBalanceSnapshot[];
+}
+
+export interface PortfolioGreeksRequest extends PanopticPoolRequest {
+  wallet: Wallet;
+  address: string;
+  positionIdList?: string[]; // defaults to the open positions reported by the subgraph
+  gridLowerTick?: number; // price grid bounds; default to the legs' ranges around the current tick
+  gridUpperTick?: number;
+  gridPoints?: number;
+}
+
+export interface PositionGreeks {
+  tokenId: string;
+  positionSize: string;
+  value: number;
+  delta: number;
+  gamma: number;
+}
+
+// Values are in raw token1 units at raw token1/token0 prices (1.0001 ** tick); delta is in token0 units.
+export interface PortfolioGreeksResponse {
+  blockNumber: number;
+  panopticPool: string;
+  account: string;
+  currentTick: number;
+  price: number;
+  value: number;
+  delta: number;
+  gamma: number;
+  positions: PositionGreeks[];
+  grid: {
+    ticks: number[];
+    prices: number[];
+    payoff: number[]; // value relative to the current price
+    delta: number[];
+    gamma: number[];
+  };
+}
+
+export type ViewCacheStatsRequest = PanopticRequest;
+
+export interface ViewCacheStatsResponse {
+  blockNumber: number | undefined;
+  entries: number;
+  hits: number;
+  misses: number;
+  coalesced: number; // requests that joined an identical in-flight call
+  invalidations: number;
+}
+
+export type StreamSpotPriceRequest = GetSpotPriceRequest;
+
+// Sent as one Server-Sent Event per price change
+export interface SpotPriceUpdate {
+  blockNumber: number;
+  sqrtPriceX96: string;
+  tick: number;
+  spotPrice: number;
+}
+
+export interface PollTransactionsRequest extends PanopticRequest {
+  txHashes: string[];
+  afterBlock?: number; // wait for a block after this one (up to timeoutMs) before polling
+  timeoutMs?: number;
+}
+
+export interface PolledTransaction {
+  txHash: string;
+  // unknown: not seen by the node; error: a lookup for this hash failed this poll (not final)
+  status: 'pending' | 'confirmed' | 'reverted' | 'replaced' | 'unknown' | 'error';
+  error?: string; // node error message when status is 'error'
+  blockNumber?: number;
+  confirmations?: number;
+  gasUsed?: string;
+  effectiveGasPrice?: string;
+  from?: string;
+  nonce?: number;
+}
+
+export interface PollTransactionsResponse {
+  blockNumber: number;
+  transactions: PolledTransaction[];
+}
+
+export interface RebalanceMintRequest {
+  tokenId: BigNumber;
+  positionSize: BigNumber;
+  effectiveLiquidityLimit?: BigNumber; // default 0
+}
+
+export interface RebalanceRequest extends PanopticPoolRequest {
+  address: string;
+  chain: string;
+  network: string;
+  positionIdList: BigNumber[]; // positions open before the rebalance
+  burnTokenIds: BigNumber[];
+  mints: RebalanceMintRequest[];
+  tickLimitLow?: number;
+  tickLimitHigh?: number;
+  waitForReceipt?: boolean; // default true; false returns txHash and nonce as soon as the tx is sent
+}
+
+export interface RebalanceResponse extends BurnResponse {
+  positionIdList: string[]; // positions open once the rebalance is mined
+}
+
+export interface PositionBookRequest extends PanopticPoolRequest {
+  address: string;
+  chain: string;
+  network: string;
+  reconcileIntervalMs?: number; // minimum time between subgraph consistency checks; negative disables them
+}
+
+export interface PositionBookResponse {
+  blockNumber: number; // events up to this block are reflected
+  positionIdList: string[]; // open positions, oldest first
+  positions: {
+    tokenId: string;
+    positionSize: string;
+    blockNumber: number;
+  }[];
+  reconciliation?: {
+    blockNumber: number;
+    checkedAt: number;
+    missingFromBook: string[];
+    missingFromSubgraph: string[];
+  };
+}
+
+export interface CollateralSurfaceRequest extends PanopticPoolRequest {
+  wallet: Wallet;
+  address: string;
+  positionIdList?: string[]; // defaults to the open positions in the event-driven position book
+  ticks?: number[]; // explicit ticks to evaluate; otherwise a grid
+  gridLowerTick?: number; // grid bounds; default to the legs' ranges around the current tick, padded by their span
+  gridUpperTick?: number;
+  gridPoints?: number;
+  batchSize?: number; // checkCollateral calls per multicall, 1 to 100 (default 25)
+}
+
+// One entry per tick; entries are null where checkCollateral reverted at that tick. Balances and
+// requirements are raw token amounts; surplus is the cross-margined excess in raw token1 units.
+export interface CollateralSurfaceResponse {
+  blockNumber: number;
+  panopticPool: string;
+  account: string;
+  currentTick: number;
+  positionIdList: string[];
   ticks: number[];
-  // initializedTicks: number[];
+  collateralBalance0: Array<string | null>;
+  requiredCollateral0: Array<string | null>;
+  collateralBalance1: Array<string | null>;
+  requiredCollateral1: Array<string | null>;
+  surplus: Array<number | null>;
+  liquidationTicks: number[]; // interpolated ticks where the surplus changes sign
+  liquidationTickDown: number | null; // nearest at or below the current tick
+  liquidationTickUp: number | null; // nearest above the current tick
 }
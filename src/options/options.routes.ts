@@ -55,7 +55,15 @@ import {
   getPanopticPool,
   checkUniswapPool,
   getSpotPrice,
-  getTickSpacingAndInitializedTicks
+  getTickSpacingAndInitializedTicks,
+  accountSnapshot,
+  portfolioGreeks,
+  viewCacheStats,
+  streamSpotPrice,
+  pollTransactions,
+  rebalance,
+  positionBook,
+  collateralSurface
 } from './options.controllers';
 import {
   ExecuteMintRequest,
@@ -142,7 +150,23 @@ import {
   GetSpotPriceResponse,
   UnwrapTokenIdResponse,
   GetTickSpacingAndInitializedTicksRequest,
-  GetTickSpacingAndInitializedTicksResponse
+  GetTickSpacingAndInitializedTicksResponse,
+  AccountSnapshotRequest,
+  AccountSnapshotResponse,
+  PortfolioGreeksRequest,
+  PortfolioGreeksResponse,
+  ViewCacheStatsRequest,
+  StreamSpotPriceRequest,
+  SpotPriceUpdate,
+  ViewCacheStatsResponse,
+  PollTransactionsRequest,
+  PollTransactionsResponse,
+  RebalanceRequest,
+  RebalanceResponse,
+  PositionBookRequest,
+  PositionBookResponse,
+  CollateralSurfaceRequest,
+  CollateralSurfaceResponse
 } from './options.requests';
 
 export namespace OptionsRoutes {
@@ -790,4 +814,128 @@ export namespace OptionsRoutes {
     )
   )
 
+  router.post(
+    '/accountSnapshot',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, AccountSnapshotRequest>,
+        res: Response<AccountSnapshotResponse | Error, {}>
+      ) => {
+        res.status(200).json(await accountSnapshot(req.body));
+      }
+    )
+  )
+
+  router.post(
+    '/portfolioGreeks',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, PortfolioGreeksRequest>,
+        res: Response<PortfolioGreeksResponse | Error, {}>
+      ) => {
+        res.status(200).json(await portfolioGreeks(req.body));
+      }
+    )
+  )
+
+  router.post(
+    '/viewCacheStats',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, ViewCacheStatsRequest>,
+        res: Response<ViewCacheStatsResponse | Error, {}>
+      ) => {
+        res.status(200).json(await viewCacheStats(req.body));
+      }
+    )
+  )
+
+  // Server-Sent Events: a `spotPrice` event with the current slot0 right away, then one per block in
+  // which the pool's price moved. The subscription is dropped when the client disconnects.
+  router.post(
+    '/streamSpotPrice',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, StreamSpotPriceRequest>,
+        res: Response<Error, {}>
+      ) => {
+        let closed = false;
+        let unsubscribe: (() => void) | undefined;
+        let heartbeat: NodeJS.Timeout | undefined;
+        res.on('close', () => {
+          closed = true;
+          clearInterval(heartbeat);
+          unsubscribe?.();
+        });
+        const send = (update: SpotPriceUpdate) => {
+          if (!res.headersSent) {
+            res.writeHead(200, {
+              'Content-Type': 'text/event-stream',
+              'Cache-Control': 'no-cache',
+              Connection: 'keep-alive',
+            });
+            heartbeat = setInterval(() => res.write(': keep-alive\n\n'), 15000);
+          }
+          res.write(`event: spotPrice\ndata: ${JSON.stringify(update)}\n\n`);
+        };
+        const result = await streamSpotPrice(req.body, send);
+        if (result instanceof Error) {
+          res.status(200).json(result);
+        } else if (closed) {
+          result();
+        } else {
+          unsubscribe = result;
+        }
+      }
+    )
+  )
+
+  router.post(
+    '/pollTransactions',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, PollTransactionsRequest>,
+        res: Response<PollTransactionsResponse | Error, {}>
+      ) => {
+        res.status(200).json(await pollTransactions(req.body));
+      }
+    )
+  )
+
+  router.post(
+    '/rebalance',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, RebalanceRequest>,
+        res: Response<RebalanceResponse | Error, {}>
+      ) => {
+        res.status(200).json(await rebalance(req.body));
+      }
+    )
+  )
+
+  router.post(
+    '/positionBook',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, PositionBookRequest>,
+        res: Response<PositionBookResponse | Error, {}>
+      ) => {
+        res.status(200).json(await positionBook(req.body));
+      }
+    )
+  )
+
+  router.post(
+    '/collateralSurface',
+    asyncHandler(
+      async (
+        req: Request<{}, {}, CollateralSurfaceRequest>,
+        res: Response<CollateralSurfaceResponse | Error, {}>
+      ) => {
+        res.status(200).json(await collateralSurface(req.body));
+      }
+    )
+  )
+
 }
@@ -13,4 +13,85 @@ from .helpers import (
     timescale_to_width,
     width_to_timescale,
     get_valid_tick
-)
\ No newline at end of file
+)
+from .tickmath import (
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    ticks_to_sqrtPriceX96,
+    sqrtPriceX96_to_ticks,
+    sqrtPriceX96_to_absolutePrices,
+    sqrtPriceX96_to_adjustedPrices,
+    ticks_to_absolutePrices,
+    ticks_to_adjustedPrices,
+    absolutePrices_to_ticks,
+    adjustedPrices_to_ticks
+)
+from .tickgrid import TickGrid, InitializedTicks
+from .snapshot import (
+    AccountSnapshot,
+    CollateralSnapshot,
+    PositionBalance,
+    fetch_account_snapshot
+)
+from .client import (
+    PanopticGatewayClient,
+    HummingbotTransport,
+    hummingbot_gateway_ssl_context,
+    AiohttpTransport,
+    LatencyHistogram,
+    GatewayStreamError,
+    iter_server_sent_events
+)
+from .tokenid import (
+    TokenIdCodec,
+    TokenIdBuilder,
+    STRATEGY_SHAPES,
+    LEG_DTYPE,
+    LEG_FIELDS
+)
+from .greeks import (
+    payoff_value,
+    payoff_delta,
+    payoff_gamma,
+    payoff_greeks,
+    position_greeks,
+    tokenid_payoff_legs,
+    portfolio_greeks
+)
+from .spotlog import (
+    SpotLog,
+    SpotLogWriter,
+    SPOT_RECORD_DTYPE,
+    read_spot_log,
+    convert_spot_data
+)
+from .plotting import (
+    SpotPlotRenderer,
+    lttb,
+    minmax_downsample
+)
+from .transactions import TransactionTracker
+from .rebalance import RebalancePlan, plan_rebalance
+from .legindex import LegRangeIndex, LegCrossing
+from .backtest import (
+    StayInRangePolicy,
+    BacktestConfig,
+    BacktestResult,
+    Trade,
+    run_backtest,
+    ticks_from_spot_log,
+    ticks_from_swap_history
+)
+from .sweep import parameter_grid, run_sweep, read_sweep
+from .margin import (
+    MarginParameters,
+    pool_utilization,
+    sell_collateral_ratio,
+    buy_collateral_ratio,
+    leg_amounts,
+    required_collateral,
+    cross_margin,
+    screen_candidates,
+    compare_with_check_collateral,
+    CollateralSurface
+)
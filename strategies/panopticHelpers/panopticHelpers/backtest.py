@@ -0,0 +1,243 @@
+import csv
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .greeks import portfolio_greeks
+from .helpers import get_valid_tick, timescale_to_width
+from .spotlog import read_spot_log
+from .tokenid import TokenIdBuilder, TokenIdCodec
+
+# Offline replay of the stay-in-range strategy over a recorded tick series. The account holds a set of
+# positions that only changes when the price leaves one of their ranges, so the replay jumps from one
+# rebalance to the next with a vectorized search and values each holding period in one numpy pass.
+
+# Pool id used when none is given: arbitrary pool bits, the configured tick spacing
+_BACKTEST_POOL = "0x" + "00" * 20
+
+
+class StayInRangePolicy:
+    """
+    The decision logic of panoptic_stayinrange_example: hold a short straddle whose width comes from
+    `timescale_to_width(timescale)` (unless `width` is given) and whose strike is the current tick
+    snapped with `get_valid_tick`; burn any position with a leg out of range and replace it with the
+    straddle at the current tick. With `rebalance_threshold`, a leg only counts as out of range once the
+    tick is that many ticks past its range.
+    """
+
+    def __init__(self, tick_spacing, timescale="1D", pool_id=None, width=None, option_ratio=1, rebalance_threshold=0):
+        self.tick_spacing = int(tick_spacing)
+        self.timescale = timescale
+        self.width = timescale_to_width(timescale, self.tick_spacing) if width is None else int(width)
+        self.option_ratio = int(option_ratio)
+        self.rebalance_threshold = rebalance_threshold
+        self.pool_id = TokenIdCodec.pool_id(_BACKTEST_POOL, self.tick_spacing) if pool_id is None else int(pool_id)
+        self._builder = TokenIdBuilder()
+
+    def strike(self, tick):
+        return int(get_valid_tick(int(np.floor(tick)), self.tick_spacing, self.tick_spacing * self.width))
+
+    def straddle_params(self, tick):
+        """createStraddle parameters for the position the strategy wants at this tick."""
+        return {"width": self.width, "strike": self.strike(tick), "asset": 0, "isLong": 0, "optionRatio": self.option_ratio, "start": 0}
+
+    def straddle(self, tick):
+        return self._builder.build(self.pool_id, "createStraddle", **self.straddle_params(tick))
+
+    def leg_ranges(self, token_ids):
+        """(lower, upper) tick bounds over the active legs of each position."""
+        _, legs = TokenIdCodec.decode(token_ids)
+        lower, upper = TokenIdCodec.leg_tick_ranges(legs, self.tick_spacing)
+        active = legs["option_ratio"] > 0
+        return np.where(active, lower, np.iinfo(np.int64).min).max(axis=1), np.where(active, upper, np.iinfo(np.int64).max).min(axis=1)
+
+    def exit_bounds(self, token_ids):
+        """Ticks below or above which each position is rebalanced."""
+        lower, upper = self.leg_ranges(token_ids)
+        return lower - self.rebalance_threshold, upper + self.rebalance_threshold
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    tick_spacing: int = 60
+    timescale: str = "1D"
+    width: int = None  # straddle width in tick spacings; derived from timescale when None
+    option_ratio: int = 1
+    rebalance_threshold: float = 0  # ticks past a leg's range before its position is rebalanced
+    position_size: float = 1e18  # per straddle, in units of the asset token (token0)
+    initial_collateral: float = 1e21  # in token1 units (raw prices are token1 per token0)
+    sell_collateral_ratio: float = 0.2  # collateral required per unit of sold notional
+    commission_bps: float = 10.0  # charged on the notional of every mint
+    premium_multiplier: float = 1.0  # streamia as a multiple of the gamma cost of the realized moves
+    pool_id: int = None
+
+
+@dataclass(frozen=True)
+class Trade:
+    index: int
+    action: str  # "mint", "burn" or "liquidated"
+    token_id: int
+    tick: float
+    commission: float = 0.0
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    timestamps: np.ndarray
+    ticks: np.ndarray
+    equity: np.ndarray  # collateral plus unrealized value change and accrued premia, per sample
+    premia: np.ndarray  # cumulative premia
+    in_range: np.ndarray  # True while a position is open and every leg contains the tick
+    trades: tuple = field(default_factory=tuple)
+    liquidated_at: int = None
+
+    def summary(self):
+        equity = self.equity[:self.liquidated_at] if self.liquidated_at is not None else self.equity
+        peak = np.maximum.accumulate(equity)
+        commissions = sum(trade.commission for trade in self.trades)
+        return {
+            "samples": int(len(self.ticks)),
+            "final_equity": float(self.equity[-1]),
+            "return": float(self.equity[-1] / self.equity[0] - 1),
+            "premia": float(self.premia[-1]),
+            "commissions": float(commissions),
+            "mints": sum(trade.action == "mint" for trade in self.trades),
+            "burns": sum(trade.action == "burn" for trade in self.trades),
+            "time_in_range": float(self.in_range.mean()),
+            "max_drawdown": float(np.max(1 - equity / peak)),
+            "liquidated_at": self.liquidated_at,
+        }
+
+
+def _first_exit(ticks, start, lower, upper, window=1024):
+    """First index after start whose tick is outside [lower, upper], or len(ticks); scans in growing windows."""
+    position = start + 1
+    while position < len(ticks):
+        chunk = ticks[position:position + window]
+        outside = np.flatnonzero((chunk < lower) | (chunk > upper))
+        if len(outside):
+            return position + int(outside[0])
+        position += len(chunk)
+        window *= 2
+    return len(ticks)
+
+
+def run_backtest(ticks, timestamps=None, config=BacktestConfig(), policy=None):
+    """
+    Replay the stay-in-range policy over ticks (float or int, one per sample).
+
+    At each rebalance every position with a leg out of range is burned (realizing its value change)
+    and the policy's straddle at the current tick is minted if it is not already held, paying
+    commission_bps of its notional. Between rebalances the positions are valued with
+    portfolio_greeks, and sellers accrue premia of -0.5 * gamma * dx^2 per sample (the premium that
+    exactly pays for the realized moves, scaled by premium_multiplier). A mint needs
+    sell_collateral_ratio of its notional in equity; the account is liquidated when equity falls below
+    that requirement at the current price, and nothing happens after that.
+    """
+    ticks = np.asarray(ticks, dtype=np.float64)
+    n = len(ticks)
+    if n == 0:
+        raise ValueError("Cannot backtest an empty tick series")
+    timestamps = np.arange(n) if timestamps is None else np.asarray(timestamps)
+    policy = policy or StayInRangePolicy(
+        config.tick_spacing, config.timescale, config.pool_id, config.width, config.option_ratio, config.rebalance_threshold
+    )
+    prices = 1.0001 ** ticks
+
+    equity = np.full(n, float(config.initial_collateral))
+    premia = np.zeros(n)
+    in_range = np.zeros(n, dtype=bool)
+    trades = []
+    balance = float(config.initial_collateral)  # collateral plus realized value changes and premia
+    accrued = 0.0
+    held = []  # tokenIds; every position has config.position_size
+    liquidated_at = None
+
+    i = 0
+    while i < n:
+        if held:
+            lower, upper = policy.exit_bounds(held)
+            out = (ticks[i] < lower) | (ticks[i] > upper)
+            for token_id in [t for t, o in zip(held, out) if o]:
+                trades.append(Trade(i, "burn", token_id, float(ticks[i])))
+            held = [t for t, o in zip(held, out) if not o]
+        target = policy.straddle(ticks[i])
+        if target not in held:
+            notional = config.position_size * policy.option_ratio * prices[i]
+            required = config.sell_collateral_ratio * notional * (len(held) + 1)
+            if balance >= required:
+                commission = float(config.commission_bps * 1e-4 * notional)
+                balance -= commission
+                trades.append(Trade(i, "mint", target, float(ticks[i]), commission))
+                held.append(target)
+        if not held:
+            # Nothing could be minted; the account stays flat until the end
+            equity[i:] = balance
+            premia[i:] = accrued
+            break
+
+        lower, upper = policy.exit_bounds(held)
+        exit_index = _first_exit(ticks, i, lower.max(), upper.min())
+        end = min(exit_index, n - 1)
+        segment = slice(i, end + 1)
+        sizes = np.full(len(held), float(config.position_size))
+        value, _, gamma = portfolio_greeks(held, sizes, prices[segment])
+        dx = np.diff(prices[segment])
+        earned = config.premium_multiplier * -0.5 * gamma[:-1] * dx * dx
+        cumulative = np.concatenate(([0.0], np.cumsum(earned)))
+        path = balance + (value - value[0]) + cumulative
+        requirement = config.sell_collateral_ratio * config.position_size * policy.option_ratio * len(held) * prices[segment]
+
+        equity[segment] = path
+        premia[segment] = accrued + cumulative
+        range_lower, range_upper = policy.leg_ranges(held)
+        in_range[segment] = (ticks[segment] >= range_lower.max()) & (ticks[segment] <= range_upper.min())
+
+        breach = np.flatnonzero(path < requirement)
+        if len(breach):
+            liquidated_at = i + int(breach[0])
+            trades.extend(Trade(liquidated_at, "liquidated", t, float(ticks[liquidated_at])) for t in held)
+            equity[liquidated_at:] = path[breach[0]]
+            premia[liquidated_at:] = accrued + cumulative[breach[0]]
+            in_range[liquidated_at:] = False
+            break
+
+        balance, accrued = float(path[-1]), accrued + float(cumulative[-1])
+        if exit_index == n:
+            # No exit before the series ends; an exit on the last sample is still rebalanced
+            break
+        i = end
+
+    return BacktestResult(np.asarray(timestamps), ticks, equity, premia, in_range, tuple(trades), liquidated_at)
+
+
+def ticks_from_spot_log(path, pool_id=None):
+    """(timestamps in ns, ticks) of a spot log written by log_spot_data, optionally for one pool."""
+    log = read_spot_log(path)
+    records = log.records if pool_id is None else log.for_pool(pool_id)
+    return np.asarray(records["timestamp"]), np.asarray(records["tick"], dtype=np.float64)
+
+
+def ticks_from_swap_history(path):
+    """
+    (timestamps or block numbers, ticks) from a CSV swap export with a header. Uses the "tick" column,
+    or derives ticks from "sqrtPriceX96"; the time column is "timestamp", "block_number" or "blockNumber".
+    """
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    if not rows:
+        raise ValueError(f"{path} has no swaps")
+    columns = rows[0].keys()
+    time_column = next((c for c in ("timestamp", "block_number", "blockNumber") if c in columns), None)
+    if time_column is None:
+        raise ValueError(f"{path} needs a timestamp, block_number or blockNumber column")
+    times = np.array([int(row[time_column]) for row in rows], dtype=np.int64)
+    if "tick" in columns:
+        ticks = np.array([float(row["tick"]) for row in rows])
+    elif "sqrtPriceX96" in columns:
+        sqrt_prices = np.array([int(row["sqrtPriceX96"]) / 2 ** 96 for row in rows])
+        ticks = 2 * np.log(sqrt_prices) / np.log(1.0001)
+    else:
+        raise ValueError(f"{path} needs a tick or sqrtPriceX96 column")
+    order = np.argsort(times, kind="stable")
+    return times[order], ticks[order]
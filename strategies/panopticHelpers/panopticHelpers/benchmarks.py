@@ -0,0 +1,305 @@
+# Run with: python -m panopticHelpers.benchmarks
+import time
+import numpy as np
+
+from .constants import (
+    UNI_MIN_TICK,
+    UNI_MAX_TICK
+)
+from .helpers import (
+    tick_to_adjustedPrice,
+    adjustedPrice_to_tick
+)
+from .tickmath import (
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    ticks_to_sqrtPriceX96,
+    sqrtPriceX96_to_ticks,
+    ticks_to_adjustedPrices,
+    adjustedPrices_to_ticks
+)
+from .greeks import (
+    payoff_value,
+    payoff_greeks,
+    position_greeks
+)
+from .spotlog import (
+    SpotLogWriter,
+    read_spot_log
+)
+from .backtest import (
+    BacktestConfig,
+    run_backtest
+)
+from .margin import (
+    required_collateral,
+    screen_candidates
+)
+from .tokenid import (
+    TokenIdCodec,
+    LEG_DTYPE,
+    LEG_FIELDS,
+    POOL_ID_BITS,
+    LEG_BITS,
+    MAX_LEGS
+)
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_tick_conversion(n=100_000, t0_decimals=18, t1_decimals=6, repeat=3, seed=0):
+    rng = np.random.default_rng(seed)
+    ticks = rng.integers(-400_000, 400_000, size=n)
+    prices = ticks_to_adjustedPrices(ticks, t0_decimals, t1_decimals)
+
+    loop_time, loop_ticks = _best_of(
+        lambda: np.floor([adjustedPrice_to_tick(p, t0_decimals, t1_decimals) for p in prices.tolist()]), repeat
+    )
+    batch_time, batch_ticks = _best_of(
+        lambda: np.floor(adjustedPrices_to_ticks(prices, t0_decimals, t1_decimals)), repeat
+    )
+    if not np.array_equal(loop_ticks, batch_ticks):
+        raise AssertionError("Batch price->tick conversion diverged from the per-element helper")
+
+    loop_price_time, loop_prices = _best_of(
+        lambda: np.array([tick_to_adjustedPrice(t, t0_decimals, t1_decimals) for t in ticks.tolist()]), repeat
+    )
+    batch_price_time, batch_prices = _best_of(
+        lambda: ticks_to_adjustedPrices(ticks, t0_decimals, t1_decimals), repeat
+    )
+    if not np.array_equal(loop_prices, batch_prices):
+        raise AssertionError("Batch tick->price conversion diverged from the per-element helper")
+
+    # Exact integer path: round trip every tick through sqrtPriceX96 and compare with the scalar port.
+    exact_ticks = rng.integers(UNI_MIN_TICK, UNI_MAX_TICK + 1, size=min(n, 20_000))
+    get_sqrt_ratio_at_tick.cache_clear()
+    loop_exact_time, loop_exact = _best_of(
+        lambda: [get_tick_at_sqrt_ratio(get_sqrt_ratio_at_tick(t)) for t in exact_ticks.tolist()], 1
+    )
+    get_sqrt_ratio_at_tick.cache_clear()
+    batch_exact_time, batch_exact = _best_of(
+        lambda: sqrtPriceX96_to_ticks(ticks_to_sqrtPriceX96(exact_ticks)), 1
+    )
+    if not (np.array_equal(batch_exact, exact_ticks) and np.array_equal(loop_exact, exact_ticks)):
+        raise AssertionError("sqrtPriceX96 round trip did not reproduce the input ticks")
+
+    return {
+        "n": n,
+        "price_to_tick_loop_s": loop_time,
+        "price_to_tick_batch_s": batch_time,
+        "price_to_tick_speedup": loop_time / batch_time,
+        "tick_to_price_loop_s": loop_price_time,
+        "tick_to_price_batch_s": batch_price_time,
+        "tick_to_price_speedup": loop_price_time / batch_price_time,
+        "exact_roundtrip_loop_s": loop_exact_time,
+        "exact_roundtrip_batch_s": batch_exact_time,
+    }
+
+
+def _decode_token_id_loop(token_id):
+    legs = []
+    for leg in range(MAX_LEGS):
+        base = POOL_ID_BITS + LEG_BITS * leg
+        fields = {}
+        for name, offset, bits in LEG_FIELDS:
+            value = (token_id >> (base + offset)) & ((1 << bits) - 1)
+            if name == "strike" and value >= (1 << 23):
+                value -= 1 << 24
+            fields[name] = value
+        legs.append(tuple(fields[name] for name in LEG_DTYPE.names))
+    return token_id & ((1 << 64) - 1), legs
+
+
+def benchmark_tokenid_decode(n=20_000, repeat=3, seed=0):
+    rng = np.random.default_rng(seed)
+    legs = np.zeros((n, MAX_LEGS), dtype=LEG_DTYPE)
+    for name, _, bits in LEG_FIELDS:
+        if name == "strike":
+            legs[name] = rng.integers(-(1 << 23), 1 << 23, size=(n, MAX_LEGS))
+        else:
+            legs[name] = rng.integers(0, 1 << bits, size=(n, MAX_LEGS))
+    pool_ids = rng.integers(0, 2 ** 63, size=n).astype(np.uint64)
+    token_ids = [str(t) for t in TokenIdCodec.encode(pool_ids, legs)]
+
+    loop_time, loop_result = _best_of(lambda: [_decode_token_id_loop(int(t)) for t in token_ids], repeat)
+    batch_time, (batch_pool_ids, batch_legs) = _best_of(lambda: TokenIdCodec.decode(token_ids), repeat)
+    loop_legs = np.array([row for _, row in loop_result], dtype=LEG_DTYPE)
+    if not (np.array_equal(batch_legs, loop_legs) and np.array_equal(batch_pool_ids, pool_ids)):
+        raise AssertionError("Vectorized tokenId decoding diverged from the bitwise reference")
+
+    return {
+        "n": n,
+        "decode_loop_s": loop_time,
+        "decode_batch_s": batch_time,
+        "decode_speedup": loop_time / batch_time,
+    }
+
+
+def _numeric_greeks(K, r, price, N=1000):
+    # The finite-difference scheme Panoptic.calculateDelta/calculateGamma used before the closed form
+    p = np.linspace(K / 3, 1.75 * K, N)
+    dp = np.gradient(p)
+    delta = np.gradient(payoff_value(p, K, r)) / dp
+    gamma = np.gradient(delta) / dp
+    index = np.argmax(p >= price)
+    return p[index], delta[index], gamma[index]
+
+
+def benchmark_greeks(n=2_000, legs=4, repeat=3, seed=0):
+    rng = np.random.default_rng(seed)
+    strikes = rng.uniform(1_000, 3_000, size=n)
+    ranges = rng.uniform(1.05, 1.5, size=n)
+    prices = strikes * rng.uniform(0.6, 1.6, size=n)
+
+    loop_time, numeric = _best_of(
+        lambda: np.array([_numeric_greeks(K, r, x) for K, r, x in zip(strikes, ranges, prices)]), repeat
+    )
+    grid_prices = numeric[:, 0]
+    batch_time, (_, delta, gamma) = _best_of(lambda: payoff_greeks(strikes, ranges, grid_prices), repeat)
+    # Central differences are smeared across the kinks at K/r and K*r; compare away from them.
+    h = (1.75 - 1 / 3) * strikes / 999
+    smooth = (np.abs(grid_prices - strikes / ranges) > 2 * h) & (np.abs(grid_prices - strikes * ranges) > 2 * h)
+    delta_error = np.max(np.abs(delta - numeric[:, 1])[smooth])
+    gamma_error = np.max(np.abs(gamma - numeric[:, 2])[smooth])
+    if delta_error > 1e-4 or gamma_error > 1e-6:
+        raise AssertionError("Closed-form greeks diverged from the finite-difference reference")
+
+    # Multi-leg: greeks of one position across a dense price grid
+    leg_strikes = rng.uniform(1_500, 2_500, size=legs)
+    leg_weights = rng.choice([-1.0, 1.0], size=legs)
+    price_grid = np.linspace(1_000, 3_000, n)
+    position_time, _ = _best_of(lambda: position_greeks(leg_strikes, 1.2, leg_weights, price_grid), repeat)
+
+    return {
+        "n": n,
+        "numeric_loop_s": loop_time,
+        "closed_form_batch_s": batch_time,
+        "greeks_speedup": loop_time / batch_time,
+        "max_delta_error": delta_error,
+        "max_gamma_error": gamma_error,
+        "position_grid_s": position_time,
+    }
+
+
+def benchmark_spot_log(n=200_000, seed=0):
+    import datetime
+    import os
+    import tempfile
+    rng = np.random.default_rng(seed)
+    prices = rng.uniform(1_000, 3_000, size=n)
+    ticks = rng.uniform(60_000, 80_000, size=n)
+    with tempfile.TemporaryDirectory() as directory:
+        dat_location = os.path.join(directory, "spot_data.dat")
+        spot_location = os.path.join(directory, "spot_data.spot")
+
+        start = time.perf_counter()
+        for price, tick in zip(prices.tolist(), ticks.tolist()):
+            with open(dat_location, "a") as file:
+                file.write(f"{datetime.datetime.now().strftime('%Y-%m-%d-%H:%M:%S')}, 0xpool, {price}, {tick}\n")
+        text_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with SpotLogWriter(spot_location) as writer:
+            for price, tick in zip(prices.tolist(), ticks.tolist()):
+                writer.append("0xpool", price, tick)
+        binary_write = time.perf_counter() - start
+
+        def read_text():
+            with open(dat_location, "r") as file:
+                rows = [line.split(",") for line in file.readlines()]
+            return (
+                [datetime.datetime.strptime(row[0], '%Y-%m-%d-%H:%M:%S').timestamp() for row in rows],
+                [float(row[2]) for row in rows]
+            )
+
+        text_read, _ = _best_of(read_text, 1)
+        binary_read, records = _best_of(lambda: read_spot_log(spot_location).records["price"].max(), 3)
+        if not np.isclose(records, prices.max()):
+            raise AssertionError("Spot log round trip lost records")
+        return {
+            "n": n,
+            "text_write_s": text_write,
+            "binary_write_s": binary_write,
+            "text_read_s": text_read,
+            "binary_read_s": binary_read,
+            "bytes_per_record": os.path.getsize(spot_location) // n,
+        }
+
+
+def benchmark_backtest(n=650_000, seed=0):
+    # Roughly three months of per-block ticks for a pool with 60-tick spacing
+    rng = np.random.default_rng(seed)
+    ticks = 200_000 + np.cumsum(rng.normal(0, 3, size=n))
+    config = BacktestConfig(position_size=1.0, initial_collateral=1e9)
+    elapsed, result = _best_of(lambda: run_backtest(ticks, config=config), 3)
+    summary = result.summary()
+    return {
+        "n": n,
+        "backtest_s": elapsed,
+        "rebalances": summary["burns"],
+        "samples_per_s": n / elapsed,
+    }
+
+
+def benchmark_margin(candidates=200, ticks=201, repeat=3, seed=0):
+    # Candidate straddles of several widths and strikes screened across a band of ticks
+    rng = np.random.default_rng(seed)
+    pool_id = TokenIdCodec.pool_id("0x" + "00" * 20, 60)
+    legs = np.zeros((candidates, MAX_LEGS), dtype=LEG_DTYPE)
+    strikes = 60 * rng.integers(-100, 100, size=candidates)
+    widths = rng.integers(2, 40, size=candidates)
+    for leg, token_type in ((0, 0), (1, 1)):
+        legs[:, leg]["option_ratio"] = 1
+        legs[:, leg]["token_type"] = token_type
+        legs[:, leg]["risk_partner"] = leg
+        legs[:, leg]["strike"] = strikes
+        legs[:, leg]["width"] = widths
+    token_ids = TokenIdCodec.encode(np.full(candidates, pool_id, dtype=np.uint64), legs)
+    sizes = rng.uniform(1e17, 1e19, size=candidates)
+    tick_band = np.linspace(-6_000, 6_000, ticks)
+
+    loop_time, looped = _best_of(
+        lambda: np.stack([required_collateral([t], [s], tick_band, 5_000, 5_000)[0][:, 0] for t, s in zip(token_ids, sizes)], axis=1),
+        repeat
+    )
+    batch_time, (solvent, required0, _) = _best_of(
+        lambda: screen_candidates(token_ids, sizes, tick_band, 1e18, 1e18, 5_000, 5_000), repeat
+    )
+    if not np.allclose(required0, looped, rtol=1e-12):
+        raise AssertionError("Batched margin diverged from the per-candidate loop")
+    return {
+        "candidates": candidates,
+        "ticks": ticks,
+        "loop_s": loop_time,
+        "batch_s": batch_time,
+        "speedup": loop_time / batch_time,
+        "solvent_fraction": float(solvent.mean()),
+    }
+
+
+def run_all():
+    results = {
+        "tick_conversion": benchmark_tick_conversion(),
+        "tokenid_decode": benchmark_tokenid_decode(),
+        "greeks": benchmark_greeks(),
+        "spot_log": benchmark_spot_log(),
+        "backtest": benchmark_backtest(),
+        "margin": benchmark_margin(),
+    }
+    for name, result in results.items():
+        print(f"{name}:")
+        for key, value in result.items():
+            print(f"    {key}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,640 @@
+import asyncio
+import bisect
+import json
+import time
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced latency buckets (1 ms to ~65 s) so recording is O(log buckets) and memory is constant.
+    """
+
+    BUCKET_EDGES_MS = tuple(float(x) for x in np.geomspace(1, 65536, 49))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKET_EDGES_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds, error=False):
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(self.BUCKET_EDGES_MS, ms)] += 1
+        self.count += 1
+        self.errors += int(error)
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile (0-100), in ms."""
+        if self.count == 0:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c > 0:
+                return min(self.BUCKET_EDGES_MS[i], self.max_ms) if i < len(self.BUCKET_EDGES_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+async def iter_server_sent_events(lines):
+    """Parse a text/event-stream body (an async iterator of raw lines) into (event, data) pairs, data JSON-decoded."""
+    event, data = "message", []
+    async for raw in lines:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue  # comment / keep-alive
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+
+
+class GatewayStreamError(IOError):
+    """The gateway answered a streaming request with an error instead of an event stream."""
+
+
+def _connection_errors():
+    try:
+        import aiohttp
+        return OSError, asyncio.TimeoutError, aiohttp.ClientError
+    except ImportError:
+        return OSError, asyncio.TimeoutError
+
+
+async def _iter_event_stream(response, path_url):
+    if response.status != 200 or not response.content_type.startswith("text/event-stream"):
+        body = await response.text()
+        raise GatewayStreamError(f"Error on POST {path_url}: HTTP {response.status}, {body}")
+    async for item in iter_server_sent_events(response.content):
+        yield item
+
+
+def hummingbot_gateway_ssl_context():
+    """
+    SSL context with the client certificate Hummingbot uses for Gateway, built with Hummingbot's
+    public certificate paths and secrets manager. This is the only place panopticHelpers depends on
+    how Hummingbot stores its Gateway certificates.
+    """
+    import ssl
+    try:
+        from hummingbot.client.config.security import Security
+        from hummingbot.client.hummingbot_application import HummingbotApplication
+        from hummingbot.core.gateway import get_gateway_paths
+        client_config_map = HummingbotApplication.main_application().client_config_map
+        cert_path = get_gateway_paths(client_config_map).local_certs_path.as_posix()
+        password = Security.secrets_manager.password.get_secret_value()
+    except (ImportError, AttributeError) as error:
+        raise GatewayStreamError(
+            f"Cannot locate Hummingbot's Gateway certificates ({error}); pass ssl_context to HummingbotTransport"
+        ) from error
+    context = ssl.create_default_context(cafile=f"{cert_path}/ca_cert.pem")
+    context.load_cert_chain(certfile=f"{cert_path}/client_cert.pem", keyfile=f"{cert_path}/client_key.pem", password=password)
+    return context
+
+
+class HummingbotTransport:
+    """
+    Sends requests through Hummingbot's GatewayHttpClient, which already keeps one shared aiohttp session.
+    api_request buffers whole responses, so streams go over a dedicated AiohttpTransport to the same
+    gateway, using `ssl_context` or, by default, hummingbot_gateway_ssl_context().
+    """
+
+    def __init__(self, gateway, ssl_context=None):
+        self.gateway = gateway
+        self.ssl_context = ssl_context
+        self._stream_transport = None
+
+    async def post(self, path_url, params):
+        return await self.gateway.api_request(
+            method="post",
+            path_url=path_url,
+            params=params,
+            fail_silently=False
+        )
+
+    def _get_stream_transport(self):
+        if self._stream_transport is None:
+            base_url = self.gateway.base_url
+            ssl_context = self.ssl_context
+            if ssl_context is None and base_url.startswith("https"):
+                ssl_context = hummingbot_gateway_ssl_context()
+            self._stream_transport = AiohttpTransport(base_url, ssl_context=ssl_context, connection_limit=4)
+        return self._stream_transport
+
+    async def stream(self, path_url, params):
+        async for item in self._get_stream_transport().stream(path_url, params):
+            yield item
+
+    async def close(self):
+        if self._stream_transport is not None:
+            await self._stream_transport.close()
+            self._stream_transport = None
+
+
+class AiohttpTransport:
+    """
+    Talks to Gateway directly over one pooled keep-alive aiohttp session, for use outside Hummingbot.
+    aiohttp is imported lazily so panopticHelpers keeps numpy as its only hard dependency.
+    """
+
+    def __init__(self, base_url="https://localhost:15888", ssl_context=None, connection_limit=32, timeout_s=60):
+        self.base_url = base_url.rstrip("/")
+        self.ssl_context = ssl_context
+        self.connection_limit = connection_limit
+        self.timeout_s = timeout_s
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, keepalive_timeout=60, ssl=self.ssl_context)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s)
+            )
+        return self._session
+
+    async def post(self, path_url, params):
+        async with self._get_session().post(f"{self.base_url}/{path_url}", json=params) as response:
+            body = await response.json(content_type=None)
+            if response.status != 200:
+                raise IOError(f"Error on POST {path_url}: HTTP {response.status}, {body}")
+            return body
+
+    async def stream(self, path_url, params):
+        import aiohttp
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=None)
+        async with self._get_session().post(f"{self.base_url}/{path_url}", json=params, timeout=timeout) as response:
+            async for item in _iter_event_stream(response, path_url):
+                yield item
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class PanopticGatewayClient:
+    """
+    Async wrapper over every /options/* Gateway route.
+
+    The base payload (chain, network, connector, address) is merged into every request. At most
+    `max_concurrency` requests are in flight at once; independent calls can be issued together with
+    `gather`. Latency is recorded per endpoint and reported by `latency_report`.
+    """
+
+    def __init__(self, transport, base_payload, max_concurrency=8):
+        self.transport = transport
+        self.base_payload = dict(base_payload)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.latency = {}
+
+    @classmethod
+    def from_gateway(cls, gateway, base_payload, max_concurrency=8, ssl_context=None):
+        return cls(HummingbotTransport(gateway, ssl_context), base_payload, max_concurrency)
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def request(self, endpoint, **params):
+        payload = {**self.base_payload, **{k: v for k, v in params.items() if v is not None}}
+        histogram = self.latency.setdefault(endpoint, LatencyHistogram())
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self.transport.post(f"options/{endpoint}", payload)
+            except Exception:
+                histogram.observe(time.perf_counter() - start, error=True)
+                raise
+        histogram.observe(time.perf_counter() - start)
+        return response
+
+    async def stream(self, endpoint, **params):
+        """Async iterator over the (event, data) pairs of a streaming route; not bounded by max_concurrency."""
+        payload = {**self.base_payload, **{k: v for k, v in params.items() if v is not None}}
+        async for item in self.transport.stream(f"options/{endpoint}", payload):
+            yield item
+
+    async def gather(self, *requests, return_exceptions=False):
+        """Run independent requests concurrently (bounded by max_concurrency), preserving order."""
+        return await asyncio.gather(*requests, return_exceptions=return_exceptions)
+
+    def latency_report(self):
+        return {endpoint: histogram.summary() for endpoint, histogram in sorted(self.latency.items())}
+
+    # --- Pool and token lookups ---
+
+    async def get_token_address(self, tokenSymbol):
+        return await self.request("getTokenAddress", tokenSymbol=tokenSymbol)
+
+    async def check_uniswap_pool(self, t0_address, t1_address, fee):
+        return await self.request("checkUniswapPool", t0_address=t0_address, t1_address=t1_address, fee=fee)
+
+    async def get_panoptic_pool(self, uniswapV3PoolAddress):
+        return await self.request("getPanopticPool", uniswapV3PoolAddress=uniswapV3PoolAddress)
+
+    async def get_spot_price(self, uniswapV3PoolAddress, token0Decimals, token1Decimals):
+        return await self.request(
+            "getSpotPrice",
+            uniswapV3PoolAddress=uniswapV3PoolAddress,
+            token0Decimals=token0Decimals,
+            token1Decimals=token1Decimals
+        )
+
+    async def stream_spot_price(self, uniswapV3PoolAddress, token0Decimals, token1Decimals, reconnect_delay=1.0):
+        """
+        Async iterator of spot price updates ({blockNumber, sqrtPriceX96, tick, spotPrice}) pushed by the
+        gateway when the pool's price moves: the current price first, then at most one per block. Dropped
+        connections are re-opened after `reconnect_delay` seconds (None to stop instead); the update that
+        opens a new connection is skipped if the price has not moved.
+        """
+        last_sqrt_price = None
+        while True:
+            try:
+                async for event, update in self.stream(
+                    "streamSpotPrice",
+                    uniswapV3PoolAddress=uniswapV3PoolAddress,
+                    token0Decimals=token0Decimals,
+                    token1Decimals=token1Decimals
+                ):
+                    if event == "spotPrice" and update["sqrtPriceX96"] != last_sqrt_price:
+                        last_sqrt_price = update["sqrtPriceX96"]
+                        yield update
+            except GatewayStreamError:
+                raise
+            except _connection_errors():
+                if reconnect_delay is None:
+                    raise
+            else:
+                if reconnect_delay is None:
+                    return
+            await asyncio.sleep(reconnect_delay)
+
+    async def get_tick_spacing_and_initialized_ticks(self, uniswapV3PoolAddress, includeInitializedTicks=None):
+        return await self.request(
+            "getTickSpacingAndInitializedTicks",
+            uniswapV3PoolAddress=uniswapV3PoolAddress,
+            includeInitializedTicks=includeInitializedTicks
+        )
+
+    async def query_price(self, uniV3Pool):
+        return await self.request("queryPrice", uniV3Pool=uniV3Pool)
+
+    async def unwrap_token_id(self, tokenId):
+        return await self.request("unwrapTokenId", tokenId=str(tokenId))
+
+    # --- Subgraph ---
+
+    async def query_subgraph(self, query, variables):
+        return await self.request("querySubgraph", query=query, variables=variables)
+
+    async def query_positions(self, panopticPool):
+        return await self.request("queryPositions", panopticPool=panopticPool)
+
+    async def position_book(self, panopticPool, reconcileIntervalMs=None):
+        """Open positions from the gateway's event-driven position book; not limited to 32 like query_positions."""
+        return await self.request("positionBook", panopticPool=panopticPool, reconcileIntervalMs=reconcileIntervalMs)
+
+    # --- Account and pool reads ---
+
+    async def account_snapshot(self, panopticPool, positionIdList=None):
+        return await self.request("accountSnapshot", panopticPool=panopticPool, positionIdList=positionIdList)
+
+    async def portfolio_greeks(self, panopticPool, positionIdList=None, gridLowerTick=None, gridUpperTick=None,
+                               gridPoints=None):
+        return await self.request("portfolioGreeks", panopticPool=panopticPool, positionIdList=positionIdList,
+                                  gridLowerTick=gridLowerTick, gridUpperTick=gridUpperTick, gridPoints=gridPoints)
+
+    async def view_cache_stats(self):
+        return await self.request("viewCacheStats")
+
+    async def poll_transactions(self, txHashes, afterBlock=None, timeoutMs=None):
+        return await self.request("pollTransactions", txHashes=txHashes, afterBlock=afterBlock, timeoutMs=timeoutMs)
+
+    async def get_collateral_token0(self, panopticPool):
+        return await self.request("getCollateralToken0", panopticPool=panopticPool)
+
+    async def get_collateral_token1(self, panopticPool):
+        return await self.request("getCollateralToken1", panopticPool=panopticPool)
+
+    async def get_asset(self, collateralTracker):
+        return await self.request("getAsset", collateralTracker=collateralTracker)
+
+    async def get_pool_data(self, collateralTracker):
+        return await self.request("getPoolData", collateralTracker=collateralTracker)
+
+    async def max_withdraw(self, collateralTracker):
+        return await self.request("maxWithdraw", collateralTracker=collateralTracker)
+
+    async def number_of_positions(self, panopticPool):
+        return await self.request("numberOfPositions", panopticPool=panopticPool)
+
+    async def option_position_balance(self, panopticPool, tokenId):
+        return await self.request("optionPositionBalance", panopticPool=panopticPool, tokenId=tokenId)
+
+    async def check_collateral(self, panopticPool, atTick, positionIdList):
+        return await self.request(
+            "checkCollateral",
+            panopticPool=panopticPool,
+            atTick=atTick,
+            positionIdList=positionIdList
+        )
+
+    async def collateral_surface(self, panopticPool, positionIdList=None, ticks=None,
+                                 gridLowerTick=None, gridUpperTick=None, gridPoints=None):
+        return await self.request("collateralSurface", panopticPool=panopticPool, positionIdList=positionIdList, ticks=ticks,
+                                  gridLowerTick=gridLowerTick, gridUpperTick=gridUpperTick, gridPoints=gridPoints)
+
+    async def calculate_accumulated_fees_batch(self, panopticPool, includePendingPremium, positionIdList):
+        return await self.request(
+            "calculateAccumulatedFeesBatch",
+            panopticPool=panopticPool,
+            includePendingPremium=includePendingPremium,
+            positionIdList=positionIdList
+        )
+
+    async def get_account_liquidity(self, univ3pool, owner, tokenType, tickLower, tickUpper):
+        return await self.request(
+            "getAccountLiquidity",
+            univ3pool=univ3pool, owner=owner, tokenType=tokenType, tickLower=tickLower, tickUpper=tickUpper
+        )
+
+    async def get_account_premium(self, univ3pool, owner, tokenType, tickLower, tickUpper, atTick, isLong):
+        return await self.request(
+            "getAccountPremium",
+            univ3pool=univ3pool, owner=owner, tokenType=tokenType, tickLower=tickLower, tickUpper=tickUpper,
+            atTick=atTick, isLong=isLong
+        )
+
+    async def get_account_fees_base(self, univ3pool, owner, tokenType, tickLower, tickUpper):
+        return await self.request(
+            "getAccountFeesBase",
+            univ3pool=univ3pool, owner=owner, tokenType=tokenType, tickLower=tickLower, tickUpper=tickUpper
+        )
+
+    # --- Greeks ---
+
+    async def calculate_delta(self, STRIKE, RANGE, PRICE):
+        return await self.request("calculateDelta", STRIKE=STRIKE, RANGE=RANGE, PRICE=PRICE)
+
+    async def calculate_gamma(self, STRIKE, RANGE, PRICE):
+        return await self.request("calculateGamma", STRIKE=STRIKE, RANGE=RANGE, PRICE=PRICE)
+
+    async def query_greeks(self, panopticPool, tick, positionIdList, greek):
+        return await self.request(
+            "queryGreeks",
+            panopticPool=panopticPool,
+            tick=tick,
+            positionIdList=positionIdList,
+            greek=greek
+        )
+
+    # --- Position builders ---
+
+    async def add_leg(self, univ3pool, self_, legIndex, optionRatio, asset, isLong, tokenType, riskPartner, strike, width):
+        return await self.request(
+            "addLeg",
+            univ3pool=univ3pool, self=self_, legIndex=legIndex, optionRatio=optionRatio, asset=asset,
+            isLong=isLong, tokenType=tokenType, riskPartner=riskPartner, strike=strike, width=width
+        )
+
+    async def create_big_lizard(self, univ3pool, width, longCallStrike, straddleStrike, asset):
+        return await self.request(
+            "createBigLizard",
+            univ3pool=univ3pool, width=width, longCallStrike=longCallStrike, straddleStrike=straddleStrike,
+            asset=asset
+        )
+
+    async def create_call_calendar_spread(self, univ3pool, widthLong, widthShort, strike, asset, optionRatio, start):
+        return await self.request(
+            "createCallCalendarSpread",
+            univ3pool=univ3pool, widthLong=widthLong, widthShort=widthShort, strike=strike, asset=asset,
+            optionRatio=optionRatio, start=start
+        )
+
+    async def create_call_diagonal_spread(self, univ3pool, widthLong, widthShort, strikeLong, strikeShort, asset, optionRatio, start):
+        return await self.request(
+            "createCallDiagonalSpread",
+            univ3pool=univ3pool, widthLong=widthLong, widthShort=widthShort, strikeLong=strikeLong,
+            strikeShort=strikeShort, asset=asset, optionRatio=optionRatio, start=start
+        )
+
+    async def create_call_ratio_spread(self, univ3pool, width, longStrike, shortStrike, asset, ratio, start):
+        return await self.request(
+            "createCallRatioSpread",
+            univ3pool=univ3pool, width=width, longStrike=longStrike, shortStrike=shortStrike, asset=asset,
+            ratio=ratio, start=start
+        )
+
+    async def create_call_spread(self, univ3pool, width, strikeLong, strikeShort, asset, optionRatio, start):
+        return await self.request(
+            "createCallSpread",
+            univ3pool=univ3pool, width=width, strikeLong=strikeLong, strikeShort=strikeShort, asset=asset,
+            optionRatio=optionRatio, start=start
+        )
+
+    async def create_call_zebra_spread(self, univ3pool, width, longStrike, shortStrike, asset, ratio, start):
+        return await self.request(
+            "createCallZEBRASpread",
+            univ3pool=univ3pool, width=width, longStrike=longStrike, shortStrike=shortStrike, asset=asset,
+            ratio=ratio, start=start
+        )
+
+    async def create_iron_butterfly(self, univ3pool, width, strike, wingWidth, asset):
+        return await self.request(
+            "createIronButterfly",
+            univ3pool=univ3pool, width=width, strike=strike, wingWidth=wingWidth, asset=asset
+        )
+
+    async def create_iron_condor(self, univ3pool, width, callStrike, putStrike, wingWidth, asset):
+        return await self.request(
+            "createIronCondor",
+            univ3pool=univ3pool, width=width, callStrike=callStrike, putStrike=putStrike, wingWidth=wingWidth,
+            asset=asset
+        )
+
+    async def create_jade_lizard(self, univ3pool, width, longCallStrike, shortCallStrike, shortPutStrike, asset):
+        return await self.request(
+            "createJadeLizard",
+            univ3pool=univ3pool, width=width, longCallStrike=longCallStrike, shortCallStrike=shortCallStrike,
+            shortPutStrike=shortPutStrike, asset=asset
+        )
+
+    async def create_put_calendar_spread(self, univ3pool, widthLong, widthShort, strike, asset, optionRatio, start):
+        return await self.request(
+            "createPutCalendarSpread",
+            univ3pool=univ3pool, widthLong=widthLong, widthShort=widthShort, strike=strike, asset=asset,
+            optionRatio=optionRatio, start=start
+        )
+
+    async def create_put_diagonal_spread(self, univ3pool, widthLong, widthShort, strikeLong, strikeShort, asset, optionRatio, start):
+        return await self.request(
+            "createPutDiagonalSpread",
+            univ3pool=univ3pool, widthLong=widthLong, widthShort=widthShort, strikeLong=strikeLong,
+            strikeShort=strikeShort, asset=asset, optionRatio=optionRatio, start=start
+        )
+
+    async def create_put_ratio_spread(self, univ3pool, width, longStrike, shortStrike, asset, ratio, start):
+        return await self.request(
+            "createPutRatioSpread",
+            univ3pool=univ3pool, width=width, longStrike=longStrike, shortStrike=shortStrike, asset=asset,
+            ratio=ratio, start=start
+        )
+
+    async def create_put_spread(self, univ3pool, width, strikeLong, strikeShort, asset, optionRatio, start):
+        return await self.request(
+            "createPutSpread",
+            univ3pool=univ3pool, width=width, strikeLong=strikeLong, strikeShort=strikeShort, asset=asset,
+            optionRatio=optionRatio, start=start
+        )
+
+    async def create_put_zebra_spread(self, univ3pool, width, longStrike, shortStrike, asset, ratio, start):
+        return await self.request(
+            "createPutZEBRASpread",
+            univ3pool=univ3pool, width=width, longStrike=longStrike, shortStrike=shortStrike, asset=asset,
+            ratio=ratio, start=start
+        )
+
+    async def create_straddle(self, univ3pool, width, strike, asset, isLong, optionRatio, start):
+        return await self.request(
+            "createStraddle",
+            univ3pool=univ3pool, width=width, strike=strike, asset=asset, isLong=isLong,
+            optionRatio=optionRatio, start=start
+        )
+
+    async def create_strangle(self, univ3pool, width, callStrike, putStrike, asset, isLong, optionRatio, start):
+        return await self.request(
+            "createStrangle",
+            univ3pool=univ3pool, width=width, callStrike=callStrike, putStrike=putStrike, asset=asset,
+            isLong=isLong, optionRatio=optionRatio, start=start
+        )
+
+    async def create_super_bear(self, univ3pool, width, longPutStrike, shortPutStrike, shortCallStrike, asset):
+        return await self.request(
+            "createSuperBear",
+            univ3pool=univ3pool, width=width, longPutStrike=longPutStrike, shortPutStrike=shortPutStrike,
+            shortCallStrike=shortCallStrike, asset=asset
+        )
+
+    async def create_super_bull(self, univ3pool, width, longCallStrike, shortCallStrike, shortPutStrike, asset):
+        return await self.request(
+            "createSuperBull",
+            univ3pool=univ3pool, width=width, longCallStrike=longCallStrike, shortCallStrike=shortCallStrike,
+            shortPutStrike=shortPutStrike, asset=asset
+        )
+
+    async def create_zeehbs(self, univ3pool, width, longStrike, shortStrike, asset, ratio):
+        return await self.request(
+            "createZEEHBS",
+            univ3pool=univ3pool, width=width, longStrike=longStrike, shortStrike=shortStrike, asset=asset,
+            ratio=ratio
+        )
+
+    # --- Transactions ---
+
+    # waitForReceipt=False returns txHash and nonce as soon as the transaction is sent; follow it with
+    # TransactionTracker / poll_transactions.
+
+    async def mint(self, panopticPool, positionIdList, positionSize, effectiveLiquidityLimit, doNotBroadcast=None,
+                   waitForReceipt=None):
+        return await self.request(
+            "mint",
+            panopticPool=panopticPool, positionIdList=positionIdList, positionSize=positionSize,
+            effectiveLiquidityLimit=effectiveLiquidityLimit, doNotBroadcast=doNotBroadcast,
+            waitForReceipt=waitForReceipt
+        )
+
+    async def burn(self, panopticPool, burnTokenId, newPositionIdList, tickLimitLow=None, tickLimitHigh=None, doNotBroadcast=None,
+                   waitForReceipt=None):
+        return await self.request(
+            "burn",
+            panopticPool=panopticPool, burnTokenId=burnTokenId, newPositionIdList=newPositionIdList,
+            tickLimitLow=tickLimitLow, tickLimitHigh=tickLimitHigh, doNotBroadcast=doNotBroadcast,
+            waitForReceipt=waitForReceipt
+        )
+
+    async def burn_and_mint(
+        self, panopticPool, burnTokenId, postburnPositionIdList, mintTokenId, positionSize, effectiveLiquidityLimit,
+        burnTickLimitLow=None, burnTickLimitHigh=None, mintTickLimitLow=None, mintTickLimitHigh=None,
+        doNotBroadcast=None, waitForReceipt=None
+    ):
+        return await self.request(
+            "burnAndMint",
+            panopticPool=panopticPool, burnTokenId=burnTokenId, postburnPositionIdList=postburnPositionIdList,
+            mintTokenId=mintTokenId, positionSize=positionSize, effectiveLiquidityLimit=effectiveLiquidityLimit,
+            burnTickLimitLow=burnTickLimitLow, burnTickLimitHigh=burnTickLimitHigh,
+            mintTickLimitLow=mintTickLimitLow, mintTickLimitHigh=mintTickLimitHigh, doNotBroadcast=doNotBroadcast,
+            waitForReceipt=waitForReceipt
+        )
+
+    async def rebalance(self, panopticPool, plan, tickLimitLow=None, tickLimitHigh=None, doNotBroadcast=None,
+                        waitForReceipt=None):
+        """Execute a RebalancePlan (see plan_rebalance) as one transaction."""
+        return await self.request(
+            "rebalance",
+            panopticPool=panopticPool, **plan.payload(), tickLimitLow=tickLimitLow, tickLimitHigh=tickLimitHigh,
+            doNotBroadcast=doNotBroadcast, waitForReceipt=waitForReceipt
+        )
+
+    async def force_exercise(self, panopticPool, touchedId, positionIdListExercisee, positionIdListExercisor, doNotBroadcast=None):
+        return await self.request(
+            "forceExercise",
+            panopticPool=panopticPool, touchedId=touchedId, positionIdListExercisee=positionIdListExercisee,
+            positionIdListExercisor=positionIdListExercisor, doNotBroadcast=doNotBroadcast
+        )
+
+    async def liquidate(self, panopticPool, positionIdListLiquidator, liquidatee, delegations, positionIdList, doNotBroadcast=None):
+        return await self.request(
+            "liquidate",
+            panopticPool=panopticPool, positionIdListLiquidator=positionIdListLiquidator, liquidatee=liquidatee,
+            delegations=delegations, positionIdList=positionIdList, doNotBroadcast=doNotBroadcast
+        )
+
+    async def poke_median(self, panopticPool, doNotBroadcast=None):
+        return await self.request("pokeMedian", panopticPool=panopticPool, doNotBroadcast=doNotBroadcast)
+
+    async def settle_long_premium(self, panopticPool, positionIdList, owner, legIndex, doNotBroadcast=None):
+        return await self.request(
+            "settleLongPremium",
+            panopticPool=panopticPool, positionIdList=positionIdList, owner=owner, legIndex=legIndex,
+            doNotBroadcast=doNotBroadcast
+        )
+
+    async def deposit(self, collateralTracker, assets, doNotBroadcast=None):
+        return await self.request(
+            "deposit", collateralTracker=collateralTracker, assets=assets, doNotBroadcast=doNotBroadcast
+        )
+
+    async def withdraw(self, collateralTracker, assets, doNotBroadcast=None):
+        return await self.request(
+            "withdraw", collateralTracker=collateralTracker, assets=assets, doNotBroadcast=doNotBroadcast
+        )
@@ -1,3 +1,4 @@
-
 UNI_MIN_TICK = -887272
 UNI_MAX_TICK = 887272
+UNI_MIN_SQRT_RATIO = 4295128739
+UNI_MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
@@ -0,0 +1,104 @@
+import numpy as np
+
+from .tokenid import TokenIdCodec
+
+# Closed-form value and greeks of the Panoptic streamia payoff V(x, K, r), mirroring
+# src/connectors/panoptic/panoptic.greeks.ts. Every function broadcasts over numpy arrays.
+
+
+def _check_range(r):
+    if np.any(np.asarray(r) <= 1):
+        raise ValueError("Range factor must be greater than 1")
+
+
+def payoff_value(x, K, r):
+    x, K, r = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (x, K, r)))
+    _check_range(r)
+    inside = (2 * np.sqrt(x * K * r) - x - K) / (r - 1)
+    return np.where(x <= K / r, x, np.where(x <= K * r, inside, K))
+
+
+def payoff_delta(x, K, r):
+    x, K, r = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (x, K, r)))
+    _check_range(r)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inside = (np.sqrt(K * r / x) - 1) / (r - 1)
+    return np.where(x <= K / r, 1.0, np.where(x <= K * r, inside, 0.0))
+
+
+def payoff_gamma(x, K, r):
+    x, K, r = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (x, K, r)))
+    _check_range(r)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inside = -0.5 * np.sqrt(K * r) / (x * np.sqrt(x) * (r - 1))
+    return np.where((x > K / r) & (x <= K * r), inside, 0.0)
+
+
+def payoff_greeks(strikes, ranges, prices):
+    """Value, delta and gamma of each (strike, range, price) in one pass; inputs broadcast."""
+    x, K, r = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (prices, strikes, ranges)))
+    _check_range(r)
+    lower = K / r
+    upper = K * r
+    in_range = (x > lower) & (x <= upper)
+    sqrt_upper = np.sqrt(upper)
+    sqrt_x = np.sqrt(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = np.where(x <= lower, x, np.where(in_range, (2 * sqrt_x * sqrt_upper - x - K) / (r - 1), K))
+        delta = np.where(x <= lower, 1.0, np.where(in_range, (sqrt_upper / sqrt_x - 1) / (r - 1), 0.0))
+        gamma = np.where(in_range, -0.5 * sqrt_upper / (x * sqrt_x * (r - 1)), 0.0)
+    return value, delta, gamma
+
+
+def position_greeks(strikes, ranges, weights, prices, token_types=None):
+    """
+    Aggregate value, delta and gamma of a multi-leg position at each price.
+
+    strikes, ranges and weights describe the legs (weights are signed sizes, negative for legs
+    bought); token_types, when given, measures each leg against holding the deposited token as in
+    panoptic.greeks.ts. The result has the shape of prices.
+    """
+    legs = np.broadcast_arrays(np.atleast_1d(np.asarray(strikes, dtype=np.float64)), ranges, weights)
+    strikes, ranges, weights = (np.asarray(a, dtype=np.float64).ravel() for a in legs)
+    x = np.asarray(prices, dtype=np.float64)[..., np.newaxis]
+    value, delta, gamma = payoff_greeks(strikes, ranges, x)
+    if token_types is not None:
+        is_token0 = np.broadcast_to(np.asarray(token_types), legs[0].shape).ravel() == 0
+        value = value - np.where(is_token0, x, strikes)
+        delta = delta - is_token0
+    return value @ weights, delta @ weights, gamma @ weights
+
+
+def tokenid_payoff_legs(token_ids, position_sizes):
+    """
+    Payoff legs of Panoptic positions in raw token1/token0 prices, as (n, 4) arrays of strikes,
+    ranges, weights and token types. Sellers hold the liquidity they deposited (positive weight);
+    the notional is position_size * optionRatio of the asset token. Unused legs have zero weight.
+    """
+    pool_ids, legs = TokenIdCodec.decode(token_ids)
+    lower, upper = TokenIdCodec.leg_tick_ranges(legs, TokenIdCodec.tick_spacing(pool_ids))
+    active = legs["option_ratio"] > 0
+    strikes = 1.0001 ** ((lower + upper) / 2)
+    ranges = np.where(active, 1.0001 ** ((upper - lower) / 2), 2.0)
+    notional = np.asarray(position_sizes, dtype=np.float64)[:, np.newaxis] * legs["option_ratio"]
+    weights = np.where(legs["is_long"] == 1, -1.0, 1.0) * np.where(legs["asset"] == 0, notional, notional / strikes)
+    return strikes, ranges, weights, legs["token_type"]
+
+
+def portfolio_greeks(token_ids, position_sizes, prices, per_position=False):
+    """
+    Value, delta and gamma of a set of positions at each price, computed locally from the tokenIds
+    and sizes (e.g. AccountSnapshot.position_ids and balances) with no gateway round trips.
+
+    Returns arrays shaped like prices, or prices.shape + (n_positions,) with per_position=True.
+    """
+    strikes, ranges, weights, token_types = tokenid_payoff_legs(token_ids, position_sizes)
+    x = np.asarray(prices, dtype=np.float64)[..., np.newaxis, np.newaxis]
+    value, delta, gamma = payoff_greeks(strikes, ranges, x)
+    is_token0 = token_types == 0
+    value = ((value - np.where(is_token0, x, strikes)) * weights).sum(axis=-1)
+    delta = ((delta - is_token0) * weights).sum(axis=-1)
+    gamma = (gamma * weights).sum(axis=-1)
+    if per_position:
+        return value, delta, gamma
+    return value.sum(axis=-1), delta.sum(axis=-1), gamma.sum(axis=-1)
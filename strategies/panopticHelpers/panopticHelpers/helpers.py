@@ -1,23 +1,32 @@
 import numpy as np 
 import os
-import datetime
-import matplotlib.pyplot as plt
 
 from .constants import (
     UNI_MIN_TICK, 
     UNI_MAX_TICK
 )
+from .tickmath import (
+    LOG10_TICK_BASE,
+    _decimal_refactor
+)
+from .plotting import SpotPlotRenderer
+from .spotlog import (
+    SPOT_LOG_EXTENSION,
+    convert_spot_data,
+    flush_spot_log,
+    spot_log_writer
+)
 
 def helloWorld():
     print("Hello World!")
     return 1
 
 def tick_to_absolutePrice(tick):
-    absolutePrice = np.power(10, tick*np.log10(1.0001))
+    absolutePrice = np.power(10, tick*LOG10_TICK_BASE)
     return absolutePrice
 
 def absolutePrice_to_adjustedPrice(absolutePrice, t0_decimals, t1_decimals):
-    refactor = np.power(10, t0_decimals-t1_decimals)
+    refactor = _decimal_refactor(t0_decimals, t1_decimals)
     adjustedPrice = absolutePrice * refactor
     return adjustedPrice
 
@@ -27,12 +36,12 @@ def tick_to_adjustedPrice(tick, t0_decimals, t1_decimals):
     return adjustedPrice
 
 def adjustedPrice_to_absolutePrice(adjustedPrice, t0_decimals, t1_decimals):
-    refactor = np.power(10, t0_decimals-t1_decimals)
+    refactor = _decimal_refactor(t0_decimals, t1_decimals)
     absolutePrice = adjustedPrice/refactor
     return absolutePrice
 
 def absolutePrice_to_tick(absolutePrice):
-    tick = np.log10(absolutePrice)/np.log10(1.0001)
+    tick = np.log10(absolutePrice)/LOG10_TICK_BASE
     return tick
 
 def adjustedPrice_to_tick(adjustedPrice, t0_decimals, t1_decimals):
@@ -40,71 +49,26 @@ def adjustedPrice_to_tick(adjustedPrice, t0_decimals, t1_decimals):
     tick = absolutePrice_to_tick(absolutePrice)
     return tick
 
-def log_spot_data(file_location, pool_id, spot_price, spot_tick): 
-    print("File location: ", file_location)
-    if file_location[-4:] != '.dat':
-        raise ValueError("The file location must end with .dat")
-    if os.path.exists(file_location):
-        mode = 'a'  # Append mode
-    else:
-        mode = 'w'  # Write mode
-
-    # Open the file and log the data
-    with open(file_location, mode) as file:
-        current_time = datetime.datetime.now().strftime('%Y-%m-%d-%H:%M:%S')
-        file.write(f"{current_time}, {pool_id}, {spot_price}, {spot_tick}\n")
-
-def generate_spot_plot(file_location):
-    # Read the data from the file
-    if os.path.exists(file_location):
-        with open(file_location, 'r') as file:
-            data = file.readlines()
-    else:
-        raise FileNotFoundError(f"The file {file_location} does not exist.")
-
-    # Extract the data
-    timestamps = []
-    spot_prices = []
-    spot_ticks = []
-    check_pool_id = None
-    for line in data:
-        timestamp, pool_id, spot_price, spot_tick = line.split(',')
-        if ((pool_id != check_pool_id) and len(timestamps) > 1):
-            raise ValueError(f"Pool ID mismatch - spot pricing for multiple pools in the same file.")
-        check_pool_id = pool_id
-        timestamps.append(timestamp)
-        spot_prices.append(float(spot_price))
-        spot_ticks.append(float(spot_tick))
-
-    # Convert timestamps to UTC
-    timestamps_utc = [datetime.datetime.strptime(ts, '%Y-%m-%d-%H:%M:%S').timestamp() for ts in timestamps]
-
-    # Create the plots
-    plt.figure(figsize=(12, 6))
-    plt.plot(timestamps_utc, spot_prices, label='Spot Price')
-    plt.xlabel('Timestamp')
-    plt.ylabel('Value')
-    plt.title(f'Spot Data for UniswapV3 Pool {pool_id}')
-    plt.legend()
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plot_location = file_location.replace('.dat', '_spot_price.png')
-    plt.savefig(plot_location)
-    plt.close()
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(timestamps_utc, spot_ticks, label='Spot Tick')
-    plt.xlabel('Timestamp')
-    plt.ylabel('Value')
-    plt.title(f'Spot Data for UniswapV3 Pool {pool_id}')
-    plt.legend()
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plot_location = file_location.replace('.dat', '_spot_tick.png')
-    plt.savefig(plot_location)
-    plt.close()
-
-    return plot_location
+def _spot_log_location(file_location):
+    # Text .dat logs from earlier versions are migrated to the binary format on first use
+    if file_location.endswith('.dat'):
+        spot_location = file_location[:-4] + SPOT_LOG_EXTENSION
+        if os.path.exists(file_location) and not os.path.exists(spot_location):
+            convert_spot_data(file_location, spot_location)
+        return spot_location
+    if not file_location.endswith(SPOT_LOG_EXTENSION):
+        raise ValueError(f"The file location must end with {SPOT_LOG_EXTENSION}")
+    return file_location
+
+def log_spot_data(file_location, pool_id, spot_price, spot_tick):
+    spot_log_writer(_spot_log_location(file_location)).append(pool_id, spot_price, spot_tick)
+
+def generate_spot_plot(file_location, pool_id=None, max_points=1200):
+    """Price and tick of the whole log in one figure, downsampled to max_points per series."""
+    spot_location = _spot_log_location(file_location)
+    flush_spot_log(spot_location)
+    renderer = SpotPlotRenderer.from_spot_log(spot_location, pool_id, max_points=max_points)
+    return renderer.render(spot_location[:-len(SPOT_LOG_EXTENSION)] + '_spot.png')
 
 def timescale_to_width(timescale, pool_tick_spacing):
     if timescale == '1H':
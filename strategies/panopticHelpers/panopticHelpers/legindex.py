@@ -0,0 +1,148 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from .tokenid import TokenIdCodec, _to_int
+
+
+@dataclass(frozen=True)
+class LegCrossing:
+    token_id: int
+    leg_index: int
+    boundary: int  # the strike-range tick that was crossed
+    entered: bool  # True if the leg came into range, False if it left
+
+
+class _Boundaries:
+    """Sorted (tick, key) pairs kept as two parallel lists so bisect works on plain ticks."""
+
+    def __init__(self):
+        self.ticks = []
+        self.keys = []
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def insert(self, tick, key):
+        i = bisect_right(self.ticks, tick)
+        self.ticks.insert(i, tick)
+        self.keys.insert(i, key)
+
+    def remove(self, tick, key):
+        i = bisect_left(self.ticks, tick)
+        j = bisect_right(self.ticks, tick)
+        i += self.keys[i:j].index(key)
+        del self.ticks[i]
+        del self.keys[i]
+
+    def between(self, low, high, include_low, include_high):
+        """Keys with a tick in the given interval, in tick order."""
+        i = bisect_left(self.ticks, low) if include_low else bisect_right(self.ticks, low)
+        j = bisect_right(self.ticks, high) if include_high else bisect_left(self.ticks, high)
+        return zip(self.ticks[i:j], self.keys[i:j])
+
+    def below(self, tick):
+        return self.keys[:bisect_left(self.ticks, tick)]
+
+    def above(self, tick):
+        return self.keys[bisect_right(self.ticks, tick):]
+
+
+class LegRangeIndex:
+    """
+    Strike ranges [strike - range_down, strike + range_up] of every active leg of the open positions,
+    indexed by their lower and upper boundary ticks. A leg is in range at tick t when lower <= t <= upper.
+
+    Positions are added and removed incrementally (`sync` diffs against a fresh openPositionIdList), and
+    `move(tick)` reports only the legs whose in-range state changed since the previous tick, by walking the
+    boundaries between the two ticks: O(log n + k) for n legs and k boundaries crossed, independent of how
+    many legs stay put. `out_of_range(tick)` answers the full query in O(log n + k) for k legs out of range.
+    """
+
+    def __init__(self, tick_spacing, tick=None):
+        self.tick_spacing = int(tick_spacing)
+        self.tick = tick
+        self._ranges = {}  # (token_id, leg_index) -> (lower, upper)
+        self._positions = {}  # token_id -> list of leg keys
+        self._lowers = _Boundaries()
+        self._uppers = _Boundaries()
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, token_id):
+        return _to_int(token_id) in self._positions
+
+    @property
+    def token_ids(self):
+        return list(self._positions)
+
+    def add(self, token_ids):
+        """Index the active legs of token_ids; positions already indexed are ignored."""
+        new_ids = [t for t in dict.fromkeys(_to_int(t) for t in token_ids) if t not in self._positions]
+        if not new_ids:
+            return
+        _, legs = TokenIdCodec.decode(new_ids)
+        lowers, uppers = TokenIdCodec.leg_tick_ranges(legs, self.tick_spacing)
+        active = legs["option_ratio"] > 0
+        for row, token_id in enumerate(new_ids):
+            keys = []
+            for leg_index in active[row].nonzero()[0].tolist():
+                key = (token_id, leg_index)
+                lower, upper = int(lowers[row, leg_index]), int(uppers[row, leg_index])
+                self._ranges[key] = (lower, upper)
+                self._lowers.insert(lower, key)
+                self._uppers.insert(upper, key)
+                keys.append(key)
+            self._positions[token_id] = keys
+
+    def remove(self, token_ids):
+        for token_id in (_to_int(t) for t in token_ids):
+            for key in self._positions.pop(token_id, ()):
+                lower, upper = self._ranges.pop(key)
+                self._lowers.remove(lower, key)
+                self._uppers.remove(upper, key)
+
+    def sync(self, token_ids):
+        """Make the index hold exactly token_ids, touching only positions that were minted or burned."""
+        wanted = {_to_int(t) for t in token_ids}
+        self.remove([t for t in self._positions if t not in wanted])
+        self.add(wanted)
+
+    def range_of(self, token_id, leg_index):
+        return self._ranges[(_to_int(token_id), leg_index)]
+
+    def out_of_range(self, tick):
+        """Keys (token_id, leg_index) of legs that do not contain tick."""
+        return self._uppers.below(tick) + self._lowers.above(tick)
+
+    def positions_out_of_range(self, tick):
+        """TokenIds with at least one leg that does not contain tick, in index order."""
+        return list(dict.fromkeys(token_id for token_id, _ in self.out_of_range(tick)))
+
+    def move(self, tick):
+        """
+        Set the current tick and return the LegCrossing events since the previous one, in the order the
+        boundaries were crossed. The first call only records the tick.
+        """
+        previous, self.tick = self.tick, tick
+        if previous is None or tick == previous:
+            return []
+        events = []
+        if tick > previous:
+            # Upper bounds in [previous, tick) are left behind; lower bounds in (previous, tick] are reached
+            for boundary, key in self._uppers.between(previous, tick, True, False):
+                if self._ranges[key][0] <= previous:
+                    events.append(LegCrossing(key[0], key[1], boundary, False))
+            for boundary, key in self._lowers.between(previous, tick, False, True):
+                if self._ranges[key][1] >= tick:
+                    events.append(LegCrossing(key[0], key[1], boundary, True))
+        else:
+            # Lower bounds in (tick, previous] are left behind; upper bounds in [tick, previous) are reached
+            for boundary, key in self._lowers.between(tick, previous, False, True):
+                if self._ranges[key][1] >= previous:
+                    events.append(LegCrossing(key[0], key[1], boundary, False))
+            for boundary, key in self._uppers.between(tick, previous, True, False):
+                if self._ranges[key][0] <= tick:
+                    events.append(LegCrossing(key[0], key[1], boundary, True))
+        events.sort(key=lambda event: event.boundary, reverse=tick < previous)
+        return events
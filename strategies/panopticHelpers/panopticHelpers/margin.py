@@ -0,0 +1,212 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .tokenid import TokenIdCodec
+
+# Local estimate of the collateral the CollateralTrackers require for a set of positions, so that
+# candidate mints can be screened across many sizes, strikes and ticks in one numpy pass and only the
+# chosen one confirmed with options/checkCollateral. Amounts are raw token units; utilizations are
+# in basis points, as returned by getPoolData (currentPoolUtilization) and accountSnapshot
+# (poolUtilization0/1 of each position, fixed when it was minted).
+#
+# Every leg is margined on its own: risk-partnered legs (spreads) are not netted, and premia owed or
+# earned are not counted, so compare against checkCollateral with a tolerance (see
+# compare_with_check_collateral) rather than treating the estimate as exact.
+
+DECIMALS = 10_000
+
+
+@dataclass(frozen=True)
+class MarginParameters:
+    """Collateral parameters of the pool's CollateralTrackers, in basis points."""
+    sell_collateral_ratio: int = 2_000
+    buy_collateral_ratio: int = 1_000
+    target_pool_utilization: int = 6_666
+    saturated_pool_utilization: int = 9_000
+
+
+def _to_int(value):
+    """Gateway numbers arrive as ints, decimal or hex strings, or serialized BigNumbers ({"hex": ...})."""
+    if isinstance(value, dict):
+        value = value["hex"]
+    if isinstance(value, str):
+        return int(value, 0)
+    return int(value)
+
+
+def pool_utilization(pool_data):
+    """currentPoolUtilization (basis points) of a getPoolData response."""
+    return _to_int(pool_data["currentPoolUtilization"])
+
+
+def sell_collateral_ratio(utilization, params=MarginParameters()):
+    """Fraction of a sold leg's notional required as collateral at each pool utilization."""
+    u = np.asarray(utilization, dtype=np.float64)
+    ramp = (u - params.target_pool_utilization) / (params.saturated_pool_utilization - params.target_pool_utilization)
+    ratio = params.sell_collateral_ratio + (DECIMALS - params.sell_collateral_ratio) * np.clip(ramp, 0.0, 1.0)
+    return ratio / DECIMALS
+
+
+def buy_collateral_ratio(utilization, params=MarginParameters()):
+    """Fraction of a bought leg's notional required as collateral; halves as the pool saturates."""
+    u = np.asarray(utilization, dtype=np.float64)
+    ramp = (u - params.target_pool_utilization) / (params.saturated_pool_utilization - params.target_pool_utilization)
+    return params.buy_collateral_ratio * (1 - 0.5 * np.clip(ramp, 0.0, 1.0)) / DECIMALS
+
+
+def leg_amounts(token_ids, position_sizes):
+    """
+    Token0 and token1 amounts moved by every leg of each position, as two (n, 4) arrays. The asset
+    token moves position_size * optionRatio; the other token follows from the leg's liquidity.
+    """
+    pool_ids, legs = TokenIdCodec.decode(token_ids)
+    lower, upper = TokenIdCodec.leg_tick_ranges(legs, TokenIdCodec.tick_spacing(pool_ids))
+    sqrt_product = 1.0001 ** ((lower + upper) / 2)  # sqrt(P_lower) * sqrt(P_upper)
+    notional = np.asarray(position_sizes, dtype=np.float64).reshape(-1, 1) * legs["option_ratio"]
+    is_asset0 = legs["asset"] == 0
+    amount0 = np.where(is_asset0, notional, notional / sqrt_product)
+    amount1 = np.where(is_asset0, notional * sqrt_product, notional)
+    return amount0, amount1
+
+
+def required_collateral(token_ids, position_sizes, ticks, utilization0, utilization1, params=MarginParameters()):
+    """
+    Collateral required in token0 and token1 by each position at each tick, as two arrays shaped
+    ticks.shape + (n_positions,). utilization0/1 are basis points, scalars or one per position.
+
+    A leg needs its notional (in the token of its tokenType) times the buy ratio when long. When short
+    it needs the sell ratio while out of the money; in the money the requirement grows towards the
+    full notional as the price moves past the strike, interpolating across the leg's range.
+    """
+    pool_ids, legs = TokenIdCodec.decode(token_ids)
+    lower, upper = TokenIdCodec.leg_tick_ranges(legs, TokenIdCodec.tick_spacing(pool_ids))
+    amount0, amount1 = leg_amounts(token_ids, position_sizes)
+    is_token0 = legs["token_type"] == 0
+    moved = np.where(is_token0, amount0, amount1)
+
+    n = len(legs)
+    utilization = np.where(
+        is_token0,
+        np.broadcast_to(np.asarray(utilization0, dtype=np.float64), (n,))[:, None],
+        np.broadcast_to(np.asarray(utilization1, dtype=np.float64), (n,))[:, None],
+    )
+    sell_ratio = sell_collateral_ratio(utilization, params)
+    buy_ratio = buy_collateral_ratio(utilization, params)
+
+    tick = np.asarray(ticks, dtype=np.float64)[..., np.newaxis, np.newaxis]
+    strike = legs["strike"].astype(np.float64)
+    # price/strike for token1 legs and strike/price for token0 legs: below 1 once the leg is in the money
+    ratio = np.where(is_token0, 1.0001 ** (strike - tick), 1.0001 ** (tick - strike))
+    scale = 1.0001 ** ((upper - lower) / 2)
+    out_of_money = np.where(is_token0, tick < lower, tick >= upper)
+    past_range = np.where(is_token0, tick >= upper, tick < lower)
+    in_money = np.where(past_range, 1 - ratio, np.maximum(scale - ratio, 0.0) / (scale + 1))
+    short = moved * (sell_ratio + (1 - sell_ratio) * np.where(out_of_money, 0.0, in_money))
+
+    required = np.where(legs["option_ratio"] > 0, np.where(legs["is_long"] == 1, moved * buy_ratio, short), 0.0)
+    return (
+        np.where(is_token0, required, 0.0).sum(axis=-1),
+        np.where(is_token0, 0.0, required).sum(axis=-1),
+    )
+
+
+def cross_margin(required0, required1, balance0, balance1, ticks):
+    """
+    Surplus of the collateral balances over the requirement, both valued in token1 at each tick
+    (token1 per token0 is 1.0001 ** tick). The account is solvent where this is non-negative.
+    """
+    price = 1.0001 ** np.asarray(ticks, dtype=np.float64)
+    price = price.reshape(price.shape + (1,) * (np.ndim(required0) - price.ndim))
+    return (balance0 - required0) * price + (balance1 - required1)
+
+
+def screen_candidates(candidate_ids, candidate_sizes, ticks, balance0, balance1, utilization0, utilization1,
+                      open_ids=(), open_sizes=(), open_utilization0=None, open_utilization1=None,
+                      params=MarginParameters(), buffer=1.0):
+    """
+    Which candidate positions the account could add to its open positions and stay solvent at each
+    tick. Candidates are margined at the current utilization0/1; open positions at open_utilization0/1
+    (their poolUtilization0/1 from accountSnapshot), defaulting to the current values. The requirement
+    is multiplied by `buffer` before comparing.
+
+    Returns (solvent, required0, required1): a boolean array shaped ticks.shape + (n_candidates,) and
+    the account's total requirement with each candidate added, in the same shape.
+    """
+    required0, required1 = required_collateral(candidate_ids, candidate_sizes, ticks, utilization0, utilization1, params)
+    if len(open_ids):
+        open0, open1 = required_collateral(
+            open_ids,
+            open_sizes,
+            ticks,
+            utilization0 if open_utilization0 is None else open_utilization0,
+            utilization1 if open_utilization1 is None else open_utilization1,
+            params,
+        )
+        required0 = required0 + open0.sum(axis=-1, keepdims=True)
+        required1 = required1 + open1.sum(axis=-1, keepdims=True)
+    surplus = cross_margin(buffer * required0, buffer * required1, balance0, balance1, ticks)
+    return surplus >= 0, required0, required1
+
+
+def compare_with_check_collateral(response, required0, required1, rtol=0.05):
+    """
+    Relative error of a local estimate against an options/checkCollateral response for the same
+    positions and atTick. Returns {"error0", "error1", "within_tolerance"}; a zero on-chain
+    requirement only matches a local estimate below one raw unit.
+    """
+    errors = []
+    for on_chain, local in ((_to_int(response["requiredCollateral0"]), required0),
+                            (_to_int(response["requiredCollateral1"]), required1)):
+        local = float(local)
+        errors.append(abs(local - on_chain) / on_chain if on_chain else (0.0 if local < 1 else float("inf")))
+    return {"error0": errors[0], "error1": errors[1], "within_tolerance": max(errors) <= rtol}
+
+
+def _column(values, dtype=np.float64):
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=dtype)
+
+
+@dataclass(frozen=True)
+class CollateralSurface:
+    """
+    Parsed options/collateralSurface response: checkCollateral at every tick of a grid, read at
+    block_number. Entries are NaN where the helper call reverted; surplus is in raw token1 units.
+    """
+    block_number: int
+    current_tick: int
+    ticks: np.ndarray
+    collateral_balance0: np.ndarray
+    required_collateral0: np.ndarray
+    collateral_balance1: np.ndarray
+    required_collateral1: np.ndarray
+    surplus: np.ndarray
+    liquidation_ticks: tuple = field(default_factory=tuple)
+    liquidation_tick_down: float = None
+    liquidation_tick_up: float = None
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(
+            int(response["blockNumber"]),
+            int(response["currentTick"]),
+            np.asarray(response["ticks"], dtype=np.int64),
+            _column(response["collateralBalance0"]),
+            _column(response["requiredCollateral0"]),
+            _column(response["collateralBalance1"]),
+            _column(response["requiredCollateral1"]),
+            _column(response["surplus"]),
+            tuple(response["liquidationTicks"]),
+            response["liquidationTickDown"],
+            response["liquidationTickUp"],
+        )
+
+    @property
+    def solvent(self):
+        """Per tick: True where solvent, False where not, and False where the helper call reverted."""
+        return self.surplus >= 0
+
+    def distance_to_liquidation(self):
+        """Ticks from the current tick to the nearest liquidation boundary, or None if none is in the grid."""
+        distances = [abs(tick - self.current_tick) for tick in (self.liquidation_tick_down, self.liquidation_tick_up) if tick is not None]
+        return min(distances) if distances else None
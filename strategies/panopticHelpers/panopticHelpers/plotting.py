@@ -0,0 +1,170 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .spotlog import read_spot_log
+
+# Renders spot plots whose cost is bounded by the output width rather than the history length.
+# Figures are built with the object-oriented Agg API (no pyplot state), so rendering can run on a
+# worker thread while the strategy keeps ticking.
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of at most n_out points that preserve the
+    visual shape of y(x). The first and last points are always kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def minmax_downsample(x, y, n_buckets):
+    """Indices of the minimum and maximum of y in each of n_buckets equal-count buckets, in order."""
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    size = n // n_buckets
+    body = y[:size * n_buckets].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lo = offsets + body.argmin(axis=1)
+    hi = offsets + body.argmax(axis=1)
+    tail = np.arange(size * n_buckets, n)
+    return np.unique(np.concatenate([lo, hi, tail, [0, n - 1]]))
+
+
+class SpotPlotRenderer:
+    """
+    Rolling window of (timestamp, price, tick) rendered as one two-panel figure.
+
+    `append` is O(1) into a ring buffer of `window` points; `render` downsamples the window to
+    `max_points` with LTTB before drawing; `render_async` hands a copy of the window to a single
+    background worker and returns immediately, dropping requests while a render is in flight.
+    """
+
+    def __init__(self, window=50_000, max_points=1_200, figsize=(12, 8), dpi=100, pool_id=None):
+        self.window = window
+        self.max_points = max_points
+        self.figsize = figsize
+        self.dpi = dpi
+        self.pool_id = pool_id
+        self._timestamps = np.zeros(window, dtype=np.int64)
+        self._prices = np.zeros(window, dtype=np.float64)
+        self._ticks = np.zeros(window, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = None
+
+    @classmethod
+    def from_spot_log(cls, path, pool_id=None, window=None, **kwargs):
+        """Seed the window with the tail of a spot log (read through its memmap); window=None keeps all of it."""
+        spot_log = read_spot_log(path)
+        if pool_id is None and len(spot_log.pools) > 1:
+            raise ValueError(f"Pool ID mismatch - spot pricing for multiple pools in the same file.")
+        if pool_id is None:
+            records = spot_log.records
+            pool_id = spot_log.pools[0] if spot_log.pools else None
+        else:
+            records = spot_log.for_pool(pool_id)
+        renderer = cls(window=window or max(len(records), 1), pool_id=pool_id, **kwargs)
+        renderer.extend(records["timestamp"], records["price"], records["tick"])
+        return renderer
+
+    def __len__(self):
+        return min(self._count, self.window)
+
+    def append(self, timestamp_ns, price, tick):
+        with self._lock:
+            i = self._count % self.window
+            self._timestamps[i] = timestamp_ns
+            self._prices[i] = price
+            self._ticks[i] = tick
+            self._count += 1
+
+    def extend(self, timestamps_ns, prices, ticks):
+        timestamps_ns = np.asarray(timestamps_ns)[-self.window:]
+        prices = np.asarray(prices)[-self.window:]
+        ticks = np.asarray(ticks)[-self.window:]
+        with self._lock:
+            positions = (self._count + np.arange(len(timestamps_ns))) % self.window
+            self._timestamps[positions] = timestamps_ns
+            self._prices[positions] = prices
+            self._ticks[positions] = ticks
+            self._count += len(timestamps_ns)
+
+    def snapshot(self):
+        """Copy of the window in time order: (timestamps_ns, prices, ticks)."""
+        with self._lock:
+            if self._count <= self.window:
+                order = np.arange(self._count)
+            else:
+                order = np.roll(np.arange(self.window), -(self._count % self.window))
+            return self._timestamps[order], self._prices[order], self._ticks[order]
+
+    def _draw(self, file_location, timestamps_ns, prices, ticks):
+        x = timestamps_ns.astype(np.float64)
+        keep_price = lttb(x, prices, self.max_points)
+        keep_tick = lttb(x, ticks, self.max_points)
+        times = timestamps_ns.view("datetime64[ns]")
+
+        figure = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(figure)
+        price_axis, tick_axis = figure.subplots(2, 1, sharex=True)
+        price_axis.plot(times[keep_price], prices[keep_price], label='Spot Price')
+        price_axis.set_ylabel('Price')
+        price_axis.set_title(f'Spot Data for UniswapV3 Pool {self.pool_id}')
+        price_axis.legend()
+        tick_axis.plot(times[keep_tick], ticks[keep_tick], label='Spot Tick', color='tab:orange')
+        tick_axis.set_ylabel('Tick')
+        tick_axis.set_xlabel('Timestamp')
+        tick_axis.legend()
+        tick_axis.tick_params(axis='x', labelrotation=45)
+        figure.tight_layout()
+
+        # Write to a temporary file and rename, so readers never see a half-written image
+        temporary_location = file_location + '.tmp.png'
+        figure.savefig(temporary_location)
+        os.replace(temporary_location, file_location)
+        return file_location
+
+    def render(self, file_location):
+        return self._draw(file_location, *self.snapshot())
+
+    def render_async(self, file_location):
+        """Render on the background worker; returns the Future, or None if a render is still running."""
+        if self._pending is not None and not self._pending.done():
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spot-plot")
+        self._pending = self._executor.submit(self._draw, file_location, *self.snapshot())
+        return self._pending
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
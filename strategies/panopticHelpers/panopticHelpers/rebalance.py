@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+# Plans an options/rebalance call: every burn and replacement mint of one rebalance goes into a single
+# PanopticPool multicall, so the account never sits half-rebalanced between transactions.
+
+
+def _token_id(value):
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+
+@dataclass(frozen=True)
+class RebalancePlan:
+    position_id_list: tuple  # positions open before the rebalance
+    burn_token_ids: tuple
+    mints: tuple  # (token_id, position_size, effective_liquidity_limit)
+    final_position_id_list: tuple
+
+    def payload(self):
+        """Request fields for options/rebalance; token ids are sent as strings to keep their full 256 bits."""
+        return {
+            "positionIdList": [str(token_id) for token_id in self.position_id_list],
+            "burnTokenIds": [str(token_id) for token_id in self.burn_token_ids],
+            "mints": [
+                {"tokenId": str(token_id), "positionSize": str(size), "effectiveLiquidityLimit": str(limit)}
+                for token_id, size, limit in self.mints
+            ],
+        }
+
+
+def plan_rebalance(open_positions, burn_token_ids, mint_token_ids, position_size, effective_liquidity_limit=0):
+    """
+    Burns burn_token_ids and mints mint_token_ids (each with position_size) in one transaction. Token ids
+    may be ints or hex/decimal strings. Raises ValueError if a burn is not open or a mint is already open.
+    The gateway rebuilds the same ordering: burns first, then each mint appended to the remaining list.
+    """
+    current = tuple(_token_id(t) for t in open_positions)
+    burns = tuple(_token_id(t) for t in burn_token_ids)
+    if len(set(burns)) != len(burns):
+        raise ValueError("duplicate token id in burn_token_ids")
+    missing = set(burns) - set(current)
+    if missing:
+        raise ValueError(f"cannot burn positions that are not open: {sorted(hex(t) for t in missing)}")
+    burned = set(burns)
+    final = [t for t in current if t not in burned]
+    mints = []
+    for token_id in (_token_id(t) for t in mint_token_ids):
+        if token_id in final:
+            raise ValueError(f"position {hex(token_id)} is already open")
+        final.append(token_id)
+        mints.append((token_id, int(position_size), int(effective_liquidity_limit)))
+    return RebalancePlan(current, burns, tuple(mints), tuple(final))
@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class CollateralSnapshot:
+    collateral_tracker: str
+    asset: str
+    max_withdraw: int  # zero while the account holds positions
+    pool_assets: int
+    inside_amm: int
+    current_pool_utilization: int
+    collateral_balance: int  # the account's shares converted to assets
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(
+            response['collateralTracker'],
+            response['asset'],
+            int(response['maxWithdraw']),
+            int(response['poolAssets']),
+            int(response['insideAMM']),
+            int(response['currentPoolUtilization']),
+            int(response['collateralBalance'])
+        )
+
+
+@dataclass(frozen=True)
+class PositionBalance:
+    token_id: int
+    balance: int
+    pool_utilization0: int
+    pool_utilization1: int
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(
+            int(response['tokenId']),
+            int(response['balance']),
+            int(response['poolUtilization0']),
+            int(response['poolUtilization1'])
+        )
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """Parsed options/accountSnapshot response; every value was read at block_number."""
+    block_number: int
+    panoptic_pool: str
+    account: str
+    number_of_positions: int
+    collateral0: CollateralSnapshot
+    collateral1: CollateralSnapshot
+    positions: list = field(default_factory=list)
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(
+            int(response['blockNumber']),
+            response['panopticPool'],
+            response['account'],
+            int(response['numberOfPositions']),
+            CollateralSnapshot.from_response(response['collateral0']),
+            CollateralSnapshot.from_response(response['collateral1']),
+            [PositionBalance.from_response(p) for p in response['positions']]
+        )
+
+    @property
+    def position_ids(self):
+        return [p.token_id for p in self.positions]
+
+    def balance_of(self, token_id):
+        for p in self.positions:
+            if p.token_id == int(token_id):
+                return p.balance
+        return 0
+
+
+async def fetch_account_snapshot(gateway, request_payload, position_ids=None):
+    """
+    One gateway round trip for the account state that used to take a dozen sequential calls.
+    `gateway` is anything exposing GatewayHttpClient.api_request; position_ids defaults to the
+    open positions known to the subgraph.
+    """
+    params = dict(request_payload)
+    if position_ids is not None:
+        params["positionIdList"] = [str(token_id) for token_id in position_ids]
+    response = await gateway.api_request(
+        method="post",
+        path_url="options/accountSnapshot",
+        params=params,
+        fail_silently=False
+    )
+    return AccountSnapshot.from_response(response)
@@ -0,0 +1,182 @@
+import atexit
+import datetime
+import os
+import time
+import numpy as np
+
+# Append-only spot log: a 16-byte header followed by fixed-width little-endian records. Pool
+# addresses are stored once in a sidecar "<path>.pools" file (one per line) and referenced by index.
+SPOT_LOG_MAGIC = b"PNSPOT\x00\x01"
+SPOT_LOG_HEADER_BYTES = 16
+SPOT_RECORD_DTYPE = np.dtype([
+    ("timestamp", "<i8"),  # Unix time in nanoseconds
+    ("pool", "<u4"),
+    ("price", "<f8"),
+    ("tick", "<f8"),
+])
+SPOT_LOG_EXTENSION = ".spot"
+
+
+def _pools_path(path):
+    return path + ".pools"
+
+
+def _read_pools(path):
+    if not os.path.exists(_pools_path(path)):
+        return []
+    with open(_pools_path(path), "r") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+class SpotLogWriter:
+    """
+    Buffered appender for a spot log. The file handle stays open between ticks; records are written
+    in blocks once `buffer_records` accumulate or `flush_interval` seconds have passed.
+    """
+
+    def __init__(self, path, buffer_records=64, flush_interval=30.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pools = {pool: i for i, pool in enumerate(_read_pools(path))}
+        self._buffer = np.zeros(buffer_records, dtype=SPOT_RECORD_DTYPE)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = open(path, "ab")
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(SPOT_LOG_MAGIC.ljust(SPOT_LOG_HEADER_BYTES, b"\x00"))
+            self._file.flush()
+        elif size < SPOT_LOG_HEADER_BYTES:
+            raise ValueError(f"{path} is not a spot log")
+        elif (size - SPOT_LOG_HEADER_BYTES) % SPOT_RECORD_DTYPE.itemsize:
+            # Drop a record torn by an interrupted write so later appends stay aligned
+            self._file.truncate(size - (size - SPOT_LOG_HEADER_BYTES) % SPOT_RECORD_DTYPE.itemsize)
+
+    def _pool_index(self, pool_id):
+        pool_id = str(pool_id)
+        if pool_id not in self._pools:
+            with open(_pools_path(self.path), "a") as file:
+                file.write(pool_id + "\n")
+            self._pools[pool_id] = len(self._pools)
+        return self._pools[pool_id]
+
+    def append(self, pool_id, spot_price, spot_tick, timestamp_ns=None):
+        record = self._buffer[self._pending]
+        record["timestamp"] = time.time_ns() if timestamp_ns is None else timestamp_ns
+        record["pool"] = self._pool_index(pool_id)
+        record["price"] = spot_price
+        record["tick"] = spot_tick
+        self._pending += 1
+        if self._pending == len(self._buffer) or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def extend(self, pool_ids, spot_prices, spot_ticks, timestamps_ns):
+        """Append many records at once (used by the .dat converter)."""
+        self.flush()
+        records = np.zeros(len(timestamps_ns), dtype=SPOT_RECORD_DTYPE)
+        records["timestamp"] = timestamps_ns
+        records["pool"] = [self._pool_index(p) for p in pool_ids]
+        records["price"] = spot_prices
+        records["tick"] = spot_ticks
+        self._file.write(records.tobytes())
+        self._file.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self._pending = 0
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SpotLog:
+    """Zero-copy view of a spot log: `records` is a read-only numpy.memmap of SPOT_RECORD_DTYPE."""
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"The file {path} does not exist.")
+        with open(path, "rb") as file:
+            if file.read(len(SPOT_LOG_MAGIC)) != SPOT_LOG_MAGIC:
+                raise ValueError(f"{path} is not a spot log")
+        self.path = path
+        self.pools = _read_pools(path)
+        # A partially flushed trailing record is ignored until the writer completes it
+        count = (os.path.getsize(path) - SPOT_LOG_HEADER_BYTES) // SPOT_RECORD_DTYPE.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=SPOT_RECORD_DTYPE, mode="r",
+                                     offset=SPOT_LOG_HEADER_BYTES, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=SPOT_RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"].view("datetime64[ns]")
+
+    def for_pool(self, pool_id):
+        """Records of a single pool (a copy; the full log stays memory-mapped)."""
+        return self.records[self.records["pool"] == self.pools.index(str(pool_id))]
+
+
+def read_spot_log(path):
+    return SpotLog(path)
+
+
+def convert_spot_data(dat_location, spot_location=None):
+    """
+    Migrate a text log written by the old log_spot_data ("%Y-%m-%d-%H:%M:%S, pool, price, tick"
+    per line, local time) to the binary format. Returns the new path.
+    """
+    if spot_location is None:
+        spot_location = os.path.splitext(dat_location)[0] + SPOT_LOG_EXTENSION
+    timestamps, pool_ids, prices, ticks = [], [], [], []
+    with open(dat_location, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            timestamp, pool_id, spot_price, spot_tick = (field.strip() for field in line.split(","))
+            seconds = datetime.datetime.strptime(timestamp, "%Y-%m-%d-%H:%M:%S").timestamp()
+            timestamps.append(int(seconds) * 1_000_000_000)
+            pool_ids.append(pool_id)
+            prices.append(float(spot_price))
+            ticks.append(float(spot_tick))
+    with SpotLogWriter(spot_location) as writer:
+        writer.extend(pool_ids, prices, ticks, timestamps)
+    return spot_location
+
+
+_writers = {}
+
+
+def spot_log_writer(path):
+    """Shared writer per path, closed (and flushed) at interpreter exit."""
+    if path not in _writers:
+        _writers[path] = SpotLogWriter(path)
+    return _writers[path]
+
+
+def flush_spot_log(path):
+    if path in _writers:
+        _writers[path].flush()
+
+
+@atexit.register
+def _close_writers():
+    for writer in _writers.values():
+        writer.close()
@@ -0,0 +1,156 @@
+import dataclasses
+import itertools
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .backtest import BacktestConfig, run_backtest
+
+# Grid search over BacktestConfig parameters. The tick series is written once to "<directory>/ticks.npy"
+# and memory-mapped read-only by every worker, so tasks only carry parameter dicts. Results stream
+# into one append-only raw column file per field ("<directory>/columns/<field>.bin"); a sweep that is
+# interrupted resumes by skipping the configurations already present.
+
+SWEEP_METADATA = "sweep.json"
+TICKS_FILE = "ticks.npy"
+COLUMNS_DIRECTORY = "columns"
+
+METRIC_COLUMNS = {
+    "final_equity": np.float64,
+    "return": np.float64,
+    "premia": np.float64,
+    "commissions": np.float64,
+    "mints": np.int64,
+    "burns": np.int64,
+    "time_in_range": np.float64,
+    "max_drawdown": np.float64,
+    "liquidated_at": np.int64,  # -1 when never liquidated
+}
+
+
+def parameter_grid(**axes):
+    """Every combination of the given BacktestConfig fields, e.g. parameter_grid(width=[6, 12], option_ratio=[1, 2])."""
+    fields = {f.name for f in dataclasses.fields(BacktestConfig)}
+    unknown = set(axes) - fields
+    if unknown:
+        raise ValueError(f"Not BacktestConfig fields: {sorted(unknown)}")
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+class _ColumnWriter:
+    """Append-only raw column files of equal length; a row torn by an interruption is dropped on open."""
+
+    def __init__(self, directory, dtypes):
+        os.makedirs(directory, exist_ok=True)
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        self.paths = {name: os.path.join(directory, name + ".bin") for name in dtypes}
+        rows = min(
+            (os.path.getsize(path) // self.dtypes[name].itemsize if os.path.exists(path) else 0)
+            for name, path in self.paths.items()
+        )
+        self._files = {}
+        for name, path in self.paths.items():
+            file = open(path, "ab")
+            file.truncate(rows * self.dtypes[name].itemsize)
+            self._files[name] = file
+        self.rows = rows
+
+    def append(self, rows):
+        for name, file in self._files.items():
+            file.write(np.asarray([row[name] for row in rows], dtype=self.dtypes[name]).tobytes())
+        for file in self._files.values():
+            file.flush()
+        self.rows += len(rows)
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+
+
+def read_sweep(directory):
+    """Columns of a sweep as read-only memmaps (config_index, the swept parameters and METRIC_COLUMNS)."""
+    with open(os.path.join(directory, SWEEP_METADATA)) as file:
+        metadata = json.load(file)
+    columns_directory = os.path.join(directory, COLUMNS_DIRECTORY)
+    columns = {}
+    for name, dtype in metadata["columns"].items():
+        path = os.path.join(columns_directory, name + ".bin")
+        count = os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0
+        columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(count,)) if count else np.zeros(0, dtype=dtype)
+    rows = min(len(column) for column in columns.values())
+    return {name: column[:rows] for name, column in columns.items()}
+
+
+_worker_ticks = None
+
+
+def _init_worker(directory):
+    global _worker_ticks
+    _worker_ticks = np.load(os.path.join(directory, TICKS_FILE), mmap_mode="r")
+
+
+def _run_batch(base_config, columns, batch):
+    rows = []
+    for index, params in batch:
+        summary = run_backtest(_worker_ticks, None, dataclasses.replace(base_config, **params)).summary()
+        row = {"config_index": index, **{name: value for name, value in params.items() if name in columns}}
+        for name in METRIC_COLUMNS:
+            value = summary[name]
+            row[name] = -1 if value is None else value
+        rows.append(row)
+    return rows
+
+
+def run_sweep(directory, ticks, grid, base_config=BacktestConfig(), max_workers=None, batch_size=8, progress=None):
+    """
+    Backtest every configuration of grid (a list of parameter dicts, see parameter_grid) on top of
+    base_config, across a process pool. Results are appended to the sweep's column files as batches
+    finish; calling again with the same directory and grid runs only the configurations that are
+    missing. `ticks` may be None when resuming. Returns read_sweep(directory).
+    """
+    os.makedirs(directory, exist_ok=True)
+    metadata_path = os.path.join(directory, SWEEP_METADATA)
+    # Numeric parameters get a column; others (e.g. timescale) are recovered from grid[config_index]
+    names = {name for params in grid for name in params}
+    parameters = sorted(name for name in names if all(isinstance(params.get(name), (int, float)) for params in grid))
+    metadata = {
+        "base_config": dataclasses.asdict(base_config),
+        "grid": grid,
+        "columns": {
+            "config_index": "<i8",
+            **{name: "<f8" for name in parameters},
+            **{name: np.dtype(dtype).str for name, dtype in METRIC_COLUMNS.items()},
+        },
+    }
+    if os.path.exists(metadata_path):
+        with open(metadata_path) as file:
+            if json.load(file) != json.loads(json.dumps(metadata)):
+                raise ValueError(f"{directory} holds a different sweep; use a new directory")
+    else:
+        if ticks is None:
+            raise ValueError("ticks are required to start a new sweep")
+        np.save(os.path.join(directory, TICKS_FILE), np.asarray(ticks, dtype=np.float64))
+        with open(metadata_path, "w") as file:
+            json.dump(metadata, file)
+
+    writer = _ColumnWriter(os.path.join(directory, COLUMNS_DIRECTORY), metadata["columns"])
+    try:
+        done = set()
+        if writer.rows:
+            done = set(read_sweep(directory)["config_index"].tolist())
+        pending = [(index, params) for index, params in enumerate(grid) if index not in done]
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(directory,)) as executor:
+            futures = {executor.submit(_run_batch, base_config, metadata["columns"], batch) for batch in batches}
+            while futures:
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    writer.append(future.result())
+                if progress is not None:
+                    progress(writer.rows, len(grid))
+    finally:
+        writer.close()
+    return read_sweep(directory)
@@ -0,0 +1,152 @@
+import math
+import numpy as np
+
+from .constants import (
+    UNI_MIN_TICK,
+    UNI_MAX_TICK
+)
+
+
+class TickGrid:
+    """
+    The usable ticks of a Uniswap pool, described arithmetically as min_tick + i * spacing.
+    All lookups are O(1); nothing is materialized.
+    """
+
+    def __init__(self, min_tick, max_tick, spacing):
+        if spacing <= 0:
+            raise ValueError("Tick spacing must be positive")
+        if (max_tick - min_tick) % spacing != 0:
+            raise ValueError("max_tick must lie on the grid defined by min_tick and spacing")
+        self.min_tick = int(min_tick)
+        self.max_tick = int(max_tick)
+        self.spacing = int(spacing)
+
+    @classmethod
+    def from_spacing(cls, spacing):
+        return cls(
+            math.ceil(UNI_MIN_TICK / spacing) * spacing,
+            math.floor(UNI_MAX_TICK / spacing) * spacing,
+            spacing
+        )
+
+    @classmethod
+    def from_response(cls, response):
+        """Build from an options/getTickSpacingAndInitializedTicks response."""
+        return cls(response['minTick'], response['maxTick'], response['tickSpacing'])
+
+    def __len__(self):
+        return (self.max_tick - self.min_tick) // self.spacing + 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("TickGrid index out of range")
+        return self.min_tick + index * self.spacing
+
+    def __contains__(self, tick):
+        return self.min_tick <= tick <= self.max_tick and (tick - self.min_tick) % self.spacing == 0
+
+    def __repr__(self):
+        return f"TickGrid(min_tick={self.min_tick}, max_tick={self.max_tick}, spacing={self.spacing})"
+
+    def index(self, tick):
+        if tick not in self:
+            raise ValueError(f"{tick} is not on the tick grid")
+        return (int(tick) - self.min_tick) // self.spacing
+
+    def floor(self, tick):
+        """Greatest grid tick <= tick, or None below the grid."""
+        if tick < self.min_tick:
+            return None
+        return min(self.min_tick + math.floor((tick - self.min_tick) / self.spacing) * self.spacing, self.max_tick)
+
+    def ceil(self, tick):
+        """Smallest grid tick >= tick, or None above the grid."""
+        if tick > self.max_tick:
+            return None
+        return max(self.min_tick + math.ceil((tick - self.min_tick) / self.spacing) * self.spacing, self.min_tick)
+
+    def nearest(self, tick):
+        """Closest grid tick; ties resolve to the lower tick."""
+        lower = self.floor(tick)
+        upper = self.ceil(tick)
+        if lower is None:
+            return upper
+        if upper is None:
+            return lower
+        return lower if (tick - lower) <= (upper - tick) else upper
+
+    def bracket(self, tick):
+        """
+        (lower, upper) grid ticks around tick, where lower <= tick < upper.
+        Either side is None when tick falls outside the grid.
+        """
+        lower = self.floor(tick)
+        if lower is None:
+            return None, self.min_tick
+        upper = lower + self.spacing
+        return lower, (upper if upper <= self.max_tick else None)
+
+
+class InitializedTicks:
+    """
+    Initialized ticks of a pool at one block, as returned by options/getTickSpacingAndInitializedTicks
+    with includeInitializedTicks set. Ticks are sorted; liquidity values are kept as float64 arrays.
+    """
+
+    def __init__(self, ticks, liquidity_net, liquidity_gross=None, block_number=None, spacing=None):
+        self.ticks = np.asarray(ticks, dtype=np.int64)
+        self.liquidity_net = np.asarray(liquidity_net, dtype=np.float64)
+        self.liquidity_gross = (
+            np.asarray(liquidity_gross, dtype=np.float64) if liquidity_gross is not None
+            else np.abs(self.liquidity_net)
+        )
+        if not (len(self.ticks) == len(self.liquidity_net) == len(self.liquidity_gross)):
+            raise ValueError("ticks and liquidity arrays must have the same length")
+        self.block_number = block_number
+        self.spacing = spacing
+        # Active liquidity just above each initialized tick (the running sum of liquidityNet)
+        self._cumulative_net = np.cumsum(self.liquidity_net)
+
+    @classmethod
+    def from_response(cls, response):
+        """Build from the initializedTicks field of a getTickSpacingAndInitializedTicks response."""
+        data = response.get('initializedTicks', response)
+        return cls(
+            data['initializedTicks'],
+            [float(x) for x in data['liquidityNet']],
+            [float(x) for x in data['liquidityGross']],
+            data.get('blockNumber'),
+            data.get('tickSpacing')
+        )
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def __repr__(self):
+        return f"InitializedTicks(n={len(self)}, block_number={self.block_number})"
+
+    def active_liquidity_at(self, ticks):
+        """In-range liquidity at the given tick(s); vectorized over array input."""
+        idx = np.searchsorted(self.ticks, np.asarray(ticks), side='right') - 1
+        result = np.where(idx >= 0, self._cumulative_net[np.maximum(idx, 0)], 0.0)
+        return result if np.ndim(ticks) else float(result)
+
+    def in_range(self, tick_lower, tick_upper):
+        """Initialized ticks t with tick_lower <= t <= tick_upper."""
+        lo = np.searchsorted(self.ticks, tick_lower, side='left')
+        hi = np.searchsorted(self.ticks, tick_upper, side='right')
+        return self.ticks[lo:hi]
+
+    def next_initialized(self, tick, lte=False):
+        """
+        Next initialized tick strictly above tick, or when lte is set, the greatest one <= tick.
+        Returns None when there is none, mirroring TickBitmap.nextInitializedTickWithinOneWord across words.
+        """
+        if lte:
+            i = np.searchsorted(self.ticks, tick, side='right') - 1
+            return int(self.ticks[i]) if i >= 0 else None
+        i = np.searchsorted(self.ticks, tick, side='right')
+        return int(self.ticks[i]) if i < len(self.ticks) else None
@@ -0,0 +1,131 @@
+import numpy as np
+from functools import lru_cache
+
+from .constants import (
+    UNI_MIN_TICK,
+    UNI_MAX_TICK,
+    UNI_MIN_SQRT_RATIO,
+    UNI_MAX_SQRT_RATIO
+)
+
+# Precomputed once at import; the scalar helpers used to recompute these on every call.
+LOG10_TICK_BASE = np.log10(1.0001)
+LN_TICK_BASE = np.log(1.0001)
+Q96 = 2 ** 96
+Q192 = 2 ** 192
+
+# Magic constants from Uniswap V3 TickMath.getSqrtRatioAtTick: 1/sqrt(1.0001)^(2^i) as Q128.128
+_SQRT_RATIO_FACTORS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+_UINT256_MAX = 2 ** 256 - 1
+
+
+@lru_cache(maxsize=65536)
+def _decimal_refactor(t0_decimals, t1_decimals):
+    return np.power(10.0, t0_decimals - t1_decimals)
+
+
+@lru_cache(maxsize=65536)
+def get_sqrt_ratio_at_tick(tick):
+    """Exact port of Uniswap V3 TickMath.getSqrtRatioAtTick; returns sqrtPriceX96 as an int."""
+    tick = int(tick)
+    if tick < UNI_MIN_TICK or tick > UNI_MAX_TICK:
+        raise ValueError(f"Tick {tick} outside of [{UNI_MIN_TICK}, {UNI_MAX_TICK}]")
+    abs_tick = abs(tick)
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 0x100000000000000000000000000000000
+    for mask, factor in _SQRT_RATIO_FACTORS:
+        if abs_tick & mask:
+            ratio = (ratio * factor) >> 128
+    if tick > 0:
+        ratio = _UINT256_MAX // ratio
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96):
+    """Exact equivalent of Uniswap V3 TickMath.getTickAtSqrtRatio: the greatest tick whose sqrt ratio is <= the input."""
+    sqrt_price_x96 = int(sqrt_price_x96)
+    if sqrt_price_x96 < UNI_MIN_SQRT_RATIO or sqrt_price_x96 >= UNI_MAX_SQRT_RATIO:
+        raise ValueError(f"sqrtPriceX96 {sqrt_price_x96} outside of [MIN_SQRT_RATIO, MAX_SQRT_RATIO)")
+    # The float estimate is within one tick of the answer; settle the boundary with integer math.
+    estimate = int(np.floor(2 * (np.log(float(sqrt_price_x96)) - np.log(float(Q96))) / LN_TICK_BASE))
+    return _correct_tick_estimate(estimate, sqrt_price_x96)
+
+
+def _correct_tick_estimate(estimate, sqrt_price_x96):
+    tick = min(max(estimate, UNI_MIN_TICK), UNI_MAX_TICK)
+    while tick > UNI_MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < UNI_MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def ticks_to_sqrtPriceX96(ticks):
+    """Batch getSqrtRatioAtTick. sqrtPriceX96 overflows int64, so the result is an object array of ints."""
+    ticks = np.asarray(ticks, dtype=np.int64)
+    unique_ticks, inverse = np.unique(ticks, return_inverse=True)
+    unique_ratios = np.array([get_sqrt_ratio_at_tick(t) for t in unique_ticks.tolist()], dtype=object)
+    return unique_ratios[inverse].reshape(ticks.shape)
+
+
+def sqrtPriceX96_to_ticks(sqrt_prices_x96):
+    """Batch getTickAtSqrtRatio. Accepts any iterable of ints (or an object array) and returns int64 ticks."""
+    sqrt_prices = np.asarray(sqrt_prices_x96, dtype=object)
+    flat = sqrt_prices.ravel()
+    as_float = flat.astype(np.float64)
+    if np.any(flat < UNI_MIN_SQRT_RATIO) or np.any(flat >= UNI_MAX_SQRT_RATIO):
+        raise ValueError("sqrtPriceX96 outside of [MIN_SQRT_RATIO, MAX_SQRT_RATIO)")
+    estimates = np.floor(2 * (np.log(as_float) - np.log(float(Q96))) / LN_TICK_BASE).astype(np.int64)
+    estimates = np.clip(estimates, UNI_MIN_TICK, UNI_MAX_TICK - 1)
+    # One-tick correction done as elementwise integer comparisons against the exact ratios.
+    ticks = estimates - (ticks_to_sqrtPriceX96(estimates) > flat).astype(np.int64)
+    ticks = ticks + (ticks_to_sqrtPriceX96(ticks + 1) <= flat).astype(np.int64)
+    unsettled = (ticks_to_sqrtPriceX96(ticks) > flat) | (ticks_to_sqrtPriceX96(np.minimum(ticks + 1, UNI_MAX_TICK)) <= flat)
+    for i in np.flatnonzero(unsettled):
+        ticks[i] = _correct_tick_estimate(int(ticks[i]), int(flat[i]))
+    return ticks.reshape(sqrt_prices.shape)
+
+
+def sqrtPriceX96_to_absolutePrices(sqrt_prices_x96):
+    sqrt_prices = np.asarray(sqrt_prices_x96, dtype=object).astype(np.float64)
+    return (sqrt_prices / Q96) ** 2
+
+
+def sqrtPriceX96_to_adjustedPrices(sqrt_prices_x96, t0_decimals, t1_decimals):
+    return sqrtPriceX96_to_absolutePrices(sqrt_prices_x96) * _decimal_refactor(t0_decimals, t1_decimals)
+
+
+def ticks_to_absolutePrices(ticks):
+    return np.power(10, np.asarray(ticks) * LOG10_TICK_BASE)
+
+
+def ticks_to_adjustedPrices(ticks, t0_decimals, t1_decimals):
+    return ticks_to_absolutePrices(ticks) * _decimal_refactor(t0_decimals, t1_decimals)
+
+
+def absolutePrices_to_ticks(absolutePrices):
+    return np.log10(np.asarray(absolutePrices, dtype=np.float64)) / LOG10_TICK_BASE
+
+
+def adjustedPrices_to_ticks(adjustedPrices, t0_decimals, t1_decimals):
+    absolutePrices = np.asarray(adjustedPrices, dtype=np.float64) / _decimal_refactor(t0_decimals, t1_decimals)
+    return absolutePrices_to_ticks(absolutePrices)
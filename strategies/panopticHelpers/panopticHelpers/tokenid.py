@@ -0,0 +1,365 @@
+import numpy as np
+
+from .constants import (
+    UNI_MIN_TICK,
+    UNI_MAX_TICK
+)
+
+# TokenId layout (TokenIdLibrary): bits 0-63 hold the poolId (48 bits of the Uniswap pool address plus
+# the tick spacing in bits 48-63), followed by four 48-bit legs starting at bit 64.
+POOL_ID_BITS = 64
+LEG_BITS = 48
+MAX_LEGS = 4
+# (name, offset within the leg, width in bits)
+LEG_FIELDS = (
+    ("asset", 0, 1),
+    ("option_ratio", 1, 7),
+    ("is_long", 8, 1),
+    ("token_type", 9, 1),
+    ("risk_partner", 10, 2),
+    ("strike", 12, 24),
+    ("width", 36, 12),
+)
+
+LEG_DTYPE = np.dtype([
+    ("asset", np.uint8),
+    ("option_ratio", np.uint8),
+    ("is_long", np.uint8),
+    ("token_type", np.uint8),
+    ("risk_partner", np.uint8),
+    ("strike", np.int32),
+    ("width", np.int32),
+])
+
+# InvalidTokenIdParameter codes raised by TokenIdLibrary.validate
+INVALID_LEG_STRUCTURE = 1
+INVALID_RISK_PARTNER = 3
+INVALID_STRIKE = 4
+# Partnered legs that are a synthetic (isLong and tokenType both differ) or a long strangle/straddle
+# (both long, tokenTypes differ); the library reverts with the same code as an invalid strike.
+INVALID_PARTNER_TYPES = 4
+INVALID_WIDTH = 5
+
+_UINT256_BYTES = 32
+# Legs are read as 32-bit windows, so pad past the end of the uint256 for the last leg's width field.
+_PADDED_BYTES = 40
+
+
+def _to_int(token_id):
+    if isinstance(token_id, str):
+        return int(token_id, 0)
+    return int(token_id)
+
+
+class TokenIdCodec:
+    """
+    Local, vectorized equivalent of TokenIdLibrary / PanopticHelper.unwrapTokenId.
+
+    Decoding returns a (n, 4) structured array with LEG_DTYPE; unused legs are all zero and can be
+    masked with `legs['option_ratio'] > 0`. TokenIds may be ints, decimal strings or hex strings.
+    """
+
+    @staticmethod
+    def pool_id(univ3pool, tick_spacing):
+        """Same value as SemiFungiblePositionManager.getPoolId for a pool with the given tick spacing."""
+        return ((int(univ3pool, 16) >> 112) & ((1 << 48) - 1)) + ((int(tick_spacing) & 0xFFFF) << 48)
+
+    @staticmethod
+    def _as_bytes(token_ids):
+        ints = [_to_int(t) for t in token_ids]
+        if any(t < 0 or t >> 256 for t in ints):
+            raise ValueError("TokenIds must be uint256 values")
+        padding = bytes(_PADDED_BYTES - _UINT256_BYTES)
+        raw = b"".join(t.to_bytes(_UINT256_BYTES, "little") + padding for t in ints)
+        return np.frombuffer(raw, dtype=np.uint8).reshape(len(ints), _PADDED_BYTES)
+
+    @staticmethod
+    def _field(raw, bit_offset, bits):
+        start = bit_offset // 8
+        window = (
+            raw[:, start].astype(np.uint64)
+            | (raw[:, start + 1].astype(np.uint64) << np.uint64(8))
+            | (raw[:, start + 2].astype(np.uint64) << np.uint64(16))
+            | (raw[:, start + 3].astype(np.uint64) << np.uint64(24))
+        )
+        return (window >> np.uint64(bit_offset % 8)) & np.uint64((1 << bits) - 1)
+
+    @classmethod
+    def decode(cls, token_ids):
+        """Returns (pool_ids as uint64 array, legs as an (n, 4) LEG_DTYPE array)."""
+        raw = cls._as_bytes(token_ids)
+        n = raw.shape[0]
+        pool_ids = raw[:, :8].copy().view("<u8").reshape(n)
+        legs = np.zeros((n, MAX_LEGS), dtype=LEG_DTYPE)
+        for leg in range(MAX_LEGS):
+            base = POOL_ID_BITS + LEG_BITS * leg
+            for name, offset, bits in LEG_FIELDS:
+                values = cls._field(raw, base + offset, bits).astype(np.int64)
+                if name == "strike":
+                    values = np.where(values >= (1 << 23), values - (1 << 24), values)
+                legs[name][:, leg] = values
+        return pool_ids, legs
+
+    @staticmethod
+    def encode(pool_ids, legs):
+        """Inverse of decode; mirrors TokenIdLibrary.addPoolId / addLeg. Returns a list of Python ints."""
+        legs = np.asarray(legs, dtype=LEG_DTYPE).reshape(-1, MAX_LEGS)
+        token_ids = np.array([int(p) for p in np.asarray(pool_ids).reshape(-1)], dtype=object)
+        if token_ids.shape[0] != legs.shape[0]:
+            raise ValueError("pool_ids and legs must describe the same number of tokenIds")
+        for leg in range(MAX_LEGS):
+            base = POOL_ID_BITS + LEG_BITS * leg
+            for name, offset, bits in LEG_FIELDS:
+                values = legs[name][:, leg].astype(np.int64)
+                if name == "strike":
+                    if np.any((values < -(1 << (bits - 1))) | (values >= 1 << (bits - 1))):
+                        raise ValueError(f"strike does not fit in a signed {bits}-bit integer")
+                elif np.any(values >> bits != 0):
+                    raise ValueError(f"{name} does not fit in {bits} bits")
+                masked = values & ((1 << bits) - 1)
+                token_ids = token_ids | (masked.astype(object) << (base + offset))
+        return [int(t) for t in token_ids]
+
+    @staticmethod
+    def tick_spacing(pool_ids):
+        return (np.asarray(pool_ids, dtype=np.uint64) >> np.uint64(48)).astype(np.int64)
+
+    @staticmethod
+    def num_legs(legs):
+        return np.count_nonzero(legs["option_ratio"] > 0, axis=-1)
+
+    @staticmethod
+    def leg_tick_ranges(legs, tick_spacing):
+        """(lower, upper) ticks of every leg, as in TokenIdLibrary.asTicks; tick_spacing broadcasts per tokenId."""
+        spacing = np.asarray(tick_spacing, dtype=np.int64)
+        if spacing.ndim == 1:
+            spacing = spacing[:, None]
+        range_down = (legs["width"].astype(np.int64) * spacing) // 2
+        range_up = -((-legs["width"].astype(np.int64) * spacing) // 2)
+        strike = legs["strike"].astype(np.int64)
+        return strike - range_down, strike + range_up
+
+    @classmethod
+    def legs_overlap(cls, legs, tick_spacing, lower_tick, upper_tick):
+        """
+        Per-tokenId flag: every active leg's range overlaps [lower_tick, upper_tick].
+        One vectorized pass over all positions.
+        """
+        lower, upper = cls.leg_tick_ranges(legs, tick_spacing)
+        active = legs["option_ratio"] > 0
+        overlaps = (lower <= upper_tick) & (upper >= lower_tick)
+        return np.all(overlaps | ~active, axis=-1)
+
+    @classmethod
+    def validate(cls, token_ids):
+        """
+        Vectorized TokenIdLibrary.validate. Returns an int array with 0 for valid tokenIds and the
+        InvalidTokenIdParameter code otherwise.
+        """
+        _, legs = cls.decode(token_ids)
+        n = legs.shape[0]
+        errors = np.zeros(n, dtype=np.int64)
+
+        def flag(mask, code):
+            errors[(errors == 0) & mask] = code
+
+        ratio = legs["option_ratio"]
+        active = ratio > 0
+        flag(~active[:, 0], INVALID_LEG_STRUCTURE)
+        # Once a leg is empty, every later leg must be entirely zero.
+        leg_words = np.stack([
+            np.any(np.stack([legs[name][:, leg] != 0 for name, _, _ in LEG_FIELDS]), axis=0)
+            for leg in range(MAX_LEGS)
+        ], axis=1)
+        seen_empty = np.logical_or.accumulate(~active, axis=1)
+        flag(np.any(seen_empty & leg_words, axis=1), INVALID_LEG_STRUCTURE)
+
+        flag(np.any(active & (legs["width"] == 0), axis=1), INVALID_WIDTH)
+        flag(np.any(active & ((legs["strike"] == UNI_MIN_TICK) | (legs["strike"] == UNI_MAX_TICK)), axis=1), INVALID_STRIKE)
+
+        rows = np.arange(n)[:, None]
+        partner = legs["risk_partner"].astype(np.int64)
+        partner_of_partner = legs["risk_partner"][rows, partner]
+        own = np.arange(MAX_LEGS)[None, :]
+        paired = active & (partner != own)
+        bad_partner = (
+            (partner_of_partner != own)
+            | (legs["asset"][rows, partner] != legs["asset"])
+            | (ratio[rows, partner] != ratio)
+        )
+        flag(np.any(paired & bad_partner, axis=1), INVALID_RISK_PARTNER)
+        is_long = legs["is_long"]
+        different_types = legs["token_type"][rows, partner] != legs["token_type"]
+        bad_types = different_types & ((is_long[rows, partner] != is_long) | (is_long == 1))
+        flag(np.any(paired & bad_types, axis=1), INVALID_PARTNER_TYPES)
+        return errors
+
+    @classmethod
+    def validate_one(cls, token_id):
+        code = int(cls.validate([token_id])[0])
+        if code:
+            raise ValueError(f"InvalidTokenIdParameter({code}) for tokenId {token_id}")
+
+    @staticmethod
+    def leg_info(pool_id, legs_row):
+        """Per-leg dicts shaped like the options/unwrapTokenId legInfo entries (without UniswapV3Pool)."""
+        return [
+            {
+                "poolId": str(int(pool_id)),
+                "asset": str(int(leg["asset"])),
+                "optionRatio": str(int(leg["option_ratio"])),
+                "tokenType": str(int(leg["token_type"])),
+                "isLong": str(int(leg["is_long"])),
+                "riskPartner": str(int(leg["risk_partner"])),
+                "strike": int(leg["strike"]),
+                "width": int(leg["width"]),
+            }
+            for leg in legs_row if leg["option_ratio"] > 0
+        ]
+
+
+def _call(asset):
+    return asset
+
+
+def _put(asset):
+    return 1 - asset
+
+
+# Leg layout of every PanopticHelper create* builder; mirrors STRATEGY_SHAPES in
+# src/connectors/panoptic/panoptic.tokenid.ts. Each leg is
+# (leg_index, option_ratio, asset, is_long, token_type, risk_partner, strike, width).
+# Parameters may be scalars or NumPy arrays, which is how ladders are built in one pass.
+STRATEGY_SHAPES = {
+    "createCallSpread": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], 1, _call(p["asset"]), p["start"] + 1, p["strikeLong"], p["width"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], 0, _call(p["asset"]), p["start"], p["strikeShort"], p["width"]),
+    ],
+    "createPutSpread": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], 1, _put(p["asset"]), p["start"] + 1, p["strikeLong"], p["width"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], 0, _put(p["asset"]), p["start"], p["strikeShort"], p["width"]),
+    ],
+    "createCallDiagonalSpread": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], 1, _call(p["asset"]), p["start"] + 1, p["strikeLong"], p["widthLong"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], 0, _call(p["asset"]), p["start"], p["strikeShort"], p["widthShort"]),
+    ],
+    "createPutDiagonalSpread": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], 1, _put(p["asset"]), p["start"] + 1, p["strikeLong"], p["widthLong"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], 0, _put(p["asset"]), p["start"], p["strikeShort"], p["widthShort"]),
+    ],
+    "createCallCalendarSpread": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], 1, _call(p["asset"]), p["start"] + 1, p["strike"], p["widthLong"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], 0, _call(p["asset"]), p["start"], p["strike"], p["widthShort"]),
+    ],
+    "createPutCalendarSpread": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], 1, _put(p["asset"]), p["start"] + 1, p["strike"], p["widthLong"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], 0, _put(p["asset"]), p["start"], p["strike"], p["widthShort"]),
+    ],
+    "createCallRatioSpread": lambda p: [
+        (p["start"], 1, p["asset"], 1, _call(p["asset"]), p["start"], p["longStrike"], p["width"]),
+        (p["start"] + 1, p["ratio"], p["asset"], 0, _call(p["asset"]), p["start"] + 1, p["shortStrike"], p["width"]),
+    ],
+    "createPutRatioSpread": lambda p: [
+        (p["start"], 1, p["asset"], 1, _put(p["asset"]), p["start"], p["longStrike"], p["width"]),
+        (p["start"] + 1, p["ratio"], p["asset"], 0, _put(p["asset"]), p["start"] + 1, p["shortStrike"], p["width"]),
+    ],
+    "createCallZEBRASpread": lambda p: [
+        (p["start"], p["ratio"], p["asset"], 1, _call(p["asset"]), p["start"], p["longStrike"], p["width"]),
+        (p["start"] + 1, 1, p["asset"], 0, _call(p["asset"]), p["start"] + 1, p["shortStrike"], p["width"]),
+    ],
+    "createPutZEBRASpread": lambda p: [
+        (p["start"], p["ratio"], p["asset"], 1, _put(p["asset"]), p["start"], p["longStrike"], p["width"]),
+        (p["start"] + 1, 1, p["asset"], 0, _put(p["asset"]), p["start"] + 1, p["shortStrike"], p["width"]),
+    ],
+    "createZEEHBS": lambda p: [
+        (0, p["ratio"], p["asset"], 1, _call(p["asset"]), 0, p["longStrike"], p["width"]),
+        (1, 1, p["asset"], 0, _call(p["asset"]), 1, p["shortStrike"], p["width"]),
+        (2, p["ratio"], p["asset"], 1, _put(p["asset"]), 2, p["longStrike"], p["width"]),
+        (3, 1, p["asset"], 0, _put(p["asset"]), 3, p["shortStrike"], p["width"]),
+    ],
+    "createStraddle": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], p["isLong"], _call(p["asset"]), p["start"] + 1, p["strike"], p["width"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], p["isLong"], _put(p["asset"]), p["start"], p["strike"], p["width"]),
+    ],
+    "createStrangle": lambda p: [
+        (p["start"], p["optionRatio"], p["asset"], p["isLong"], _call(p["asset"]), p["start"] + 1, p["callStrike"], p["width"]),
+        (p["start"] + 1, p["optionRatio"], p["asset"], p["isLong"], _put(p["asset"]), p["start"], p["putStrike"], p["width"]),
+    ],
+    "createIronCondor": lambda p: [
+        (0, 1, p["asset"], 0, _call(p["asset"]), 2, p["callStrike"], p["width"]),
+        (1, 1, p["asset"], 0, _put(p["asset"]), 3, p["putStrike"], p["width"]),
+        (2, 1, p["asset"], 1, _call(p["asset"]), 0, p["callStrike"] + p["wingWidth"], p["width"]),
+        (3, 1, p["asset"], 1, _put(p["asset"]), 1, p["putStrike"] - p["wingWidth"], p["width"]),
+    ],
+    "createIronButterfly": lambda p: [
+        (0, 1, p["asset"], 0, _call(p["asset"]), 2, p["strike"], p["width"]),
+        (1, 1, p["asset"], 0, _put(p["asset"]), 3, p["strike"], p["width"]),
+        (2, 1, p["asset"], 1, _call(p["asset"]), 0, p["strike"] + p["wingWidth"], p["width"]),
+        (3, 1, p["asset"], 1, _put(p["asset"]), 1, p["strike"] - p["wingWidth"], p["width"]),
+    ],
+    "createJadeLizard": lambda p: [
+        (0, 1, p["asset"], 1, _call(p["asset"]), 1, p["longCallStrike"], p["width"]),
+        (1, 1, p["asset"], 0, _call(p["asset"]), 0, p["shortCallStrike"], p["width"]),
+        (2, 1, p["asset"], 0, _put(p["asset"]), 2, p["shortPutStrike"], p["width"]),
+    ],
+    "createBigLizard": lambda p: [
+        (0, 1, p["asset"], 1, _call(p["asset"]), 0, p["longCallStrike"], p["width"]),
+        (1, 1, p["asset"], 0, _call(p["asset"]), 2, p["straddleStrike"], p["width"]),
+        (2, 1, p["asset"], 0, _put(p["asset"]), 1, p["straddleStrike"], p["width"]),
+    ],
+    "createSuperBull": lambda p: [
+        (0, 1, p["asset"], 1, _call(p["asset"]), 1, p["longCallStrike"], p["width"]),
+        (1, 1, p["asset"], 0, _call(p["asset"]), 0, p["shortCallStrike"], p["width"]),
+        (2, 1, p["asset"], 0, _put(p["asset"]), 2, p["shortPutStrike"], p["width"]),
+    ],
+    "createSuperBear": lambda p: [
+        (0, 1, p["asset"], 1, _put(p["asset"]), 1, p["longPutStrike"], p["width"]),
+        (1, 1, p["asset"], 0, _put(p["asset"]), 0, p["shortPutStrike"], p["width"]),
+        (2, 1, p["asset"], 0, _call(p["asset"]), 2, p["shortCallStrike"], p["width"]),
+    ],
+}
+
+_SHAPE_FIELDS = ("option_ratio", "asset", "is_long", "token_type", "risk_partner", "strike", "width")
+
+
+class TokenIdBuilder:
+    """
+    Builds strategy tokenIds locally from STRATEGY_SHAPES. Single builds are memoized per
+    (pool_id, shape, params); `ladder` builds one tokenId per value of a parameter in one vectorized pass.
+    """
+
+    def __init__(self, max_cache_size=10_000):
+        self.max_cache_size = max_cache_size
+        self._cache = {}
+
+    @staticmethod
+    def _legs(shape, params, n):
+        if shape not in STRATEGY_SHAPES:
+            raise ValueError(f"Unknown strategy shape: {shape}")
+        legs = np.zeros((n, MAX_LEGS), dtype=LEG_DTYPE)
+        for leg_index, *values in STRATEGY_SHAPES[shape](params):
+            for name, value in zip(_SHAPE_FIELDS, values):
+                legs[name][:, int(leg_index)] = value
+        return legs
+
+    def build(self, pool_id, shape, **params):
+        key = (int(pool_id), shape, tuple(sorted((k, int(v)) for k, v in params.items())))
+        token_id = self._cache.get(key)
+        if token_id is None:
+            legs = self._legs(shape, {k: int(v) for k, v in params.items()}, 1)
+            token_id = TokenIdCodec.encode([pool_id], legs)[0]
+            if len(self._cache) >= self.max_cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = token_id
+        return token_id
+
+    def ladder(self, pool_id, shape, param, values, **params):
+        """One tokenId per entry of `values` for `param` (e.g. straddles across a strike grid)."""
+        values = np.asarray(values, dtype=np.int64)
+        legs = self._legs(shape, {**{k: int(v) for k, v in params.items()}, param: values}, len(values))
+        return TokenIdCodec.encode(np.full(len(values), int(pool_id), dtype=np.uint64), legs)
+
+    def matches(self, shape, token_id, **params):
+        """True when the local build reproduces a tokenId returned by the on-chain builder."""
+        pool_ids, _ = TokenIdCodec.decode([token_id])
+        return self.build(int(pool_ids[0]), shape, **params) == _to_int(token_id)
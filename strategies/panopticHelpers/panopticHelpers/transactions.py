@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from .client import LatencyHistogram
+
+# Tracks submitted transactions through options/pollTransactions: one batched receipt lookup per new
+# block covers every pending hash, instead of one /network/poll loop per transaction.
+
+FINAL_STATUSES = ("confirmed", "reverted", "replaced")
+
+
+class TransactionTracker:
+    """
+    Resolves one asyncio future per transaction hash. A single background task long-polls the gateway
+    (which answers once a block newer than the last one seen arrives) for all hashes still pending.
+
+    Futures resolve with the gateway's status dict once a transaction is confirmed with at least
+    `confirmations` blocks, reverted, or replaced by another transaction with the same nonce; they
+    raise asyncio.TimeoutError after `timeout_s`. Time from `track` to resolution is recorded per final
+    status and reported by `latency_report`.
+    """
+
+    def __init__(self, client, confirmations=1, timeout_s=600.0, block_wait_ms=15_000, retry_delay_s=2.0):
+        self.client = client
+        self.confirmations = confirmations
+        self.timeout_s = timeout_s
+        self.block_wait_ms = block_wait_ms
+        self.retry_delay_s = retry_delay_s
+        self.latency = {}
+        self.block_number = None
+        self._pending = {}  # tx hash -> (future, start, deadline)
+        self.last_error = None  # exception of the latest failed poll, cleared by the next successful one
+        self._task = None
+
+    def track(self, tx_hash, timeout_s=None):
+        """Future for tx_hash; tracking the same hash twice returns the same future."""
+        if tx_hash in self._pending:
+            return self._pending[tx_hash][0]
+        future = asyncio.get_running_loop().create_future()
+        start = time.monotonic()
+        self._pending[tx_hash] = (future, start, start + (self.timeout_s if timeout_s is None else timeout_s))
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return future
+
+    async def wait(self, tx_hash, timeout_s=None):
+        return await self.track(tx_hash, timeout_s)
+
+    async def wait_all(self, tx_hashes, timeout_s=None, return_exceptions=False):
+        return await asyncio.gather(*(self.track(h, timeout_s) for h in tx_hashes), return_exceptions=return_exceptions)
+
+    def _resolve(self, tx_hash, status=None, error=None):
+        future, start, _ = self._pending.pop(tx_hash)
+        key = status["status"] if status is not None else "timeout"
+        self.latency.setdefault(key, LatencyHistogram()).observe(time.monotonic() - start, error=error is not None)
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(status)
+
+    def _expire(self):
+        now = time.monotonic()
+        for tx_hash, (future, _, deadline) in list(self._pending.items()):
+            if future.cancelled():
+                self._pending.pop(tx_hash)
+            elif now >= deadline:
+                self._resolve(tx_hash, error=asyncio.TimeoutError(f"Transaction {tx_hash} not final after timeout"))
+
+    async def _poll_once(self):
+        response = await self.client.poll_transactions(
+            list(self._pending), afterBlock=self.block_number, timeoutMs=self.block_wait_ms
+        )
+        # Controller errors come back as HTTP 200 with an empty body
+        if not isinstance(response, dict) or "blockNumber" not in response or not isinstance(response.get("transactions"), list):
+            raise ValueError(f"Unexpected pollTransactions response: {response}")
+        self.block_number = response["blockNumber"]
+        for status in response["transactions"]:
+            tx_hash = status.get("txHash")
+            if tx_hash not in self._pending or status.get("status") not in FINAL_STATUSES:
+                continue
+            if status["status"] == "confirmed" and status.get("confirmations", 0) < self.confirmations:
+                continue
+            self._resolve(tx_hash, status)
+
+    async def _run(self):
+        # Every failure is retried after retry_delay_s; timeouts are enforced on every iteration, so a
+        # gateway that keeps failing still resolves each future by its deadline.
+        while self._pending:
+            self._expire()
+            if not self._pending:
+                break
+            try:
+                await self._poll_once()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self.last_error = error
+                await asyncio.sleep(self.retry_delay_s)
+
+    def latency_report(self):
+        return {status: histogram.summary() for status, histogram in sorted(self.latency.items())}
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for tx_hash in list(self._pending):
+            self._pending.pop(tx_hash)[0].cancel()
@@ -1,10 +1,10 @@
 # import asyncio
-import bisect
 import numpy as np
 import time
 import asyncio
 
 from .utility.panoptic_helpers import utils as ph
+from panopticHelpers import TickGrid, TokenIdCodec, TokenIdBuilder, PanopticGatewayClient, SpotPlotRenderer, TransactionTracker, plan_rebalance, LegRangeIndex, StayInRangePolicy, AccountSnapshot, required_collateral, screen_candidates, compare_with_check_collateral, CollateralSurface
 
 from hummingbot.client.settings import GatewayConnectionSetting
 # from hummingbot.core.event.events import TradeType
@@ -29,6 +29,8 @@ class TradePanoptions(ScriptStrategyBase):
     markets = {}
     perturbation_testing = True
     verbosity = 1
+    candidate_position_sizes = [1000, 500, 250, 100] # largest first; screened locally before each mint
+    stress_ticks = 10 # tick spacings either side of the spot tick the account must stay solvent over
 
 
     # internal state variables and methods
@@ -36,6 +38,13 @@ class TradePanoptions(ScriptStrategyBase):
     initialized = False # Have all the initialization steps completed?
     ready = True # Are all on-chain tasks complete and you're ready to process another one?
     tick_count = 0
+    pool_id = None # poolId of the Panoptic pool, learned from the first gateway-built tokenId
+    local_straddles = False # Has the local tokenId builder been checked against the gateway?
+    token_builder = TokenIdBuilder()
+    spot_renderer = None # Rolling spot plot, rendered off the strategy loop
+    spot_updates = 0 # Spot price updates received from the stream
+    render_every_updates = 10 # Re-render the spot plot once per this many updates
+    price_updated = None # Set by the spot price stream whenever the pool price moves
 
     # executed each tick (configure tick size in Hummingbot client before launching strategy)
     def on_tick(self):
@@ -50,70 +59,57 @@ class TradePanoptions(ScriptStrategyBase):
             self.launched = True
             safe_ensure_future(self.initialize())
 
-        # repeat each tick
-        if (self.initialized and self.ready):
+        # repeat on ticks where the streamed spot price has moved
+        if (self.initialized and self.ready and self.price_updated.is_set()):
+            self.price_updated.clear()
             # Tricky because the 'safe_ensure_future' bit immediately returns the contained logic as being complete.
             # It won't wait for the processes inside to finish before allowing tick to tok. Can try to get around
             # this by using flags, but that feels clunky.
             self.ready=False
             safe_ensure_future(self.monitor_and_apply_logic())
 
+    def on_stop(self):
+        # Let the last render finish and release the plot worker and the gateway client's sessions
+        if self.spot_renderer is not None:
+            self.spot_renderer.close()
+            self.spot_renderer = None
+        if getattr(self, "client", None) is not None:
+            safe_ensure_future(self.client.close())
+
     # async task since we are using Gateway
     async def monitor_and_apply_logic(self):
-        self.log(f"Checking price...", 2)
-        self.log(f"POST /options/getSpotPrice [ connector: {self.connector} ]", 0)
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getSpotPrice",
-            params=self.request_payload,
-            fail_silently=False
-        )
-        self.spot_price=response['spotPrice']
-        self.log(f"Price: {self.spot_price}", 1)
-        # Convert the spot price to a tick location
-        self.log(f"Converting spot price to tick location...", 2)
-        self.tick_location = ph.adjusted_price_to_tick(self.spot_price, self.request_payload["token0Decimals"], self.request_payload["token1Decimals"])
+        # The spot price and tick location are kept current by watch_spot_price.
+        self.log(f"Checking open positions...", 2)
+        self.log(f"POST /options/positionBook [ connector: {self.connector} ]", 0)
+        positions_response = await self.client.position_book(self.request_payload["panopticPool"])
         self.request_payload.update({
             "atTick": int(np.floor(self.tick_location))
         })
-        self.log(f"Current spot price tick location: {self.tick_location}", 1)
-
-        # Save the spot price and tick location to a log file
-        self.log(f"Logging spot data...", 2)
-        spot_log_path = "logs/spot_data.dat"
-        ph.log_spot_data(spot_log_path, self.request_payload['uniswapV3PoolAddress'], self.spot_price, self.tick_location)
-        # if self.tick_count % 10 == 0:
-            # ph.generate_spot_plot(spot_log_path)
 
         self.log(f"Finding relevant Uniswap pool tick locations...", 2)
-        lower_idx = bisect.bisect_right(self.tick_locations, self.tick_location) - 1
-        upper_idx = lower_idx + 1
-        lower_tick = self.tick_locations[lower_idx] if lower_idx >= 0 else None
-        upper_tick = self.tick_locations[upper_idx] if upper_idx < len(self.tick_locations) else None
+        lower_tick, upper_tick = self.tick_grid.bracket(self.tick_location)
         self.log(f"Lower tick: {lower_tick}", 2)
         self.log(f"Upper tick: {upper_tick}", 2)
 
-        self.log(f"Checking queryPositions...", 2)
-        self.log(f"POST /options/queryPositions [ connector: {self.connector} ]", 0)
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/queryPositions",
-            params=self.request_payload,
-            fail_silently=False
-        )
-        self.open_positions = response['openPositionIdList']
+        self.open_positions = positions_response['positionIdList']
+        if positions_response.get('reconciliation', {}).get('missingFromBook'):
+            self.log(f"Subgraph reports positions missing from the position book: {positions_response['reconciliation']}", 1)
         self.log(f"Open position list: {self.open_positions}", 2)
+        if self.open_positions:
+            # checkCollateral across the whole tick grid in one request, read at a single block
+            self.log(f"POST /options/collateralSurface [ connector: {self.connector} ]", 0)
+            surface = CollateralSurface.from_response(await self.client.collateral_surface(
+                self.request_payload["panopticPool"], positionIdList=self.open_positions
+            ))
+            self.log(f"Liquidation ticks: below {surface.liquidation_tick_down}, above {surface.liquidation_tick_up} (current {surface.current_tick})", 1)
+            self.log(f"Ticks to nearest liquidation: {surface.distance_to_liquidation()}", 2)
 
         # Define position of interest
         self.request_payload.update(
             {
                 "panopticPool": self.request_payload["panopticPoolAddress"], #redundant
-                "width": ph.timescale_to_width("1D", self.tickSpacing),
-                "strike": ph.get_valid_tick(int(np.floor(self.tick_location)), self.tickSpacing, self.tickSpacing*ph.timescale_to_width("1D", self.tickSpacing)),
-                "asset": 0,
-                "isLong": 0,
-                "optionRatio": 1,
-                "start": 0,
+                # Same width and strike choice as the offline backtest (panopticHelpers.run_backtest)
+                **self.policy.straddle_params(self.tick_location),
             }
         )
         self.log(f"Tick spacing: {self.tickSpacing}", 2)
@@ -123,54 +119,20 @@ class TradePanoptions(ScriptStrategyBase):
         bad_positions = []
         if len(self.open_positions)>0:
             self.log(f"Checking validity of open positions...", 2)
-            for idx, position in enumerate(self.open_positions):
-                outOfRange = False
-                self.request_payload["tokenId"] = position
-                self.log(f"Position: {self.request_payload['tokenId']}", 2)
-                response = await GatewayHttpClient.get_instance().api_request(
-                    method="post",
-                    path_url="options/unwrapTokenId",
-                    params=self.request_payload,
-                    fail_silently=False
-                )
-                self.log(f"Legs in position: {response['numberOfLegs']}", 2)
-                for legIdx in range(response['numberOfLegs']):
-                    strike = response['legInfo'][legIdx]['strike']
-                    width = response['legInfo'][legIdx]['width']
-                    legTickWidth = self.tickSpacing * width
-                    legStrikeHigh = strike + (legTickWidth/2)
-                    legStrikeLow = strike - (legTickWidth/2)
-                    if lower_tick is not None and upper_tick is not None:
-                        if (legStrikeLow <= upper_tick and legStrikeHigh >= lower_tick):
-                            self.log(f"      |-> The range overlaps with the Uniswap pool tick range.", 2)
-                            legInRange = True
-                        else:
-                            self.log(f"      |-> The range does not overlap with the Uniswap pool tick range.", 2)
-                            legInRange = False
-                            outOfRange = True
-                    else:
-                        self.log(f"      |-> Unable to determine overlap due to missing tick information.", 2)
-
-                    self.log(f"      |-> leg #: {(legIdx+1)}", 2)
-                    self.log(f"      |-> asset: {response['legInfo'][legIdx]['asset']}", 2)
-                    self.log(f"      |-> isLong: {response['legInfo'][legIdx]['isLong']}", 2)
-                    self.log(f"      |-> tokenType: {response['legInfo'][legIdx]['tokenType']}", 2)
-                    self.log(f"      |-> strike: {strike}", 2)
-                    self.log(f"      |-> width: {width}", 2)
-                    self.log(f"      |-> strikeTickLow: {legStrikeLow}", 2)
-                    self.log(f"      |-> strikeTickHigh: {legStrikeHigh}", 2)
-                    self.log(f"      |-> position leg in range: {legInRange}", 2)
-                if outOfRange is True:
-                    bad_positions.append(idx)
+            # Only positions minted or burned since the last check are decoded, and only legs whose range
+            # boundary the price crossed are reported.
+            self.leg_index.sync(self.open_positions)
+            for crossing in self.leg_index.move(self.tick_location):
+                strikeTickLow, strikeTickHigh = self.leg_index.range_of(crossing.token_id, crossing.leg_index)
+                self.log(f"Position: {hex(crossing.token_id)}", 2)
+                self.log(f"      |-> leg #: {(crossing.leg_index+1)}", 2)
+                self.log(f"      |-> {'entered' if crossing.entered else 'left'} [{strikeTickLow}, {strikeTickHigh}] at tick {crossing.boundary}", 2)
+            bad_positions = self.leg_index.positions_out_of_range(self.tick_location)
+            self.log(f"Positions with legs out of range: {len(bad_positions)} of {len(self.open_positions)}", 2)
         else:
             self.log("No open positions found. Minting new position in-range...", 1)
-            response = await GatewayHttpClient.get_instance().api_request(
-                method="post",
-                path_url="options/createStraddle",
-                params=self.request_payload,
-                fail_silently=False
-            )
-            self.log(f"Creating Straddle: {response['tokenId']}", 2)
+            straddle_token_id = await self.build_straddle_token_id()
+            self.log(f"Creating Straddle: {straddle_token_id}", 2)
             self.log(f"      |-> UniV3 Pool: {self.request_payload['univ3pool']}", 2)
             self.log(f"      |-> width: {self.request_payload['width']}", 2)
             self.log(f"      |-> strike: {self.request_payload['strike']}", 2)
@@ -178,20 +140,29 @@ class TradePanoptions(ScriptStrategyBase):
             self.log(f"      |-> isLong: {self.request_payload['isLong']}", 2)
             self.log(f"      |-> optionRatio: {self.request_payload['optionRatio']}", 2)
             self.log(f"      |-> start: {self.request_payload['start']}", 2)
-            new_position = hex(int(response['tokenId']))
+            new_position = hex(straddle_token_id)
             self.log(f"Hex token ID: {new_position}", 1)
 
+            # Margin every candidate size at every stress tick locally; only the chosen one goes on-chain.
+            position_size, utilization0, utilization1 = await self.screen_position_size(straddle_token_id)
+            if position_size is None:
+                self.log("No candidate size stays solvent over the stress ticks; not minting.", 1)
+                self.ready=True
+                return
+            self.log(f"Largest solvent size by the local margin model: {position_size}", 2)
+
             self.open_positions.append(new_position)
             self.request_payload.update({
                 "panopticPool": self.request_payload["panopticPoolAddress"], #redundant
                 "positionIdList": self.open_positions,
-                "positionSize": "1" + "0" * 3,
+                "positionSize": str(position_size),
                 "effectiveLiquidityLimit": 0,
+                "waitForReceipt": False, # the gateway returns the txHash once sent; the tracker follows it
             })
 
             self.log(f"Checking collateral...", 2)
             self.log(f"POST /options/checkCollateral [ connector: {self.connector} ]", 0)
-            closest_tick = min(self.tick_locations, key=lambda x: abs(x - self.tick_location))
+            closest_tick = self.tick_grid.nearest(self.tick_location)
             self.request_payload.update({
                 "atTick": closest_tick
             })
@@ -213,6 +184,9 @@ class TradePanoptions(ScriptStrategyBase):
             self.log(f"Required collateral token0: {self.required_collateral_token0}", 2)
             self.log(f"Collateral balance token1: {self.collateral_balance_token1}", 2)
             self.log(f"Required collateral token1: {self.required_collateral_token1}", 2)
+            local0, local1 = required_collateral([straddle_token_id], [position_size], closest_tick, utilization0, utilization1)
+            comparison = compare_with_check_collateral(response, local0[0], local1[0])
+            self.log(f"Local margin model vs checkCollateral: {comparison}", 1 if comparison["within_tolerance"] else 0)
 
             tradeData = await GatewayHttpClient.get_instance().api_request(
                 method="post",
@@ -222,44 +196,42 @@ class TradePanoptions(ScriptStrategyBase):
             )
             self.log(f"mint submitted... tradeData: {tradeData}", 1)
             # poll for swap result and print resulting balances
-            await self.poll_transaction(self.chain, self.network, tradeData['txHash'])
-
-        for badPosition in bad_positions:
-            burnPosition = self.open_positions[badPosition]
-            self.log(f"Minting new position to replace: {burnPosition}", 1)
-
-            response = await GatewayHttpClient.get_instance().api_request(
-                method="post",
-                path_url="options/createStraddle",
-                params=self.request_payload,
-                fail_silently=False
+            await self.await_transaction(tradeData['txHash'])
+
+        if bad_positions:
+            burnPositions = bad_positions
+            self.log(f"Replacing {len(burnPositions)} out-of-range positions: {[hex(p) for p in burnPositions]}", 1)
+            # Every replacement is the in-range straddle; mint it once unless it is already held.
+            new_position = hex(await self.build_straddle_token_id())
+            kept = set(self.leg_index.token_ids) - set(burnPositions)
+            new_positions = [] if int(new_position, 16) in kept else [new_position]
+            self.log(f"Hex token IDs of new positions: {new_positions}", 1)
+
+            # Screen the replacement against the positions that survive the burns; if no candidate size
+            # stays solvent, the rebalance only burns.
+            position_size = 0
+            if new_positions:
+                position_size, _, _ = await self.screen_position_size(int(new_position, 16), exclude=burnPositions)
+                if position_size is None:
+                    self.log("No candidate size stays solvent over the stress ticks; burning without replacement.", 1)
+                    new_positions, position_size = [], 0
+                else:
+                    self.log(f"Largest solvent replacement size by the local margin model: {position_size}", 2)
+
+            # All burns and mints go out in one multicall, so the account is never half-rebalanced.
+            plan = plan_rebalance(self.open_positions, burnPositions, new_positions, position_size)
+            tradeData = await self.client.rebalance(
+                self.request_payload["panopticPoolAddress"], plan, waitForReceipt=False
             )
-            new_position = hex(int(response['tokenId']))
-            self.log(f"Hex token ID of new position: {new_position}", 1)
-
-            # TODO check collateral - skipping that for now
-
-            newPositionList = [p for p in self.open_positions if p != burnPosition]
-            self.request_payload.update({
-                "burnTokenId": burnPosition,
-                "postburnPositionIdList": newPositionList,
-                "mintTokenId": new_position,
-                "positionSize": "1" + "0" * 3,
-                "effectiveLiquidityLimit": 0
-            })
-
-            # Check collateral, liquidity, forceExercise vs deposit to close.
-            # Get token0, token1 holdings
-            # Get availabile liquidiy in token0, token1
-
-            tradeData = await GatewayHttpClient.get_instance().api_request(
-                method="post",
-                path_url="options/burnAndMint",
-                params=self.request_payload,
-                fail_silently=False
-            )
-            self.log(f"burnAndMint submitted... tradeData: {tradeData}", 2)
-            await self.poll_transaction(self.chain, self.network, tradeData['txHash'])
+            self.log(f"rebalance submitted... tradeData: {tradeData}", 2)
+            result = await self.await_transaction(tradeData['txHash'])
+            if result is not None and result["status"] == "confirmed":
+                self.open_positions = [hex(p) for p in plan.final_position_id_list]
+            else:
+                # Reverted, replaced, failed or timed out: the plan may not have been applied on-chain
+                self.log("Rebalance not confirmed; reloading open positions from the position book.", 1)
+                positions_response = await self.client.position_book(self.request_payload["panopticPool"])
+                self.open_positions = positions_response['positionIdList']
         self.ready=True
 
     async def initialize(self):
@@ -281,37 +253,23 @@ class TradePanoptions(ScriptStrategyBase):
             "address": self.address
         }
 
+        self.client = PanopticGatewayClient.from_gateway(GatewayHttpClient.get_instance(), self.request_payload)
+        self.tx_tracker = TransactionTracker(self.client)
+
         self.log(f"Getting token addresses...", 2)
         self.log(f"POST /options/getTokenAddress [ connector: {self.connector}]", 0)
-        self.request_payload["tokenSymbol"]= self.t0_symbol
-        self.log(f"Finding token {self.t0_symbol}", 2)
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getTokenAddress",
-            params=self.request_payload,
-            fail_silently=False
+        self.log(f"Finding tokens {self.t0_symbol}, {self.t1_symbol}", 2)
+        t0_response, t1_response = await self.client.gather(
+            self.client.get_token_address(self.t0_symbol),
+            self.client.get_token_address(self.t1_symbol)
         )
-
         self.request_payload.update({
-            "t0_address": response['tokenAddress'],
-            "token0Decimals": response['tokenDecimals']
+            "t0_address": t0_response['tokenAddress'],
+            "token0Decimals": t0_response['tokenDecimals'],
+            "t1_address": t1_response['tokenAddress'],
+            "token1Decimals": t1_response['tokenDecimals']
         })
         self.log(f"t0 address: {self.request_payload['t0_address']}", 2)
-
-        self.request_payload.update({
-            "tokenSymbol": self.t1_symbol
-        })
-        self.log(f"Finding token {self.t1_symbol}", 2)
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getTokenAddress",
-            params=self.request_payload,
-            fail_silently=False
-        )
-        self.request_payload.update({
-            "t1_address": response['tokenAddress'],
-            "token1Decimals": response['tokenDecimals']
-        })
         self.log(f"t1 address: {self.request_payload['t1_address']}", 2)
 
         self.log(f"Getting UniswapV3 token pool address...", 2)
@@ -358,35 +316,111 @@ class TradePanoptions(ScriptStrategyBase):
             fail_silently=False
         )
         self.tickSpacing=response['tickSpacing']
-        self.tick_locations=response['ticks']
+        self.tick_grid=TickGrid.from_response(response)
+        self.leg_index=LegRangeIndex(self.tickSpacing)
+        self.policy=StayInRangePolicy(self.tickSpacing, "1D")
         self.log(f"Tick spacing: {self.tickSpacing}", 1)
-        self.log(f"Ticks: {self.tick_locations[0:10]}...{self.tick_locations[-10:]}", 2)
+        self.log(f"Ticks: {self.tick_grid}", 2)
 
         self.wallet_address=self.address #redundant
 
+        self.price_updated = asyncio.Event()
+        safe_ensure_future(self.watch_spot_price())
         self.initialized=True
 
-    # continuously poll for transaction until confirmed
-    async def poll_transaction(self, chain, network, txHash):
-        pending: bool = True
-        while pending is True:
-            self.log(f"POST /network/poll [ txHash: {txHash} ]", 0)
-            pollData = await GatewayHttpClient.get_instance().get_transaction_status(
-                chain,
-                network,
-                txHash
-            )
-            transaction_status = pollData.get("txStatus")
-            if transaction_status == 1:
-                self.log(f"Trade with transaction hash {txHash} has been executed successfully.", 1)
-                pending = False
-            elif transaction_status in [-1, 0, 2]:
-                self.log(f"Trade is pending confirmation, Transaction hash: {txHash}", 1)
-                await asyncio.sleep(2)
-            else:
-                self.log(f"Unknown txStatus: {transaction_status}", 1)
-                self.log(f"{pollData}", 2)
-                pending = False
+    # Spot price updates are pushed by the gateway (one per block in which the pool price moved),
+    # so the strategy reacts within a block and makes no calls while the price is idle.
+    async def watch_spot_price(self):
+        self.log(f"POST /options/streamSpotPrice [ connector: {self.connector} ]", 0)
+        async for update in self.client.stream_spot_price(
+            self.request_payload["uniswapV3PoolAddress"],
+            self.request_payload["token0Decimals"],
+            self.request_payload["token1Decimals"]
+        ):
+            self.spot_price = update['spotPrice']
+            self.log(f"Price: {self.spot_price} (block {update['blockNumber']})", 1)
+            # Convert the spot price to a tick location
+            self.log(f"Converting spot price to tick location...", 2)
+            self.tick_location = ph.adjusted_price_to_tick(self.spot_price, self.request_payload["token0Decimals"], self.request_payload["token1Decimals"])
+            self.log(f"Current spot price tick location: {self.tick_location}", 1)
+
+            # Save the spot price and tick location to a log file
+            self.log(f"Logging spot data...", 2)
+            spot_log_path = "logs/spot_data.spot"
+            ph.log_spot_data(spot_log_path, self.request_payload['uniswapV3PoolAddress'], self.spot_price, self.tick_location)
+            if self.spot_renderer is None:
+                self.spot_renderer = SpotPlotRenderer(window=10_000, pool_id=self.request_payload['uniswapV3PoolAddress'])
+            self.spot_renderer.append(time.time_ns(), self.spot_price, self.tick_location)
+            self.spot_updates += 1
+            if self.spot_updates % self.render_every_updates == 0:
+                self.spot_renderer.render_async("logs/spot_data_spot.png")
+            self.price_updated.set()
+
+    # The first straddle comes from options/createStraddle; if the local builder reproduces it, later
+    # straddles are bit-packed locally with no gateway or RPC round trip.
+    async def build_straddle_token_id(self):
+        params = {key: self.request_payload[key] for key in ("width", "strike", "asset", "isLong", "optionRatio", "start")}
+        if self.pool_id is not None and self.local_straddles:
+            return self.token_builder.build(self.pool_id, "createStraddle", **params)
+        response = await self.client.create_straddle(self.request_payload["univ3pool"], **params)
+        token_id = int(response['tokenId'])
+        if self.pool_id is None:
+            self.pool_id = int(TokenIdCodec.decode([token_id])[0][0])
+            self.local_straddles = self.token_builder.matches("createStraddle", token_id, **params)
+            self.log(f"Local straddle builder matches gateway: {self.local_straddles}", 2)
+        return token_id
+
+    async def screen_position_size(self, token_id, exclude=()):
+        """
+        Largest of candidate_position_sizes for which the local margin model keeps the account solvent
+        at every tick within stress_ticks spacings of the spot tick, with the current pool utilizations.
+        Open positions come from the position book (self.open_positions), less any in `exclude`.
+        Returns (size or None, utilization0, utilization1).
+        """
+        # The position book lists decimal tokenIds, local mints are hex; int(..., 0) reads both
+        excluded = {int(p, 0) if isinstance(p, str) else int(p) for p in exclude}
+        position_ids = [p for p in self.open_positions if int(p, 0) not in excluded]
+        self.log(f"POST /options/accountSnapshot [ connector: {self.connector} ]", 0)
+        snapshot = AccountSnapshot.from_response(
+            await self.client.account_snapshot(self.request_payload["panopticPool"], positionIdList=position_ids)
+        )
+        utilization0 = snapshot.collateral0.current_pool_utilization
+        utilization1 = snapshot.collateral1.current_pool_utilization
+        ticks = self.tick_location + self.tickSpacing * np.arange(-self.stress_ticks, self.stress_ticks + 1)
+        # The whole collateral balance backs the kept positions plus the candidate: positions in
+        # `exclude` are left out of the snapshot, so the requirement they held is released.
+        solvent, _, _ = screen_candidates(
+            [token_id] * len(self.candidate_position_sizes),
+            self.candidate_position_sizes,
+            ticks,
+            snapshot.collateral0.collateral_balance,
+            snapshot.collateral1.collateral_balance,
+            utilization0,
+            utilization1,
+            open_ids=snapshot.position_ids,
+            open_sizes=[p.balance for p in snapshot.positions],
+            open_utilization0=[p.pool_utilization0 for p in snapshot.positions],
+            open_utilization1=[p.pool_utilization1 for p in snapshot.positions],
+        )
+        passing = np.flatnonzero(solvent.all(axis=0))
+        size = self.candidate_position_sizes[passing[0]] if len(passing) else None
+        return size, utilization0, utilization1
+
+    # Wait for a transaction through the shared tracker: one batched receipt lookup per block covers
+    # every transaction in flight.
+    async def await_transaction(self, txHash):
+        self.log(f"POST /options/pollTransactions [ txHash: {txHash} ]", 0)
+        try:
+            result = await self.tx_tracker.wait(txHash)
+        except asyncio.TimeoutError:
+            self.log(f"Transaction {txHash} not confirmed before timeout.", 1)
+            return None
+        if result["status"] == "confirmed":
+            self.log(f"Trade with transaction hash {txHash} has been executed successfully.", 1)
+        else:
+            self.log(f"Transaction {txHash} was {result['status']}.", 1)
+            self.log(f"{result}", 2)
+        return result
 
     def log(self, message, triviality):
         if (triviality <= self.verbosity):
@@ -5,6 +5,7 @@ from hummingbot.client.settings import GatewayConnectionSetting
 from hummingbot.core.gateway.gateway_http_client import GatewayHttpClient
 from hummingbot.core.utils.async_utils import safe_ensure_future
 from hummingbot.strategy.script_strategy_base import Decimal, ScriptStrategyBase
+from panopticHelpers import PanopticGatewayClient
 
 
 class TradePanoptions(ScriptStrategyBase):
@@ -45,99 +46,43 @@ class TradePanoptions(ScriptStrategyBase):
             "address": address,
         }
 
-        self.logger().info(f"Checking getCollateralToken0...")
-        self.logger().info(f"POST /options/getCollateralToken0 [ connector: {connector} ]")
-        collateralTracker0 = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getCollateralToken0",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"getCollateralToken0 response: {collateralTracker0}")
+        client = PanopticGatewayClient.from_gateway(GatewayHttpClient.get_instance(), request_payload)
+        panopticPool = request_payload.get("panopticPool")
 
-        self.logger().info(f"Checking getCollateralToken1...")
-        self.logger().info(f"POST /options/getCollateralToken1 [ connector: {connector} ]")
-        collateralTracker1 = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getCollateralToken1",
-            params=request_payload,
-            fail_silently=False
+        self.logger().info(f"Checking getCollateralToken0, getCollateralToken1...")
+        self.logger().info(f"POST /options/getCollateralToken0, /options/getCollateralToken1 [ connector: {connector} ]")
+        collateralTracker0, collateralTracker1 = await client.gather(
+            client.get_collateral_token0(panopticPool),
+            client.get_collateral_token1(panopticPool)
         )
+        self.logger().info(f"getCollateralToken0 response: {collateralTracker0}")
         self.logger().info(f"getCollateralToken1 response: {collateralTracker1}")
 
-        self.logger().info(f"Checking getAsset on token0...")
-        self.logger().info(f"POST /options/getAsset [ connector: {connector} ]")
-        request_payload["collateralTracker"] = collateralTracker0
-        assetToken0 = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getAsset",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"getAsset response: {assetToken0}")
-
-        self.logger().info(f"Checking getAsset on token1...")
-        self.logger().info(f"POST /options/getAsset [ connector: {connector} ]")
-        request_payload["collateralTracker"] = collateralTracker1
-        assetToken1 = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getAsset",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"getAsset response: {assetToken1}")
-
-        request_payload["collateralTracker"] = collateralTracker0
-        self.logger().info(f"Checking maxWithdraw on token0...")
-        self.logger().info(f"POST /options/maxWithdraw [ connector: {connector} ]")
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/maxWithdraw",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"maxWithdraw response: {response}")
-
-        request_payload["collateralTracker"] = collateralTracker1
-        self.logger().info(f"Checking withdrawal limit for token1...")
-        self.logger().info(f"POST /options/maxWithdraw [ connector: {connector} ]")
-        maxWithdraw = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/maxWithdraw",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"maxWithdraw response: {maxWithdraw}")
-
-        self.logger().info(f"Checking numberOfPositions...")
-        self.logger().info(f"POST /options/numberOfPositions [ connector: {connector} ]")
-        numberOfPositions = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/numberOfPositions",
-            params=request_payload,
-            fail_silently=False
+        # Everything below only depends on the collateral trackers, so issue it all at once.
+        self.logger().info(f"Checking getAsset, maxWithdraw, numberOfPositions, queryPositions, getPoolData...")
+        (
+            assetToken0,
+            assetToken1,
+            maxWithdraw0,
+            maxWithdraw1,
+            numberOfPositions,
+            openPositions,
+            data
+        ) = await client.gather(
+            client.get_asset(collateralTracker0),
+            client.get_asset(collateralTracker1),
+            client.max_withdraw(collateralTracker0),
+            client.max_withdraw(collateralTracker1),
+            client.number_of_positions(panopticPool),
+            client.query_positions(panopticPool),
+            client.get_pool_data(collateralTracker0)
         )
+        self.logger().info(f"getAsset response (token0): {assetToken0}")
+        self.logger().info(f"getAsset response (token1): {assetToken1}")
+        self.logger().info(f"maxWithdraw response (token0): {maxWithdraw0}")
+        self.logger().info(f"maxWithdraw response (token1): {maxWithdraw1}")
         self.logger().info(f"numberOfPositions response: {int(numberOfPositions['hex'], 16)}")
-
-        self.logger().info(f"Checking queryPositions...")
-        self.logger().info(f"POST /options/queryPositions [ connector: {connector} ]")
-        openPositions = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/queryPositions",
-            params=request_payload,
-            fail_silently=False
-        )
         self.logger().info(f"queryPositions response: {openPositions}")
-
-        request_payload["collateralTracker"] = collateralTracker0
-        self.logger().info(f"Checking getPoolData...")
-        self.logger().info(f"POST /options/getPoolData [ connector: {connector} ]")
-        data = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/getPoolData",
-            params=request_payload,
-            fail_silently=False
-        )
         # TODO: Convert to ints
         poolAssets = data['poolAssets']['hex']
         insideAMM = data['insideAMM']['hex']
@@ -149,53 +94,28 @@ class TradePanoptions(ScriptStrategyBase):
 
         self.logger().info(f"Checking pokeMedian...")
         self.logger().info(f"POST /options/pokeMedian [ connector: {connector} ]")
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/pokeMedian",
-            params=request_payload,
-            fail_silently=False
-        )
+        response = await client.poke_median(panopticPool)
         self.logger().info(f"pokeMedian hash: {response}")
 
-        # Example tokenID from real testnet user:
-        request_payload["tokenId"]="77322919313040615369538147907420"
-        self.logger().info(f"Checking optionPositionBalance on 77322919313040615369538147907420")
+        # Example tokenIDs from real testnet user:
+        tokenIds = ["77322919313040615369538147907420", "77323000906088706391268150146908"]
+        self.logger().info(f"Checking optionPositionBalance on {tokenIds}")
         self.logger().info(f"POST /options/optionPositionBalance [ connector: {connector} ]")
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/optionPositionBalance",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"optionPositionBalance response: {response}")
-
-        request_payload["tokenId"]="77323000906088706391268150146908"
-        self.logger().info(f"Checking optionPositionBalance on 77323000906088706391268150146908")
-        self.logger().info(f"POST /option/optionPositionBalance [ connector: {connector} ]")
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/optionPositionBalance",
-            params=request_payload,
-            fail_silently=False
-        )
-        self.logger().info(f"optionPositionBalance response: {response}")
+        balances = await client.gather(*[client.option_position_balance(panopticPool, tokenId) for tokenId in tokenIds])
+        for tokenId, response in zip(tokenIds, balances):
+            self.logger().info(f"optionPositionBalance response for {tokenId}: {response}")
 
         # Pre-existing TokenIDs for the example testnet user:
-        request_payload["includePendingPremium"]=True
-        request_payload["positionIdList"]=[
+        positionIdList = [
             "1724358520355700724595784863781761016418202439334584929386932255284888270684",
             "77323000906088706391268150146908",
             "77322919308318248886668502693724"
         ]
         self.logger().info(f"Checking calculateAccumulatedFeesBatch")
         self.logger().info(f"POST /option/calculateAccumulatedFeesBatch [ connector: {connector} ]")
-        response = await GatewayHttpClient.get_instance().api_request(
-            method="post",
-            path_url="options/calculateAccumulatedFeesBatch",
-            params=request_payload,
-            fail_silently=False
-        )
+        response = await client.calculate_accumulated_fees_batch(panopticPool, True, positionIdList)
         self.logger().info(f"calculateAccumulatedFeesBatch response: {response}")
 
 
+        self.logger().info(f"Gateway latency by endpoint: {client.latency_report()}")
         self.logger().info("End of trade strategy...")
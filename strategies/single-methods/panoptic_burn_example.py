@@ -5,6 +5,7 @@ from hummingbot.client.settings import GatewayConnectionSetting
 from hummingbot.core.gateway.gateway_http_client import GatewayHttpClient
 from hummingbot.core.utils.async_utils import safe_ensure_future
 from hummingbot.strategy.script_strategy_base import Decimal, ScriptStrategyBase
+from panopticHelpers import TickGrid
 
 
 class TradePanoptions(ScriptStrategyBase):
@@ -196,9 +197,9 @@ class TradePanoptions(ScriptStrategyBase):
             fail_silently=False
         )
         self.tickSpacing=response['tickSpacing']
-        self.ticks=response['ticks']
+        self.tick_grid=TickGrid.from_response(response)
         self.logger().info(f"Tick spacing: {self.tickSpacing}")
-        self.logger().info(f"Ticks: {self.ticks[0:10]}...")
+        self.logger().info(f"Ticks: {self.tick_grid}")
 
         self.wallet_address=self.address
 
@@ -6,6 +6,7 @@ from hummingbot.client.settings import GatewayConnectionSetting
 from hummingbot.core.gateway.gateway_http_client import GatewayHttpClient
 from hummingbot.core.utils.async_utils import safe_ensure_future
 from hummingbot.strategy.script_strategy_base import Decimal, ScriptStrategyBase
+from panopticHelpers import fetch_account_snapshot
 
 
 class TradePanoptions(ScriptStrategyBase):
@@ -80,106 +81,22 @@ class TradePanoptions(ScriptStrategyBase):
         # )
         # self.logger().info(f"createBigLizard response: {createBigLizard}")
 
-        # self.logger().info(f"Checking getCollateralToken0...")
-        # self.logger().info(f"POST /options/getCollateralToken0 [ connector: {connector} ]")
-        # colatteralTracker0 = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/getCollateralToken0",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"getCollateralToken0 response: {colatteralTracker0}")
-
-        # self.logger().info(f"Checking getCollateralToken1...")
-        # self.logger().info(f"POST /options/getCollateralToken1 [ connector: {connector} ]")
-        # colatteralTracker1 = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/getCollateralToken1",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"getCollateralToken1 response: {colatteralTracker1}")
-
-        # self.logger().info(f"Checking getAsset on token0...")
-        # self.logger().info(f"POST /options/getAsset [ connector: {connector} ]")
-        # request_payload["collateralTracker"] = colatteralTracker0
-        # assetToken0 = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/getAsset",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"getAsset response: {assetToken0}")
-
-        # self.logger().info(f"Checking getAsset on token1...")
-        # self.logger().info(f"POST /options/getAsset [ connector: {connector} ]")
-        # request_payload["collateralTracker"] = colatteralTracker1
-        # assetToken1 = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/getAsset",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"getAsset response: {assetToken1}")
-
-        # request_payload["collateralTracker"] = colatteralTracker0
-        # self.logger().info(f"Checking maxWithdraw on token0...")
-        # self.logger().info(f"POST /options/maxWithdraw [ connector: {connector} ]")
-        # response = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/maxWithdraw",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"maxWithdraw response: {response}")
-
-        # request_payload["collateralTracker"] = colatteralTracker1
-        # self.logger().info(f"Checking withdrawal limit for token1...")
-        # self.logger().info(f"POST /options/maxWithdraw [ connector: {connector} ]")
-        # maxWithdraw = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/maxWithdraw",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"maxWithdraw response: {maxWithdraw}")
-
-        # self.logger().info(f"Checking numberOfPositions...")
-        # self.logger().info(f"POST /options/numberOfPositions [ connector: {connector} ]")
-        # numberOfPositions = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/numberOfPositions",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"numberOfPositions response: {int(numberOfPositions['hex'], 16)}")
-
-        # self.logger().info(f"Checking queryPositions...")
-        # self.logger().info(f"POST /options/queryPositions [ connector: {connector} ]")
-        # openPositions = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/queryPositions",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # self.logger().info(f"queryPositions response: {openPositions}")
-
-        # request_payload["collateralTracker"] = colatteralTracker0
-        # self.logger().info(f"Checking getPoolData...")
-        # self.logger().info(f"POST /options/getPoolData [ connector: {connector} ]")
-        # data = await GatewayHttpClient.get_instance().api_request(
-        #     method="post",
-        #     path_url="options/getPoolData",
-        #     params=request_payload,
-        #     fail_silently=False
-        # )
-        # poolAssets = data['poolAssets']['hex']
-        # insideAMM = data['insideAMM']['hex']
-        # currentPoolUtilization = data['currentPoolUtilization']['hex']
-        # self.logger().info(f"getPoolData response...")
-        # self.logger().info(f"... poolAssets: {poolAssets}")
-        # self.logger().info(f"... insideAMM: {insideAMM}")
-        # self.logger().info(f"... currentPoolUtilization: {currentPoolUtilization}")
+        # Collateral trackers, their assets, withdrawal limits and pool data, the position count and
+        # the balance of every open position, all read at one block in a single gateway call.
+        self.logger().info(f"Checking accountSnapshot...")
+        self.logger().info(f"POST /options/accountSnapshot [ connector: {connector} ]")
+        snapshot = await fetch_account_snapshot(GatewayHttpClient.get_instance(), request_payload)
+        self.logger().info(f"accountSnapshot at block {snapshot.block_number}...")
+        for label, collateral in (("token0", snapshot.collateral0), ("token1", snapshot.collateral1)):
+            self.logger().info(f"... {label} collateralTracker: {collateral.collateral_tracker} (asset {collateral.asset})")
+            self.logger().info(f"... {label} collateralBalance: {collateral.collateral_balance}")
+            self.logger().info(f"... {label} maxWithdraw: {collateral.max_withdraw}")
+            self.logger().info(f"... {label} poolAssets: {collateral.pool_assets}")
+            self.logger().info(f"... {label} insideAMM: {collateral.inside_amm}")
+            self.logger().info(f"... {label} currentPoolUtilization: {collateral.current_pool_utilization}")
+        self.logger().info(f"... numberOfPositions: {snapshot.number_of_positions}")
+        for position in snapshot.positions:
+            self.logger().info(f"... optionPositionBalance {position.token_id}: {position.balance}")
 
         # self.logger().info(f"Checking pokeMedian...")
         # self.logger().info(f"POST /options/pokeMedian [ connector: {connector} ]")
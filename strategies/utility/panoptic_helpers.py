@@ -1,11 +1,20 @@
-import datetime
 import math
-import os
+from functools import lru_cache
 from typing import List, Tuple, Union
 
+import numpy as np
+
 # Constants
 UNI_MIN_TICK = -887272
 UNI_MAX_TICK = 887272
+LOG10_TICK_BASE = math.log10(1.0001)
+NP_LOG10_TICK_BASE = np.log10(1.0001)
+
+
+@lru_cache(maxsize=1024)
+def _decimal_refactor(t0_decimals: int, t1_decimals: int) -> float:
+    return math.pow(10, t0_decimals - t1_decimals)
+
 
 class PanopticUtils:
     """Utility functions for Panoptic Protocol trading strategies."""
@@ -13,13 +22,12 @@ class PanopticUtils:
     @staticmethod
     def tick_to_absolute_price(tick: int) -> float:
         """Convert a Uniswap V3 tick to its absolute price."""
-        return math.pow(10, tick * math.log10(1.0001))
+        return math.pow(10, tick * LOG10_TICK_BASE)
 
     @staticmethod
     def absolute_price_to_adjusted_price(absolute_price: float, t0_decimals: int, t1_decimals: int) -> float:
         """Convert absolute price to adjusted price considering token decimals."""
-        refactor = math.pow(10, t0_decimals - t1_decimals)
-        return absolute_price * refactor
+        return absolute_price * _decimal_refactor(t0_decimals, t1_decimals)
 
     @staticmethod
     def tick_to_adjusted_price(tick: int, t0_decimals: int, t1_decimals: int) -> float:
@@ -30,13 +38,12 @@ class PanopticUtils:
     @staticmethod
     def adjusted_price_to_absolute_price(adjusted_price: float, t0_decimals: int, t1_decimals: int) -> float:
         """Convert adjusted price back to absolute price."""
-        refactor = math.pow(10, t0_decimals - t1_decimals)
-        return adjusted_price / refactor
+        return adjusted_price / _decimal_refactor(t0_decimals, t1_decimals)
 
     @staticmethod
     def absolute_price_to_tick(absolute_price: float) -> float:
         """Convert absolute price to a Uniswap V3 tick."""
-        return math.log10(absolute_price) / math.log10(1.0001)
+        return math.log10(absolute_price) / LOG10_TICK_BASE
 
     @staticmethod
     def adjusted_price_to_tick(adjusted_price: float, t0_decimals: int, t1_decimals: int) -> float:
@@ -44,16 +51,22 @@ class PanopticUtils:
         absolute_price = PanopticUtils.adjusted_price_to_absolute_price(adjusted_price, t0_decimals, t1_decimals)
         return PanopticUtils.absolute_price_to_tick(absolute_price)
 
+    @staticmethod
+    def ticks_to_adjusted_prices(ticks: Union[List[int], np.ndarray], t0_decimals: int, t1_decimals: int) -> np.ndarray:
+        """Vectorized tick_to_adjusted_price over an array of ticks."""
+        return np.power(10, np.asarray(ticks) * NP_LOG10_TICK_BASE) * _decimal_refactor(t0_decimals, t1_decimals)
+
+    @staticmethod
+    def adjusted_prices_to_ticks(adjusted_prices: Union[List[float], np.ndarray], t0_decimals: int, t1_decimals: int) -> np.ndarray:
+        """Vectorized adjusted_price_to_tick over an array of prices."""
+        absolute_prices = np.asarray(adjusted_prices, dtype=np.float64) / _decimal_refactor(t0_decimals, t1_decimals)
+        return np.log10(absolute_prices) / NP_LOG10_TICK_BASE
+
     @staticmethod
     def log_spot_data(file_location: str, pool_id: str, spot_price: float, spot_tick: float) -> None:
-        """Log spot price data to a file."""
-        if not file_location.endswith('.dat'):
-            raise ValueError("The file location must end with .dat")
-
-        mode = 'a' if os.path.exists(file_location) else 'w'
-        with open(file_location, mode) as file:
-            current_time = datetime.datetime.now().strftime('%Y-%m-%d-%H:%M:%S')
-            file.write(f"{current_time}, {pool_id}, {spot_price}, {spot_tick}\n")
+        """Append spot price data to a binary spot log (.spot; .dat logs are migrated on first use)."""
+        from panopticHelpers.helpers import log_spot_data
+        log_spot_data(file_location, pool_id, spot_price, spot_tick)
 
     @staticmethod
     def timescale_to_width(timescale: str, pool_tick_spacing: int) -> int:
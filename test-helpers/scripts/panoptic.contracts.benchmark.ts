@@ -0,0 +1,52 @@
+// Per-request contract setup on the Panoptic hot read routes: a new ethers Contract per request
+// against a handle from ContractPool. Timing only, so it lives outside the jest suite; run with
+//   npx ts-node --files test-helpers/scripts/panoptic.contracts.benchmark.ts
+import { Contract, Wallet } from 'ethers';
+import { Interface } from 'ethers/lib/utils';
+import {
+  collateralTrackerInterface,
+  ContractPool,
+  panopticHelperInterface,
+  panopticPoolInterface,
+  uniswapV3PoolInterface,
+} from '../../src/connectors/panoptic/panoptic.contracts';
+import panopticHelperAbi from '../../src/connectors/panoptic/PanopticHelper.ABI.json';
+import panopticPoolAbi from '../../src/connectors/panoptic/PanopticPool.ABI.json';
+import collateralTrackerAbi from '../../src/connectors/panoptic/CollateralTracker.ABI.json';
+
+const privateKey = '0x' + '11'.repeat(32);
+const helper = '0x' + '01'.repeat(20);
+const pool = '0x' + 'ab'.repeat(20);
+const tracker = '0x' + '03'.repeat(20);
+const univ3pool = '0x' + '04'.repeat(20);
+const iterations = 200;
+
+const uniswapV3PoolAbi = uniswapV3PoolInterface.fragments.map((fragment) => fragment.format('full'));
+
+// Contracts touched by the hot read routes: checkCollateral/unwrapTokenId (PanopticHelper),
+// numberOfPositions (PanopticPool), getPoolData (CollateralTracker) and getSpotPrice (slot0).
+const hotRoutes: Array<[string, string, any, Interface]> = [
+  ['checkCollateral', helper, panopticHelperAbi.abi, panopticHelperInterface],
+  ['numberOfPositions', pool, panopticPoolAbi.abi, panopticPoolInterface],
+  ['getPoolData', tracker, collateralTrackerAbi.abi, collateralTrackerInterface],
+  ['getSpotPrice', univ3pool, uniswapV3PoolAbi, uniswapV3PoolInterface],
+];
+
+const wallets = Array.from({ length: iterations }, () => new Wallet(privateKey));
+const contracts = new ContractPool();
+
+for (const [route, address, abi, iface] of hotRoutes) {
+  let start = process.hrtime.bigint();
+  for (const wallet of wallets) {
+    new Contract(address, abi, wallet);
+  }
+  const rebuilt = Number(process.hrtime.bigint() - start) / iterations / 1000;
+
+  start = process.hrtime.bigint();
+  for (const wallet of wallets) {
+    contracts.get(address, iface, wallet);
+  }
+  const pooled = Number(process.hrtime.bigint() - start) / iterations / 1000;
+
+  console.log(`${route}: new Contract ${rebuilt.toFixed(1)}us/request, pooled ${pooled.toFixed(1)}us/request`);
+}
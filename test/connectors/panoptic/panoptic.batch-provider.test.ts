@@ -0,0 +1,63 @@
+import { createServer, Server } from 'http';
+import { AddressInfo } from 'net';
+import { BatchingJsonRpcProvider } from '../../../src/connectors/panoptic/panoptic.batch-provider';
+
+// Stub JSON-RPC node: records every HTTP request body and answers batches in reverse order
+function stubNode(): Promise<{ server: Server, url: string, bodies: any[] }> {
+  const bodies: any[] = [];
+  const server = createServer((req, res) => {
+    let body = '';
+    req.on('data', (chunk) => (body += chunk));
+    req.on('end', () => {
+      const calls = JSON.parse(body);
+      bodies.push(calls);
+      const answer = (call: any) => call.method === 'eth_call' && call.params[0].to === '0xbad'
+        ? { jsonrpc: '2.0', id: call.id, error: { code: 3, message: 'execution reverted', data: '0x08c379a0' } }
+        : { jsonrpc: '2.0', id: call.id, result: `${call.method}:${call.id}` };
+      res.setHeader('content-type', 'application/json');
+      res.end(JSON.stringify(Array.isArray(calls) ? calls.map(answer).reverse() : answer(calls)));
+    });
+  });
+  return new Promise((resolve) => server.listen(0, '127.0.0.1', () =>
+    resolve({ server, url: `http://127.0.0.1:${(server.address() as AddressInfo).port}`, bodies })
+  ));
+}
+
+describe('BatchingJsonRpcProvider', () => {
+  let node: { server: Server, url: string, bodies: any[] };
+
+  beforeAll(async () => {
+    node = await stubNode();
+  });
+
+  afterAll(() => {
+    node.server.close();
+  });
+
+  beforeEach(() => {
+    node.bodies.length = 0;
+  });
+
+  it('sends calls from the same window as one batch and isolates per-call errors', async () => {
+    const provider = new BatchingJsonRpcProvider(node.url, 1, 0, 50);
+    const results = await Promise.allSettled([
+      provider.send('eth_call', [{ to: '0xgood' }, 'latest']),
+      provider.send('eth_call', [{ to: '0xbad' }, 'latest']),
+      provider.send('eth_getBalance', ['0xgood', 'latest']),
+    ]);
+
+    expect(node.bodies).toHaveLength(1);
+    expect(node.bodies[0].map((call: any) => call.method)).toEqual(['eth_call', 'eth_call', 'eth_getBalance']);
+    expect(results[0]).toMatchObject({ status: 'fulfilled', value: `eth_call:${node.bodies[0][0].id}` });
+    expect(results[1]).toMatchObject({ status: 'rejected', reason: { code: 3, data: '0x08c379a0' } });
+    expect(results[2]).toMatchObject({ status: 'fulfilled', value: `eth_getBalance:${node.bodies[0][2].id}` });
+  });
+
+  it('caps batches at maxBatchSize', async () => {
+    const provider = new BatchingJsonRpcProvider(node.url, 1, 2000, 4);
+    await Promise.all([...Array(10).keys()].map((i) => provider.send('eth_getCode', [`0x${i}`, 'latest'])));
+
+    expect(node.bodies.map((batch) => batch.length).sort()).toEqual([2, 4, 4]);
+    expect(provider.stats).toEqual({ calls: 10, batches: 3, largestBatch: 4 });
+  });
+});
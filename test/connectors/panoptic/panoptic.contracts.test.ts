@@ -0,0 +1,42 @@
+import { VoidSigner, Wallet } from 'ethers';
+import { getAddress } from 'ethers/lib/utils';
+import {
+  collateralTrackerInterface,
+  ContractPool,
+  panopticHelperInterface,
+  panopticPoolInterface,
+} from '../../../src/connectors/panoptic/panoptic.contracts';
+
+const privateKey = '0x' + '11'.repeat(32);
+const helper = '0x' + '01'.repeat(20);
+const pool = '0x' + 'ab'.repeat(20);
+const tracker = '0x' + '03'.repeat(20);
+
+describe('ContractPool', () => {
+  it('shares one handle per interface, address and signer', () => {
+    const contracts = new ContractPool();
+    // Wallets are decrypted per request, so equal wallets must map to the same handle
+    const first = contracts.get(pool, panopticPoolInterface, new Wallet(privateKey));
+    expect(contracts.get(getAddress(pool), panopticPoolInterface, new Wallet(privateKey))).toBe(first);
+
+    const readOnly = contracts.get(pool, panopticPoolInterface, new VoidSigner(new Wallet(privateKey).address));
+    expect(readOnly).not.toBe(first);
+    expect(contracts.get(tracker, panopticPoolInterface, new Wallet(privateKey))).not.toBe(first);
+    expect(contracts.get(pool, collateralTrackerInterface, new Wallet(privateKey))).not.toBe(first);
+    expect(contracts.size).toEqual(4);
+  });
+
+  it('evicts the least recently used handle', () => {
+    const contracts = new ContractPool(2);
+    const wallet = new Wallet(privateKey);
+    const a = contracts.get(pool, panopticPoolInterface, wallet);
+    const b = contracts.get(tracker, collateralTrackerInterface, wallet);
+    expect(contracts.get(pool, panopticPoolInterface, wallet)).toBe(a);
+    contracts.get(helper, panopticHelperInterface, wallet);
+    expect(contracts.size).toEqual(2);
+    expect(contracts.get(pool, panopticPoolInterface, wallet)).toBe(a);
+    expect(contracts.get(tracker, collateralTrackerInterface, wallet)).not.toBe(b);
+    expect(contracts.size).toEqual(2);
+  });
+
+});
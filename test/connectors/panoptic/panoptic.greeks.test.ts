@@ -0,0 +1,91 @@
+import {
+  payoffDelta,
+  payoffGamma,
+  payoffGreeks,
+  payoffValue,
+  positionGreeks,
+  tokenIdPayoffLegs,
+} from '../../../src/connectors/panoptic/panoptic.greeks';
+import { decodeTokenId } from '../../../src/connectors/panoptic/panoptic.tokenid';
+
+// The finite-difference scheme Panoptic.calculateDelta used before the closed form: a 1000-point
+// linspace over [K/3, 1.75K] and central differences read at the first grid point >= price.
+function numericGreeks(K: number, r: number, price: number): { x: number, delta: number, gamma: number } {
+  const N = 1000;
+  const step = (1.75 * K - K / 3) / (N - 1);
+  const p = Array.from({ length: N }, (_, i) => K / 3 + i * step);
+  const gradient = (arr: number[]) =>
+    arr.map((_, i) => (i === 0 ? arr[1] - arr[0] : i === N - 1 ? arr[N - 1] - arr[N - 2] : (arr[i + 1] - arr[i - 1]) / 2));
+  const dp = gradient(p);
+  const delta = gradient(p.map((x) => payoffValue(x, K, r))).map((dv, i) => dv / dp[i]);
+  const gamma = gradient(delta).map((dd, i) => dd / dp[i]);
+  const index = p.findIndex((x) => x >= price);
+  return { x: p[index], delta: delta[index], gamma: gamma[index] };
+}
+
+describe('Payoff greeks', () => {
+  const K = 2000;
+  const r = 1.2;
+
+  it('matches the finite-difference implementation', () => {
+    for (const price of [900, K / r + 50, 1900, K, 2150, K * r - 50, 3000]) {
+      const numeric = numericGreeks(K, r, price);
+      expect(payoffDelta(numeric.x, K, r)).toBeCloseTo(numeric.delta, 4);
+      expect(payoffGamma(numeric.x, K, r)).toBeCloseTo(numeric.gamma, 5);
+    }
+  });
+
+  it('is flat outside the range', () => {
+    expect(payoffDelta(K / r - 1, K, r)).toEqual(1);
+    expect(payoffDelta(K * r + 1, K, r)).toEqual(0);
+    expect(payoffGamma(K / 2, K, r)).toEqual(0);
+    expect(payoffValue(K * 2, K, r)).toEqual(K);
+    expect(() => payoffDelta(K, K, 1)).toThrow();
+  });
+
+  it('prices arrays in one call and matches the scalar functions', () => {
+    const prices = [1000, 1700, 2000, 2300, 2600];
+    const strikes = [1800, 2000, 2000, 2200, 2400];
+    const { value, delta, gamma } = payoffGreeks(strikes, [r], prices);
+    prices.forEach((x, i) => {
+      expect(value[i]).toBeCloseTo(payoffValue(x, strikes[i], r), 9);
+      expect(delta[i]).toBeCloseTo(payoffDelta(x, strikes[i], r), 12);
+      expect(gamma[i]).toBeCloseTo(payoffGamma(x, strikes[i], r), 12);
+    });
+  });
+
+  it('aggregates signed legs of a position', () => {
+    const legs = [
+      { strike: 1800, range: r, weight: 1 },
+      { strike: 2200, range: r, weight: -2 },
+    ];
+    const { delta, gamma } = positionGreeks(legs, [2000]);
+    expect(delta[0]).toBeCloseTo(payoffDelta(2000, 1800, r) - 2 * payoffDelta(2000, 2200, r), 12);
+    expect(gamma[0]).toBeCloseTo(payoffGamma(2000, 1800, r) - 2 * payoffGamma(2000, 2200, r), 12);
+  });
+});
+
+describe('Position payoff legs', () => {
+  // Four-leg testnet position (strikes -49740 and -49980, width 60, tickSpacing 10)
+  const { poolId, legs } = decodeTokenId(
+    '1724358520355700724595784863781761016418202439334584929386932255284888270684'
+  );
+  const payoffLegs = tokenIdPayoffLegs(legs, poolId.shr(48).toNumber(), 1e18);
+
+  it('maps every leg to its tick range and signed notional', () => {
+    expect(payoffLegs.length).toEqual(legs.length);
+    payoffLegs.forEach((payoffLeg, i) => {
+      expect(Math.log(payoffLeg.strike) / Math.log(1.0001)).toBeCloseTo(legs[i].strike, 6);
+      expect(Math.sign(payoffLeg.weight)).toEqual(legs[i].isLong ? -1 : 1);
+      expect(payoffLeg.tokenType).toEqual(legs[i].tokenType);
+    });
+  });
+
+  it('delta is the derivative of the position value', () => {
+    const price = 1.0001 ** -49800;
+    const h = price * 1e-6;
+    const { value } = positionGreeks(payoffLegs, [price - h, price + h]);
+    const { delta } = positionGreeks(payoffLegs, [price]);
+    expect((value[1] - value[0]) / (2 * h) / delta[0]).toBeCloseTo(1, 5);
+  });
+});
@@ -0,0 +1,24 @@
+import { BigNumber } from 'ethers';
+import {
+  crossMarginSurplus,
+  liquidationBoundaries,
+  surfaceTicks,
+} from '../../../src/connectors/panoptic/panoptic.margin';
+
+describe('collateral surface helpers', () => {
+  it('builds integer grids without duplicate ticks', () => {
+    expect(surfaceTicks(-10, 10, 5)).toEqual([-10, -5, 0, 5, 10]);
+    expect(surfaceTicks(0, 3, 7)).toEqual([0, 1, 2, 3]);
+  });
+
+  it('values both tokens in token1 at the tick price', () => {
+    expect(crossMarginSurplus(0, BigNumber.from(100), '40', '10', 30)).toBeCloseTo(40);
+    expect(crossMarginSurplus(6932, '100', '40', '10', '30')).toBeCloseTo(60 * 1.0001 ** 6932 - 20);
+  });
+
+  it('interpolates sign changes and skips reverted ticks', () => {
+    const ticks = [-200, -100, 0, 100, 200, 300];
+    expect(liquidationBoundaries(ticks, [-10, 30, 50, null, 20, -60])).toEqual([-175, 225]);
+    expect(liquidationBoundaries(ticks, [1, 2, 3, 4, 5, 6])).toEqual([]);
+  });
+});
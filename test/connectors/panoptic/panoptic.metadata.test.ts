@@ -0,0 +1,51 @@
+import fs from 'fs';
+import fsp from 'fs/promises';
+import os from 'os';
+import path from 'path';
+import { PanopticMetadataStore } from '../../../src/connectors/panoptic/panoptic.metadata';
+import { LocalStorage } from '../../../src/services/local-storage';
+import { ReferenceCountingCloseable } from '../../../src/services/refcounting-closeable';
+
+let dbPath: string = '';
+const handle: string = ReferenceCountingCloseable.createHandle();
+
+beforeAll(async () => {
+  dbPath = await fsp.mkdtemp(path.join(os.tmpdir(), '/panoptic-metadata.test.level'));
+});
+
+afterAll(async () => {
+  const store: PanopticMetadataStore = PanopticMetadataStore.getInstance(dbPath, handle);
+  await store.close(handle);
+  fs.rmSync(dbPath, { force: true, recursive: true });
+});
+
+describe('PanopticMetadataStore', () => {
+  it('loads each key once, shares concurrent loads and persists the value', async () => {
+    const store: PanopticMetadataStore = PanopticMetadataStore.getInstance(dbPath, handle);
+    await store.init();
+    const load = jest.fn(async () => 60);
+
+    const results = await Promise.all([
+      store.getOrLoad('ethereum/sepolia/tickSpacing/0xpool', load),
+      store.getOrLoad('ethereum/sepolia/tickSpacing/0xpool', load),
+    ]);
+    expect(results).toEqual([60, 60]);
+    expect(await store.getOrLoad('ethereum/sepolia/tickSpacing/0xpool', load)).toEqual(60);
+    expect(load).toHaveBeenCalledTimes(1);
+
+    const persisted = await LocalStorage.getInstance(dbPath, handle).get((k: string, v: any) => [k, v]);
+    expect(persisted['ethereum/sepolia/tickSpacing/0xpool']).toEqual(60);
+  });
+
+  it('does not store values that are not final yet', async () => {
+    const store: PanopticMetadataStore = PanopticMetadataStore.getInstance(dbPath, handle);
+    const zero = '0x0000000000000000000000000000000000000000';
+    const load = jest.fn(async () => zero);
+    const isDeployed = (address: string) => address !== zero;
+
+    expect(await store.getOrLoad('ethereum/sepolia/panopticPool/0xpool', load, isDeployed)).toEqual(zero);
+    await store.getOrLoad('ethereum/sepolia/panopticPool/0xpool', load, isDeployed);
+    expect(load).toHaveBeenCalledTimes(2);
+    expect(store.get('ethereum/sepolia/panopticPool/0xpool')).toBeUndefined();
+  });
+});
@@ -0,0 +1,72 @@
+import { providers } from 'ethers';
+import { panopticPoolInterface } from '../../../src/connectors/panoptic/panoptic.contracts';
+import { getLogsInChunks, PositionBook } from '../../../src/connectors/panoptic/panoptic.position-book';
+
+const pool = '0x' + '11'.repeat(20);
+const account = '0x' + 'aa'.repeat(20);
+const other = '0x' + 'bb'.repeat(20);
+
+function log(name: string, args: any[], blockNumber: number, logIndex: number = 0): providers.Log {
+  const { data, topics } = panopticPoolInterface.encodeEventLog(panopticPoolInterface.getEvent(name), args);
+  return { address: pool, data, topics, blockNumber, logIndex, removed: false } as providers.Log;
+}
+
+const minted = (tokenId: number, block: number) => log('OptionMinted', [account, 10, tokenId, 0], block);
+const burnt = (tokenId: number, block: number) => log('OptionBurnt', [account, 10, tokenId, 0], block);
+
+// Serves history through getLogs in ranges of at most `maxRange` blocks, as some nodes require
+function fakeProvider(history: providers.Log[], head: number, maxRange: number) {
+  return {
+    getBlockNumber: jest.fn(async () => head),
+    getLogs: jest.fn(async (filter: any) => {
+      if (filter.toBlock - filter.fromBlock + 1 > maxRange) {
+        throw new Error('block range too large');
+      }
+      return history.filter((l) => l.blockNumber >= filter.fromBlock && l.blockNumber <= filter.toBlock
+        && (filter.topics[0] as string[]).includes(l.topics[0]));
+    }),
+    on: jest.fn(),
+    off: jest.fn(),
+  };
+}
+
+describe('PositionBook', () => {
+  it('replays the account history, then applies receipt logs idempotently and in order', async () => {
+    const history = [minted(1, 110), minted(2, 120), burnt(1, 130), minted(3, 140)];
+    const provider = fakeProvider(history, 150, 25);
+    const book = new PositionBook(provider as unknown as providers.Provider, pool, account, async () => 100, 100);
+
+    const snapshot = await book.snapshot();
+    expect(snapshot.blockNumber).toEqual(150);
+    expect(snapshot.positions.map((p) => p.tokenId)).toEqual(['2', '3']);
+    expect(provider.on).toHaveBeenCalledTimes(2);
+
+    // A late duplicate of an old mint does not reopen the burnt position
+    book.applyLogs([minted(1, 110), burnt(2, 151), log('OptionMinted', [other, 10, 9, 0], 151, 1)]);
+    book.applyLogs([log('ForcedExercised', [other, account, 3, 0], 152)]);
+    expect((await book.snapshot()).positions).toEqual([]);
+
+    book.applyLogs([minted(4, 153), log('AccountLiquidated', [other, account, 0], 154), minted(5, 155)]);
+    expect((await book.snapshot()).positions.map((p) => p.tokenId)).toEqual(['5']);
+  });
+
+  it('reports subgraph positions missing from the book', async () => {
+    const book = new PositionBook(fakeProvider([minted(1, 10)], 20, 100) as unknown as providers.Provider, pool, account, async () => 0);
+    const reconciliation = await book.reconcile(async () => ({ open: ['0x02'], complete: false }));
+    expect(reconciliation.missingFromBook).toEqual(['2']);
+    expect(reconciliation.missingFromSubgraph).toEqual([]);
+  });
+
+  it('stops the chunked scan at the first chunk with logs when asked to', async () => {
+    const history = [minted(1, 40), minted(2, 90)];
+    const provider = fakeProvider(history, 1000, 25);
+    const filter = { address: pool, topics: [[history[0].topics[0]]] };
+
+    const first = await getLogsInChunks(provider as unknown as providers.Provider, filter, 0, 1000, 100, true);
+    expect(first.map((l) => l.blockNumber)).toEqual([40]);
+    expect(provider.getLogs.mock.calls[provider.getLogs.mock.calls.length - 1][0].toBlock).toEqual(49);
+
+    const all = await getLogsInChunks(provider as unknown as providers.Provider, filter, 0, 1000, 100);
+    expect(all.map((l) => l.blockNumber)).toEqual([40, 90]);
+  });
+});
@@ -0,0 +1,30 @@
+import { BigNumber } from 'ethers';
+import { panopticPoolInterface } from '../../../src/connectors/panoptic/panoptic.contracts';
+import { encodeRebalance, planRebalance, RebalancePlan } from '../../../src/connectors/panoptic/panoptic.rebalance';
+
+const ids = (list: BigNumber[]) => list.map((id) => id.toString());
+
+describe('planRebalance', () => {
+  it('burns first, then appends each mint to the running position list', () => {
+    const plan = planRebalance(['1', '2', '3'], ['1', '3'], [
+      { tokenId: '7', positionSize: '100' },
+      { tokenId: '8', positionSize: '200', effectiveLiquidityLimit: '5' },
+    ]) as RebalancePlan;
+
+    expect(ids(plan.remainingPositionIdList)).toEqual(['2']);
+    expect(plan.mints.map((mint) => ids(mint.positionIdList))).toEqual([['2', '7'], ['2', '7', '8']]);
+    expect(ids(plan.finalPositionIdList)).toEqual(['2', '7', '8']);
+
+    const calls = encodeRebalance(panopticPoolInterface, plan, -10, 10);
+    expect(calls.map((data) => panopticPoolInterface.parseTransaction({ data }).signature)).toEqual([
+      'burnOptions(uint256[],uint256[],int24,int24)',
+      'mintOptions(uint256[],uint128,uint64,int24,int24)',
+      'mintOptions(uint256[],uint128,uint64,int24,int24)',
+    ]);
+  });
+
+  it('rejects burns of positions that are not open and duplicate mints', () => {
+    expect(planRebalance(['1'], ['2'], [])).toBeInstanceOf(Error);
+    expect(planRebalance(['1', '2'], ['1'], [{ tokenId: '2', positionSize: '1' }])).toBeInstanceOf(Error);
+  });
+});
@@ -0,0 +1,77 @@
+import { providers } from 'ethers';
+import { fetchJson } from 'ethers/lib/utils';
+import { ReceiptPoller } from '../../../src/connectors/panoptic/panoptic.receipts';
+
+jest.mock('ethers/lib/utils', () => ({
+  ...jest.requireActual('ethers/lib/utils'),
+  fetchJson: jest.fn(),
+}));
+
+const alice = '0x' + 'aa'.repeat(20);
+const bob = '0x' + 'bb'.repeat(20);
+const [mined, reverted, pending, replaced, unseen] = ['01', '02', '03', '04', '05'].map((b) => '0x' + b.repeat(32));
+
+const receipts: Record<string, any> = {
+  [mined]: { blockNumber: '0x62', status: '0x1', gasUsed: '0x5208', effectiveGasPrice: '0x3b9aca00', from: alice },
+  [reverted]: { blockNumber: '0x64', status: '0x0', gasUsed: '0x5208', from: alice },
+};
+const transactions: Record<string, any> = {
+  [mined]: { from: alice, nonce: '0x1' },
+  [reverted]: { from: alice, nonce: '0x2' },
+  [pending]: { from: alice, nonce: '0x3' },
+  [replaced]: { from: bob, nonce: '0x7' },
+};
+const minedNonces: Record<string, string> = { [alice]: '0x3', [bob]: '0x8' };
+
+// Answers a JSON-RPC batch in reverse order, as nodes are allowed to
+function answer(_connection: any, body: string) {
+  const calls = JSON.parse(body);
+  return Promise.resolve(calls.map((call: any) => {
+    const [first] = call.params;
+    const result = {
+      eth_blockNumber: '0x64',
+      eth_getTransactionReceipt: receipts[first] ?? null,
+      eth_getTransactionByHash: transactions[first] ?? null,
+      eth_getTransactionCount: minedNonces[first],
+    }[call.method as string];
+    return { jsonrpc: '2.0', id: call.id, result };
+  }).reverse());
+}
+
+describe('ReceiptPoller', () => {
+  it('classifies many transactions with one batch plus one nonce batch for pending senders', async () => {
+    (fetchJson as jest.Mock).mockImplementation(answer);
+    const poller = new ReceiptPoller({ connection: { url: 'http://node' } } as providers.JsonRpcProvider);
+
+    const response = await poller.poll([mined, reverted, pending, replaced, unseen]);
+
+    expect(response.blockNumber).toEqual(100);
+    expect(response.transactions.map((tx) => tx.status)).toEqual(['confirmed', 'reverted', 'pending', 'replaced', 'unknown']);
+    expect(response.transactions[0]).toMatchObject({ blockNumber: 98, confirmations: 3, gasUsed: '21000', effectiveGasPrice: '1000000000' });
+    expect(response.transactions[1]).toMatchObject({ confirmations: 1 });
+
+    const batches = (fetchJson as jest.Mock).mock.calls.map(([, body]) => JSON.parse(body));
+    expect(batches.map((batch) => batch.length)).toEqual([11, 2]);
+    // Nonces are read at the head block the receipts were read at
+    expect(batches[1].map((call: any) => call.params[1])).toEqual(['0x64', '0x64']);
+  });
+
+  it('reports failed lookups as errors instead of pending, and rejects non-batch replies', async () => {
+    (fetchJson as jest.Mock).mockReset();
+    (fetchJson as jest.Mock).mockImplementation((connection: any, body: string) => answer(connection, body).then(
+      (responses: any[]) => responses.map((response) => {
+        const call = JSON.parse(body).find((c: any) => c.id === response.id);
+        return call.method === 'eth_getTransactionReceipt' && call.params[0] === mined
+          ? { jsonrpc: '2.0', id: response.id, error: { code: -32000, message: 'header not found' } }
+          : response;
+      })
+    ));
+    const poller = new ReceiptPoller({ connection: { url: 'http://node' } } as providers.JsonRpcProvider);
+    const response = await poller.poll([mined, pending]);
+    expect(response.transactions.map((tx) => tx.status)).toEqual(['error', 'pending']);
+    expect(response.transactions[0].error).toEqual('header not found');
+
+    (fetchJson as jest.Mock).mockResolvedValue({ jsonrpc: '2.0', id: null, error: { code: -32600, message: 'batch not supported' } });
+    await expect(poller.poll([mined])).rejects.toThrow('JSON-RPC batch rejected: batch not supported');
+  });
+});
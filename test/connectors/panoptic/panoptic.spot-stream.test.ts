@@ -0,0 +1,71 @@
+import { providers } from 'ethers';
+import { uniswapV3PoolInterface } from '../../../src/connectors/panoptic/panoptic.contracts';
+import { Slot0Stream, Slot0Update } from '../../../src/connectors/panoptic/panoptic.spot-stream';
+
+const pool = '0x' + '04'.repeat(20);
+const sender = '0x' + '05'.repeat(20);
+
+function swapLog(blockNumber: number, logIndex: number, sqrtPriceX96: string, tick: number): providers.Log {
+  const log = uniswapV3PoolInterface.encodeEventLog(uniswapV3PoolInterface.getEvent('Swap'), [
+    sender, sender, 1, -1, sqrtPriceX96, 1000, tick,
+  ]);
+  return { ...log, address: pool, blockNumber, logIndex, removed: false } as providers.Log;
+}
+
+// Only the log subscription is exercised; the filter itself is not inspected
+function fakeProvider() {
+  const handlers: Array<(log: providers.Log) => void> = [];
+  return {
+    on: (_filter: providers.Filter, handler: (log: providers.Log) => void) => handlers.push(handler),
+    off: (_filter: providers.Filter, handler: (log: providers.Log) => void) => handlers.splice(handlers.indexOf(handler), 1),
+    listenerCount: () => handlers.length,
+    emitLog: (log: providers.Log) => handlers.slice().forEach((handler) => handler(log)),
+  };
+}
+
+const nextTurn = () => new Promise((resolve) => setImmediate(resolve));
+
+describe('Slot0Stream', () => {
+  it('sends the current slot0, then the last swap of each block that moved the price', async () => {
+    const provider = fakeProvider();
+    const readSlot0 = jest.fn(async (): Promise<Slot0Update> => ({ blockNumber: 10, sqrtPriceX96: '100', tick: 1 }));
+    const stream = new Slot0Stream(provider as unknown as providers.Provider, pool, readSlot0);
+    const updates: Slot0Update[] = [];
+
+    const unsubscribe = await stream.subscribe((update) => updates.push(update));
+    expect(updates).toEqual([{ blockNumber: 10, sqrtPriceX96: '100', tick: 1 }]);
+
+    provider.emitLog(swapLog(10, 3, '90', 0)); // already reflected in the slot0 read
+    provider.emitLog(swapLog(11, 0, '110', 2));
+    provider.emitLog(swapLog(11, 4, '120', 3));
+    await nextTurn();
+    provider.emitLog(swapLog(12, 1, '120', 3)); // price unchanged
+    await nextTurn();
+
+    expect(updates.slice(1)).toEqual([{ blockNumber: 11, sqrtPriceX96: '120', tick: 3 }]);
+    expect(readSlot0).toHaveBeenCalledTimes(1);
+
+    unsubscribe();
+    expect(provider.listenerCount()).toEqual(0);
+  });
+
+  it('shares one subscription and drops listeners whose initial read failed', async () => {
+    const provider = fakeProvider();
+    const readSlot0 = jest.fn()
+      .mockRejectedValueOnce(new Error('rpc down'))
+      .mockResolvedValue({ blockNumber: 20, sqrtPriceX96: '200', tick: 5 });
+    const stream = new Slot0Stream(provider as unknown as providers.Provider, pool, readSlot0);
+
+    await expect(stream.subscribe(() => undefined)).rejects.toThrow('rpc down');
+    expect(stream.subscribers).toEqual(0);
+    expect(provider.listenerCount()).toEqual(0);
+
+    const first = await stream.subscribe(() => undefined);
+    const second = await stream.subscribe(() => undefined);
+    expect(readSlot0).toHaveBeenCalledTimes(2);
+    expect(provider.listenerCount()).toEqual(1);
+    first();
+    second();
+    expect(provider.listenerCount()).toEqual(0);
+  });
+});
@@ -0,0 +1,81 @@
+import { Wallet } from 'ethers';
+import { EVMNonceManager } from '../../../src/chains/ethereum/evm.nonce';
+import { TransactionSubmitter } from '../../../src/connectors/panoptic/panoptic.submitter';
+
+// Hands out increasing nonces; overridePendingNonce(n) makes n + 1 the next one
+function fakeNonceManager(start: number) {
+  let next = start;
+  return {
+    provideNonce: jest.fn(async (explicit: number | undefined, _address: string, f: (nonce: number) => Promise<any>) => {
+      const nonce = explicit ?? next;
+      next = nonce + 1;
+      try {
+        return await f(nonce);
+      } catch (error) {
+        next = nonce;
+        throw error;
+      }
+    }),
+    overridePendingNonce: jest.fn(async (_address: string, nonce: number) => {
+      next = nonce + 1;
+    }),
+    getNonceFromNode: jest.fn(async () => -1),
+  };
+}
+
+function fakeWallet(pendingCount: number, wait: (nonce: number) => Promise<any>, rejectNonces: number[] = []) {
+  const sent: number[] = [];
+  return {
+    sent,
+    address: '0x' + 'aa'.repeat(20),
+    getTransactionCount: jest.fn(async () => pendingCount),
+    sendTransaction: jest.fn(async (tx: any) => {
+      if (rejectNonces.includes(tx.nonce)) {
+        throw new Error('nonce too low');
+      }
+      sent.push(tx.nonce);
+      return { hash: `0x${tx.nonce}`, nonce: tx.nonce, wait: () => wait(tx.nonce) };
+    }),
+  };
+}
+
+describe('TransactionSubmitter', () => {
+  it('pipelines sends with consecutive nonces without waiting for receipts', async () => {
+    const nonceManager = fakeNonceManager(5);
+    const mined: Array<(receipt: any) => void> = [];
+    const wallet = fakeWallet(5, () => new Promise((resolve) => mined.push(resolve)));
+    const submitter = new TransactionSubmitter(nonceManager as unknown as EVMNonceManager);
+
+    const submissions = await Promise.all([0, 1, 2].map(() => submitter.submit(wallet as unknown as Wallet, {})));
+    expect(submissions.map((s) => [s.txHash, s.nonce])).toEqual([['0x5', 5], ['0x6', 6], ['0x7', 7]]);
+    expect(wallet.sent).toEqual([5, 6, 7]);
+
+    mined.forEach((resolve, i) => resolve({ blockNumber: 100 + i }));
+    expect(await submissions[2].receipt).toEqual({ blockNumber: 102 });
+  });
+
+  it('resynchronizes to the pending count after a nonce error and resolves repriced transactions', async () => {
+    const nonceManager = fakeNonceManager(3);
+    const replaced = Object.assign(new Error('replaced'), {
+      code: 'TRANSACTION_REPLACED', cancelled: false, replacement: { hash: '0xnew' }, receipt: { blockNumber: 9 },
+    });
+    const wallet = fakeWallet(8, () => Promise.reject(replaced), [3]);
+    const submitter = new TransactionSubmitter(nonceManager as unknown as EVMNonceManager);
+
+    const submission = await submitter.submit(wallet as unknown as Wallet, {});
+    expect(submission.nonce).toEqual(8);
+    expect(nonceManager.overridePendingNonce).toHaveBeenCalledWith(wallet.address, 7);
+    expect(await submission.receipt).toEqual({ blockNumber: 9 });
+  });
+
+  it('sends with nonce 0 instead of overriding to -1 when the wallet has no transactions', async () => {
+    const nonceManager = fakeNonceManager(4);
+    const wallet = fakeWallet(0, () => Promise.resolve({ blockNumber: 1 }), [4]);
+    const submitter = new TransactionSubmitter(nonceManager as unknown as EVMNonceManager);
+
+    const submission = await submitter.submit(wallet as unknown as Wallet, {});
+    expect(submission.nonce).toEqual(0);
+    expect(nonceManager.overridePendingNonce).not.toHaveBeenCalled();
+    expect(nonceManager.getNonceFromNode).toHaveBeenCalledWith(wallet.address);
+  });
+});
@@ -0,0 +1,121 @@
+import { BigNumber, Contract, providers } from 'ethers';
+import {
+  decodeTokenId,
+  encodeTokenId,
+  STRATEGY_SHAPES,
+  TokenIdBuilder,
+} from '../../../src/connectors/panoptic/panoptic.tokenid';
+import panopticHelperAbi from '../../../src/connectors/panoptic/PanopticHelper.ABI.json';
+import semiFungiblePositionManagerAbi from '../../../src/connectors/panoptic/SFPM.ABI.json';
+
+// Open positions of a testnet account, as returned by the subgraph
+const SINGLE_LEG_TOKEN_ID = '77322919313040615369538147907420';
+const FOUR_LEG_TOKEN_ID =
+  '1724358520355700724595784863781761016418202439334584929386932255284888270684';
+const POOL_ID = BigNumber.from('3029648575756124');
+
+// Parameters for every PanopticHelper builder, shared by the local and on-chain checks
+const SHAPE_PARAMS: Record<string, Record<string, number>> = {
+  createCallSpread: { width: 10, strikeLong: -49800, strikeShort: -49600, asset: 0, optionRatio: 1, start: 0 },
+  createPutSpread: { width: 10, strikeLong: -49800, strikeShort: -50000, asset: 0, optionRatio: 1, start: 0 },
+  createCallDiagonalSpread: { widthLong: 20, widthShort: 10, strikeLong: -49800, strikeShort: -49600, asset: 0, optionRatio: 1, start: 0 },
+  createPutDiagonalSpread: { widthLong: 20, widthShort: 10, strikeLong: -49800, strikeShort: -50000, asset: 0, optionRatio: 1, start: 0 },
+  createCallCalendarSpread: { widthLong: 20, widthShort: 10, strike: -49800, asset: 0, optionRatio: 1, start: 0 },
+  createPutCalendarSpread: { widthLong: 20, widthShort: 10, strike: -49800, asset: 0, optionRatio: 1, start: 0 },
+  createCallRatioSpread: { width: 10, longStrike: -49800, shortStrike: -49600, asset: 0, ratio: 2, start: 0 },
+  createPutRatioSpread: { width: 10, longStrike: -49800, shortStrike: -50000, asset: 0, ratio: 2, start: 0 },
+  createCallZEBRASpread: { width: 10, longStrike: -50000, shortStrike: -49800, asset: 0, ratio: 2, start: 0 },
+  createPutZEBRASpread: { width: 10, longStrike: -49600, shortStrike: -49800, asset: 0, ratio: 2, start: 0 },
+  createZEEHBS: { width: 10, longStrike: -50000, shortStrike: -49800, asset: 0, ratio: 2 },
+  createStraddle: { width: 10, strike: -49800, asset: 0, isLong: 0, optionRatio: 1, start: 0 },
+  createStrangle: { width: 10, callStrike: -49600, putStrike: -50000, asset: 0, isLong: 0, optionRatio: 1, start: 0 },
+  createIronCondor: { width: 10, callStrike: -49600, putStrike: -50000, wingWidth: 200, asset: 0 },
+  createIronButterfly: { width: 10, strike: -49800, wingWidth: 200, asset: 0 },
+  createJadeLizard: { width: 10, longCallStrike: -49400, shortCallStrike: -49600, shortPutStrike: -50000, asset: 0 },
+  createBigLizard: { width: 10, longCallStrike: -49400, straddleStrike: -49800, asset: 0 },
+  createSuperBull: { width: 10, longCallStrike: -49800, shortCallStrike: -49600, shortPutStrike: -50000, asset: 0 },
+  createSuperBear: { width: 10, longPutStrike: -49800, shortPutStrike: -50000, shortCallStrike: -49600, asset: 0 },
+};
+
+describe('TokenId encoding', () => {
+  it('decodes a single-leg testnet position', () => {
+    const { poolId, legs } = decodeTokenId(SINGLE_LEG_TOKEN_ID);
+    expect(poolId.eq(POOL_ID)).toBe(true);
+    expect(legs).toEqual([
+      { legIndex: 0, asset: 0, optionRatio: 1, isLong: 1, tokenType: 1, riskPartner: 0, strike: -49860, width: 60 },
+    ]);
+  });
+
+  it('round trips multi-leg testnet positions', () => {
+    for (const tokenId of [SINGLE_LEG_TOKEN_ID, FOUR_LEG_TOKEN_ID]) {
+      const { poolId, legs } = decodeTokenId(tokenId);
+      expect(encodeTokenId(poolId, legs).toString()).toEqual(tokenId);
+    }
+    expect(decodeTokenId(FOUR_LEG_TOKEN_ID).legs.map((leg) => leg.strike)).toEqual([-49740, -49980, -49740, -49980]);
+  });
+
+  it('rejects fields that do not fit their bit width', () => {
+    const leg = { legIndex: 0, asset: 0, optionRatio: 128, isLong: 0, tokenType: 0, riskPartner: 0, strike: 0, width: 1 };
+    expect(() => encodeTokenId(POOL_ID, [leg])).toThrow();
+    expect(() => encodeTokenId(POOL_ID, [{ ...leg, optionRatio: 1, strike: 2 ** 23 }])).toThrow();
+  });
+});
+
+describe('Strategy shapes', () => {
+  it('covers every PanopticHelper builder used by the connector', () => {
+    expect(Object.keys(STRATEGY_SHAPES).sort()).toEqual(Object.keys(SHAPE_PARAMS).sort());
+  });
+
+  it.each(Object.keys(SHAPE_PARAMS))('%s produces consistent risk partners', (shape) => {
+    const { legs } = decodeTokenId(new TokenIdBuilder().build(POOL_ID, shape, SHAPE_PARAMS[shape]));
+    expect(legs.length).toEqual(STRATEGY_SHAPES[shape](SHAPE_PARAMS[shape]).length);
+    for (const leg of legs) {
+      const partner = legs.find((other) => other.legIndex === leg.riskPartner);
+      expect(partner).toBeDefined();
+      expect(partner!.riskPartner).toEqual(leg.legIndex);
+      expect(partner!.optionRatio).toEqual(leg.optionRatio);
+      expect(partner!.asset).toEqual(leg.asset);
+    }
+  });
+
+  it('memoizes builds and produces ladders', () => {
+    const builder = new TokenIdBuilder();
+    const params = SHAPE_PARAMS.createStraddle;
+    const first = builder.build(POOL_ID, 'createStraddle', params);
+    expect(builder.build(POOL_ID, 'createStraddle', { ...params })).toBe(first);
+    const strikes = [-50000, -49900, -49800];
+    const ladder = builder.ladder(POOL_ID, 'createStraddle', params, 'strike', strikes);
+    expect(ladder[2]).toEqual(first);
+    expect(ladder.map((tokenId) => decodeTokenId(tokenId).legs[0].strike)).toEqual(strikes);
+  });
+});
+
+// Live parity with the deployed PanopticHelper; runs only when an RPC endpoint and contracts are provided.
+const parityEnv = {
+  rpcUrl: process.env.PANOPTIC_PARITY_RPC_URL,
+  helper: process.env.PANOPTIC_PARITY_HELPER,
+  sfpm: process.env.PANOPTIC_PARITY_SFPM,
+  univ3pool: process.env.PANOPTIC_PARITY_UNIV3POOL,
+};
+const describeParity = Object.values(parityEnv).every((value) => value) ? describe : describe.skip;
+
+describeParity('Strategy shapes match PanopticHelper on-chain', () => {
+  let helper: Contract;
+  let poolId: BigNumber;
+
+  beforeAll(async () => {
+    const provider = new providers.JsonRpcProvider(parityEnv.rpcUrl);
+    helper = new Contract(parityEnv.helper!, panopticHelperAbi.abi, provider);
+    const sfpm = new Contract(parityEnv.sfpm!, semiFungiblePositionManagerAbi.abi, provider);
+    poolId = await sfpm.getPoolId(parityEnv.univ3pool);
+  });
+
+  it.each(Object.keys(SHAPE_PARAMS))('%s', async (shape) => {
+    const params = SHAPE_PARAMS[shape];
+    const args = helper.interface.getFunction(shape).inputs.map((input) =>
+      input.name === 'univ3pool' ? parityEnv.univ3pool : params[input.name]
+    );
+    const onChain: BigNumber = await helper[shape](...args);
+    expect(new TokenIdBuilder().build(poolId, shape, params)).toEqual(onChain.toString());
+  });
+});
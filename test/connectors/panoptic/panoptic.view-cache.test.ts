@@ -0,0 +1,45 @@
+import { EventEmitter } from 'events';
+import { providers } from 'ethers';
+import { BlockScopedCache } from '../../../src/connectors/panoptic/panoptic.view-cache';
+
+function fakeProvider(blockNumber: number): EventEmitter & { getBlockNumber: jest.Mock } {
+  return Object.assign(new EventEmitter(), { getBlockNumber: jest.fn(async () => blockNumber) });
+}
+
+describe('BlockScopedCache', () => {
+  it('coalesces identical calls and serves repeats from the cache within a block', async () => {
+    const provider = fakeProvider(100);
+    const cache = new BlockScopedCache(provider as unknown as providers.Provider);
+    const load = jest.fn(async (blockTag: number) => `slot0@${blockTag}`);
+
+    const results = await Promise.all([
+      cache.get(['slot0', '0xpool'], load),
+      cache.get(['slot0', '0xpool'], load),
+    ]);
+    expect(results).toEqual(['slot0@100', 'slot0@100']);
+    expect(await cache.get(['slot0', '0xpool'], load)).toEqual('slot0@100');
+    expect(await cache.get(['slot0', '0xother'], load)).toEqual('slot0@100');
+
+    expect(load).toHaveBeenCalledTimes(2);
+    expect(provider.getBlockNumber).toHaveBeenCalledTimes(1);
+    expect(cache.stats()).toMatchObject({ blockNumber: 100, hits: 1, misses: 2, coalesced: 1 });
+  });
+
+  it('drops every entry on a new head and never keeps failures', async () => {
+    const provider = fakeProvider(100);
+    const cache = new BlockScopedCache(provider as unknown as providers.Provider);
+    const load = jest.fn(async (blockTag: number) => blockTag);
+
+    await cache.get(['getPoolData', '0xtracker'], load);
+    provider.emit('block', 101);
+    expect(await cache.get(['getPoolData', '0xtracker'], load)).toEqual(101);
+    expect(cache.stats()).toMatchObject({ blockNumber: 101, entries: 1, invalidations: 1 });
+
+    const failing = jest.fn(async () => {
+      throw new Error('execution reverted');
+    });
+    await expect(cache.get(['checkCollateral'], failing)).rejects.toThrow('execution reverted');
+    await expect(cache.get(['checkCollateral'], failing)).rejects.toThrow('execution reverted');
+    expect(failing).toHaveBeenCalledTimes(2);
+  });
+});